@@ -0,0 +1,56 @@
+"""Benchmarks of the prover application.
+
+Run them from the project directory, e.g.::
+
+    python -m benchmarks.bench_persistence
+
+Benchmarks using the database work on a fresh test database,
+which is destroyed afterwards."""
+
+import contextlib
+import os
+import time
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('DEBUG', '0')
+    django.setup()
+
+
+@contextlib.contextmanager
+def benchmark_database():
+    """Sets up Django with a throwaway test database."""
+
+    setup_django()
+
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@contextlib.contextmanager
+def measure():
+    """Measures wall time and database queries of the block. Results are
+    available in the yielded dict after the block ends."""
+
+    from django.db import connection
+
+    # Queries are counted by a wrapper, the query log of Django is bounded.
+    measurement = {'queries': 0}
+
+    def count_query(execute, sql, params, many, context):
+        measurement['queries'] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        start = time.perf_counter()
+        yield measurement
+        measurement['seconds'] = time.perf_counter() - start
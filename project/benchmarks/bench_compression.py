@@ -0,0 +1,72 @@
+"""Stored size and read latency of proof sections of a file at zlib
+compression levels. Level 0 stores bodies without compressing them."""
+
+from . import benchmark_database, measure
+
+SECTION_COUNT = 1000
+LEVELS = (0, 1, 6, 9)
+REPEATS = 20
+
+
+def section_body(n):
+    """Goal as printed by Frama-C, with its hypotheses."""
+
+    hypotheses = ''.join(
+        f'  (* Pre-condition *)\n  Have: 0 <= i_{h} /\\ i_{h} < n_{n % 7} /\\ is_sint32(a_{h}).\n'
+        for h in range(n % 5 + 3)
+    )
+    return (
+        f"Goal Loop invariant (file a.c, line {n}) in 'f{n % 20}':\n"
+        f'Let x_{n} = shift_sint32(a, i_{n}).\nAssume {{\n{hypotheses}}}\n'
+        f'Prove: (0 <= i_{n}) /\\ (i_{n} <= n_{n % 7}).\n'
+        f'Prover Alt-Ergo 2.4.2 returns Valid ({n % 97}ms) ({n % 13} steps)\n'
+    )
+
+
+def main():
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import override_settings
+
+    from prover.jobs import save_proving_result
+    from prover.models import File, SectionStatusData
+    from prover.processes import FramaSection
+
+    user = get_user_model().objects.create_user(username='benchmark')
+    sections = [
+        FramaSection('Goal Loop invariant', 'Valid', section_body(n))
+        for n in range(SECTION_COUNT)
+    ]
+    text_bytes = sum(len(section.body.encode()) for section in sections)
+    print(f'{SECTION_COUNT} sections, {text_bytes} bytes of text')
+    print(f'{"level":>6} {"bytes":>10} {"ratio":>6} {"with bodies":>12} {"without":>8}')
+    for level in LEVELS:
+        SectionStatusData.objects.all().delete()
+        with override_settings(PROOF_COMPRESSION_LEVEL=level):
+            file = File.objects.create(owner=user, uploaded_file=f'{level}.c')
+            save_proving_result(file, 'log', sections)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT SUM(LENGTH(data)) FROM {SectionStatusData._meta.db_table}')
+            stored_bytes = cursor.fetchone()[0]
+
+        # Query of `file_content_view`, with and without section bodies.
+        timings = []
+        for fields in (('category__name', 'status__name', 'status_data__data'),
+                       ('category__name', 'status__name')):
+            queryset = file.sections.filter(validity_flag=True).order_by('id').values(*fields)
+            list(queryset)
+            with measure() as measurement:
+                for _ in range(REPEATS):
+                    list(queryset.all())
+            timings.append(measurement['seconds'] / REPEATS * 1000)
+
+        print(
+            f'{level:>6} {stored_bytes:>10} {stored_bytes / text_bytes:>6.2f} '
+            f'{timings[0]:>9.3f} ms {timings[1]:>5.3f} ms'
+        )
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        main()
@@ -0,0 +1,84 @@
+"""Query count and time of deleting a directory tree with 10k entries."""
+
+from . import benchmark_database, measure
+
+NODE_COUNT = 10000
+# Subdirectories of each directory of the wide tree.
+BRANCHING = 4
+
+
+def delete_recurrently(directory):
+    """Deleting as it was done before set-based deletion, for comparison."""
+
+    for lower_directory in directory.directory_set.all():
+        delete_recurrently(lower_directory)
+
+    for lower_file in directory.file_set.all():
+        lower_file.delete_by_user()
+
+    directory.delete_by_user()
+
+
+def create_tree(user, branching):
+    """Creates a tree of `NODE_COUNT` directories and files, each directory
+    has `branching` subdirectories and one file. Returns its root."""
+
+    from django.db import transaction
+
+    from prover.models import Directory, File
+
+    with transaction.atomic():
+        root = Directory.objects.create(name='root', owner=user)
+        level = [root]
+        count = 1
+        while count < NODE_COUNT:
+            next_level = []
+            for parent in level:
+                File.objects.create(owner=user, parent_dir=parent, uploaded_file='f.c')
+                count += 1
+                for n in range(branching):
+                    if count >= NODE_COUNT:
+                        break
+                    next_level.append(
+                        Directory.objects.create(name=f'{n}', owner=user, parent_dir=parent)
+                    )
+                    count += 1
+            level = next_level
+
+    return root
+
+
+def main():
+    from django.contrib.auth import get_user_model
+
+    from prover.models import Directory, File
+
+    user = get_user_model().objects.create_user(username='benchmark')
+    print(f'{"tree":>6} {"method":>12} {"queries":>8} {"seconds":>8}')
+    for shape, branching in (('wide', BRANCHING), ('deep', 1)):
+        Directory.objects.all().delete()
+        root = create_tree(user, branching)
+        for name, delete in (
+            ('recurrent', delete_recurrently),
+            ('set-based', Directory.delete_tree_by_user)
+        ):
+            Directory.objects.update(availability_flag=True)
+            File.objects.update(availability_flag=True)
+            root.refresh_from_db()
+            # The recurrent deletion is limited by depth of Python stack.
+            queries, seconds = '-', 'fails'
+            try:
+                with measure() as measurement:
+                    delete(root)
+            except RecursionError:
+                pass
+            else:
+                queries, seconds = measurement['queries'], f'{measurement["seconds"]:.3f}'
+                assert not Directory.objects.filter(availability_flag=True).exists()
+                assert not File.objects.filter(availability_flag=True).exists()
+            print(f'{shape:>6} {name:>12} {queries:>8} {seconds:>8}')
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        main()
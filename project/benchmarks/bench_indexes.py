@@ -0,0 +1,199 @@
+"""Query plans and latency of listing directories and reading current
+sections of a file with 1M rows in each table, without and with the
+composite indexes."""
+
+import os
+import random
+from datetime import datetime, timezone
+
+from . import benchmark_database, measure
+
+ROWS = int(os.environ.get('BENCHMARK_ROWS', 1000000))
+USERS = 100
+DIRECTORY_SHARE = 0.2
+SECTIONS_PER_FILE = 100
+# Proofs of each file, only the last one is valid.
+PROOFS = 10
+BATCH_SIZE = 10000
+REPEATS = 50
+LISTING_PAGE_SIZE = 200
+
+
+def insert_rows(table, columns, rows):
+    from django.db import connection
+
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(table),
+        ', '.join(quote(column) for column in columns),
+        ', '.join(['%s'] * len(columns))
+    )
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), BATCH_SIZE):
+            cursor.executemany(sql, rows[i:i + BATCH_SIZE])
+
+
+def create_data():
+    """Fills the database with raw inserts, models of the tree cannot be
+    inserted in bulk with the ORM. Returns sample owner, directory and
+    file, which are queried."""
+
+    from django.contrib.auth import get_user_model
+    from django.core.management.color import no_style
+    from django.db import connection, transaction
+
+    from prover.fields import compress_text
+    from prover.models import (
+        Directory,
+        Entity,
+        File,
+        FileProvingResult,
+        FileSection,
+        SectionCategory,
+        SectionStatus
+    )
+
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    users = [
+        get_user_model().objects.create_user(username=f'benchmark{n}').pk
+        for n in range(USERS)
+    ]
+    result_data = compress_text('log')
+    category = SectionCategory.objects.create(name='Goal Assertion').pk
+    status = SectionStatus.objects.create(name='Valid').pk
+
+    directory_count = int(ROWS * DIRECTORY_SHARE)
+    directories = []
+    files = []
+    for pk in range(1, ROWS + 1):
+        # Each entry lives in a random earlier directory of its owner
+        # or in the main directory.
+        owner, parent = rng.choice(users), None
+        if directories and rng.random() < 0.9:
+            parent, _, owner, *_ = rng.choice(directories)
+        # One in ten entries was deleted by the user.
+        available = rng.random() >= 0.1
+        if pk <= directory_count:
+            directories.append((pk, f'directory{pk}', owner, available, parent, ''))
+        else:
+            files.append((pk, owner, available, parent, f'files/{pk}.c', f'{pk}.c', 0))
+
+    with transaction.atomic():
+        insert_rows(
+            Entity._meta.db_table,
+            ['id', 'validity_flag', 'creation_date'],
+            [(pk, True, now) for pk in range(1, ROWS + 1)]
+        )
+        insert_rows(
+            Directory._meta.db_table,
+            ['entity_ptr_id', 'name', 'owner_id', 'availability_flag', 'parent_dir_id', 'path'],
+            directories
+        )
+        insert_rows(
+            File._meta.db_table,
+            [
+                'entity_ptr_id', 'owner_id', 'availability_flag', 'parent_dir_id',
+                'uploaded_file', 'name', 'proof_version'
+            ],
+            files
+        )
+        proved_files = [row[0] for row in files[:ROWS // SECTIONS_PER_FILE]]
+        insert_rows(
+            FileSection._meta.db_table,
+            [
+                'validity_flag', 'creation_date', 'related_file_id', 'category_id', 'status_id',
+                'function', 'property_kind'
+            ],
+            [
+                (proof == PROOFS - 1, now, file_pk, category, status, '', 'Assertion')
+                for proof in range(PROOFS)
+                for file_pk in proved_files
+                for _ in range(SECTIONS_PER_FILE // PROOFS)
+            ]
+        )
+        insert_rows(
+            FileProvingResult._meta.db_table,
+            ['validity_flag', 'creation_date', 'related_file_id', 'data', 'goals', 'proved_goals'],
+            [
+                (proof == PROOFS - 1, now, file_pk, result_data, SECTIONS_PER_FILE // PROOFS, 0)
+                for proof in range(PROOFS)
+                for file_pk in proved_files
+            ]
+        )
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [Entity]):
+                cursor.execute(sql)
+
+    sample_directory = Directory.objects.filter(availability_flag=True).order_by('pk')[100]
+    sample_file = File.objects.get(pk=proved_files[len(proved_files) // 2])
+    return sample_directory.owner, sample_directory, sample_file
+
+
+def queries(owner, directory, file):
+    """Queries of views, which use the indexes."""
+
+    from prover.models import Directory, File, FileProvingResult, FileSection
+
+    return {
+        # Entries in the main directory of all users share `parent_dir`.
+        'main': Directory.objects.filter(
+            owner=owner, parent_dir=None, availability_flag=True
+        ).order_by('name', 'pk').values('id', 'name')[:LISTING_PAGE_SIZE],
+        'directories': Directory.objects.filter(
+            owner=owner, parent_dir=directory, availability_flag=True
+        ).order_by('name', 'pk').values('id', 'name')[:LISTING_PAGE_SIZE],
+        'files': File.objects.filter(
+            owner=owner, parent_dir=directory, availability_flag=True
+        ).order_by('name', 'pk').values('id', 'name')[:LISTING_PAGE_SIZE],
+        'sections': FileSection.objects.filter(
+            related_file=file, validity_flag=True
+        ).order_by('id').values('id', 'category__name', 'status__name'),
+        'result': FileProvingResult.objects.filter(
+            related_file=file, validity_flag=True
+        ).order_by('-id').values_list('data', flat=True)[:1],
+    }
+
+
+def run(label, owner, directory, file):
+    for name, queryset in queries(owner, directory, file).items():
+        plan = queryset.explain().replace('\n', '\n' + ' ' * 4)
+        list(queryset)
+        with measure() as measurement:
+            for _ in range(REPEATS):
+                list(queryset.all())
+        milliseconds = measurement['seconds'] / REPEATS * 1000
+        print(f'{label:>8} {name:>12} {milliseconds:>8.3f} ms\n    {plan}')
+
+
+def main():
+    from django.db import connection
+
+    from prover.models import Directory, File, FileProvingResult, FileSection
+
+    print(f'Creating {ROWS} entries and sections...')
+    owner, directory, file = create_data()
+    indexed = [
+        (model, index)
+        for model in (Directory, File, FileSection, FileProvingResult)
+        for index in model._meta.indexes
+    ]
+
+    with connection.schema_editor() as editor:
+        for model, index in indexed:
+            editor.remove_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    run('before', owner, directory, file)
+
+    with connection.schema_editor() as editor:
+        for model, index in indexed:
+            editor.add_index(model, index)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    run('after', owner, directory, file)
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        main()
@@ -0,0 +1,82 @@
+"""Wall time of proving a file with many functions by one prover run
+and by a pool of runs, one per function.
+
+Proves with the stub backend, which waits `PROVER_STUB_SECTION_DELAY`
+seconds per goal, so it measures scheduling of the runs. Set
+`PROVER_BACKEND=frama-c` to prove with Frama-C WP. Usage::
+
+    python -m benchmarks.bench_parallel_proving [functions] [processes]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from . import setup_django
+
+FUNCTION_TEMPLATE = '''
+/*@ requires n >= 0;
+    ensures \\result == n * (n + 1) / 2;
+*/
+int sum{n}(int n) {{
+    int s = 0;
+    /*@ loop invariant 0 <= i <= n + 1;
+        loop invariant s == (i - 1) * i / 2;
+        loop assigns i, s;
+        loop variant n - i;
+    */
+    for (int i = 1; i <= n; i++) {{
+        s += i;
+    }}
+    return s;
+}}
+'''
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    os.environ.setdefault('PROVER_BACKEND', 'stub')
+    os.environ.setdefault('PROVER_STUB_SECTION_DELAY', '0.02')
+    setup_django()
+    from prover.backends import StubBackend, get_backend
+    from prover.processes import open_frama_c_run
+    from prover.units import split_into_units
+
+    backend = get_backend()
+    if backend.name == 'frama-c' and shutil.which('frama-c') is None:
+        print('frama-c is not installed, nothing to measure.')
+        return
+
+    def prove(path, processes, backend):
+        with open_frama_c_run(path, processes, backend=backend) as run:
+            return list(run.sections())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'functions.c')
+        with open(path, 'w') as f:
+            f.write(''.join(FUNCTION_TEMPLATE.format(n=n) for n in range(functions)))
+
+        single_backend = backend
+        if isinstance(backend, StubBackend):
+            # The stub reports as many goals for a file as for a function,
+            # one run reports goals of all units instead.
+            with open(path) as f:
+                units = len(split_into_units(f.read()))
+            single_backend = StubBackend(backend.sections * units, backend.delay, backend.solvers)
+
+        print(f'{functions} functions, {processes} processes, {backend.name} backend')
+        for name, pool, run_backend in (
+            ('single process', 1, single_backend),
+            ('pool', processes, backend),
+        ):
+            start = time.perf_counter()
+            sections = prove(path, pool, run_backend)
+            seconds = time.perf_counter() - start
+            print(f'{name:>15}: {seconds:8.2f} s, {len(sections)} sections')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Query count and time of saving proof sections of a file."""
+
+from . import benchmark_database, measure
+
+SECTION_COUNTS = (10, 100, 1000)
+
+
+def save_one_by_one(file, result_data, sections):
+    """Saving as it was done before bulk persistence, for comparison."""
+
+    from prover.models import (
+        FileSection,
+        FileProvingResult,
+        SectionCategory,
+        SectionStatus,
+        SectionStatusData
+    )
+
+    for section in FileSection.objects.filter(related_file=file, validity_flag=True):
+        section.validity_flag = False
+        section.save()
+    for result in FileProvingResult.objects.filter(related_file=file, validity_flag=True):
+        result.validity_flag = False
+        result.save()
+    for section in sections:
+        s_category, _ = SectionCategory.objects.get_or_create(name=section.category)
+        s_status, _ = SectionStatus.objects.get_or_create(name=section.status)
+        file_section = FileSection.objects.create(
+            related_file=file,
+            category=s_category,
+            status=s_status
+        )
+        SectionStatusData.objects.create(
+            data=section.body,
+            status=s_status,
+            section=file_section
+        )
+    FileProvingResult.objects.create(related_file=file, data=result_data)
+
+
+def main():
+    from django.contrib.auth import get_user_model
+
+    from prover.jobs import save_proving_result
+    from prover.models import File
+    from prover.processes import FramaSection
+
+    user = get_user_model().objects.create_user(username='benchmark')
+    print(f'{"sections":>8} {"method":>12} {"queries":>8} {"seconds":>8}')
+    for count in SECTION_COUNTS:
+        sections = [
+            FramaSection('Goal Assertion', 'Valid', f'Goal Assertion {n}:\nProver returns Valid')
+            for n in range(count)
+        ]
+        for name, save in (('one-by-one', save_one_by_one), ('bulk', save_proving_result)):
+            file = File.objects.create(owner=user, uploaded_file=f'{name}{count}.c')
+            # The second run also invalidates sections of the first one.
+            save(file, 'log', sections)
+            with measure() as measurement:
+                save(file, 'log', sections)
+            print(f'{count:>8} {name:>12} {measurement["queries"]:>8} '
+                  f'{measurement["seconds"]:>8.3f}')
+
+
+if __name__ == '__main__':
+    with benchmark_database():
+        main()
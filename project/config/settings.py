@@ -13,6 +13,8 @@ import os
 
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -77,12 +79,53 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# SQLite by default, for single-node installs. Set DATABASE_ENGINE=postgresql
+# and DATABASE_NAME, DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST and
+# DATABASE_PORT to use PostgreSQL (needs psycopg2), whose writers do not
+# wait for each other.
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite3')
+
+if DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DATABASE_NAME', 'invariants_prover'),
+            'USER': os.environ.get('DATABASE_USER', ''),
+            'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+            'HOST': os.environ.get('DATABASE_HOST', ''),
+            'PORT': os.environ.get('DATABASE_PORT', ''),
+            # Seconds for which a connection is reused by later requests of
+            # a process. It is checked before reuse, so a restarted database
+            # server does not fail requests.
+            'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+elif DATABASE_ENGINE == 'sqlite3':
+    DATABASES = {
+        'default': {
+            # Transactions take the write lock at once, see `config.sqlite3`.
+            'ENGINE': 'config.sqlite3',
+            'NAME': os.environ.get('DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Seconds for which a writer waits for another one instead
+                # of failing with `database is locked`.
+                'timeout': float(os.environ.get('DATABASE_BUSY_TIMEOUT', 20)),
+            },
+        }
     }
-}
+else:
+    raise ImproperlyConfigured(f'Unsupported DATABASE_ENGINE: {DATABASE_ENGINE}.')
+
+# Journal mode set on SQLite connections, in WAL mode reads do not wait for
+# a writer. Empty keeps the mode of the database file.
+SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 
 # Password validation
@@ -113,8 +156,6 @@ TIME_ZONE = 'UTC'
 
 USE_I18N = True
 
-USE_L10N = True
-
 USE_TZ = True
 
 
@@ -131,3 +172,79 @@ STATICFILES_DIRS = [
 # Auth
 LOGIN_REDIRECT_URL = 'main'
 LOGOUT_REDIRECT_URL = 'login'
+
+
+# Prover
+# Number of processes started by `manage.py run_prover_workers`.
+PROVER_WORKERS = int(os.environ.get('PROVER_WORKERS', os.cpu_count() or 1))
+# Seconds between checks of an empty proof job queue.
+PROVER_POLL_INTERVAL = float(os.environ.get('PROVER_POLL_INTERVAL', 1.0))
+# Workers report running jobs every `PROVER_JOB_HEARTBEAT_INTERVAL` seconds.
+# A job not reported for `PROVER_JOB_LEASE` seconds is taken as abandoned
+# (e.g. by a crashed worker) and queued again, after `PROVER_JOB_MAX_ATTEMPTS`
+# claims it fails. 0 disables the lease.
+PROVER_JOB_HEARTBEAT_INTERVAL = float(os.environ.get('PROVER_JOB_HEARTBEAT_INTERVAL', 30))
+PROVER_JOB_LEASE = float(os.environ.get('PROVER_JOB_LEASE', 120))
+PROVER_JOB_MAX_ATTEMPTS = int(os.environ.get('PROVER_JOB_MAX_ATTEMPTS', 3))
+# Maximal number of proofs kept in the proof cache, 0 disables the cache.
+PROOF_CACHE_MAX_ENTRIES = int(os.environ.get('PROOF_CACHE_MAX_ENTRIES', 1000))
+# Proof jobs of one user running at the same time and proof jobs of one user
+# started during `PROVER_USER_RATE_PERIOD` seconds, 0 disables a limit. Jobs
+# above the limits wait in the queue, users with queued jobs take turns.
+PROVER_USER_CONCURRENCY = int(os.environ.get('PROVER_USER_CONCURRENCY', 2))
+PROVER_USER_RATE_LIMIT = int(os.environ.get('PROVER_USER_RATE_LIMIT', 100))
+PROVER_USER_RATE_PERIOD = float(os.environ.get('PROVER_USER_RATE_PERIOD', 3600))
+# zlib level (0-9, 0 stores data uncompressed) of proof logs, section bodies
+# and proof cache entries.
+PROOF_COMPRESSION_LEVEL = int(os.environ.get('PROOF_COMPRESSION_LEVEL', 6))
+if not 0 <= PROOF_COMPRESSION_LEVEL <= 9:
+    raise ImproperlyConfigured('PROOF_COMPRESSION_LEVEL must be between 0 and 9.')
+# Proofs removed by `manage.py compact_proofs`: all but the last
+# `PROOF_RETENTION_RUNS` proofs of each file and proofs older than
+# `PROOF_RETENTION_DAYS` days, 0 disables a rule. Current proofs are kept.
+PROOF_RETENTION_RUNS = int(os.environ.get('PROOF_RETENTION_RUNS', 10))
+PROOF_RETENTION_DAYS = float(os.environ.get('PROOF_RETENTION_DAYS', 0))
+# Days after which files and directories deleted by users are purged.
+DELETED_ENTRIES_GRACE_DAYS = float(os.environ.get('DELETED_ENTRIES_GRACE_DAYS', 30))
+# Rows deleted in one transaction by `manage.py compact_proofs`.
+RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', 1000))
+# Number of proof sections saved at once while Frama-C is running.
+PROVER_SECTIONS_BATCH_SIZE = int(os.environ.get('PROVER_SECTIONS_BATCH_SIZE', 200))
+# Seconds after which parsed sections are saved even if their batch is not full.
+PROVER_SECTIONS_FLUSH_INTERVAL = float(os.environ.get('PROVER_SECTIONS_FLUSH_INTERVAL', 1.0))
+# Seconds between checks for new sections of a job streamed to the browser.
+PROOF_EVENTS_POLL_INTERVAL = float(os.environ.get('PROOF_EVENTS_POLL_INTERVAL', 0.5))
+# Number of Frama-C processes proving functions of one file at the same time,
+# by default CPUs are shared by all workers.
+PROVER_PARALLEL_PROCESSES = int(os.environ.get(
+    'PROVER_PARALLEL_PROCESSES',
+    max(1, (os.cpu_count() or 1) // PROVER_WORKERS)
+))
+# Prover used unless a proof request selects another one: `frama-c` or `stub`,
+# which does not prove anything and needs no Frama-C (e.g. for load tests).
+PROVER_BACKEND = os.environ.get('PROVER_BACKEND', 'frama-c')
+# Solvers proving goals with Frama-C (`-wp-prover`), e.g. `alt-ergo,z3,cvc4`.
+# Several solvers race on every goal, the first definitive answer is used.
+PROVER_SOLVERS = [
+    solver for solver in os.environ.get('PROVER_SOLVERS', '').split(',') if solver
+]
+# Limits of proofs, 0 disables a limit: seconds of wall-clock time of the whole
+# proof, after which provers and their solvers are killed, and seconds of CPU
+# time and megabytes of address space of each of their processes (on Linux).
+PROVER_WALL_TIMEOUT = float(os.environ.get('PROVER_WALL_TIMEOUT', 600))
+PROVER_CPU_LIMIT = int(os.environ.get('PROVER_CPU_LIMIT', 600))
+PROVER_MEMORY_LIMIT = int(os.environ.get('PROVER_MEMORY_LIMIT', 4096))
+# Seconds a solver may spend on one goal (`-wp-timeout`), 0 keeps Frama-C default.
+PROVER_GOAL_TIMEOUT = int(os.environ.get('PROVER_GOAL_TIMEOUT', 10))
+# Goals reported by the stub prover for every proved file or function
+# and seconds it waits before each of them.
+PROVER_STUB_SECTIONS = int(os.environ.get('PROVER_STUB_SECTIONS', 10))
+PROVER_STUB_SECTION_DELAY = float(os.environ.get('PROVER_STUB_SECTION_DELAY', 0.0))
+# Prove files function by function and reuse proofs of unchanged functions.
+# Files without reusable functions are proved by one run unless proving
+# in parallel.
+PROVER_INCREMENTAL = bool(int(os.environ.get('PROVER_INCREMENTAL', 1)))
+# Entries of a directory listing returned at once, unless the client asks for
+# fewer or more, but at most `LISTING_MAX_PAGE_SIZE`.
+LISTING_PAGE_SIZE = int(os.environ.get('LISTING_PAGE_SIZE', 200))
+LISTING_MAX_PAGE_SIZE = int(os.environ.get('LISTING_MAX_PAGE_SIZE', 1000))
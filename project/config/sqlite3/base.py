@@ -0,0 +1,13 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite backend, which starts transactions with `BEGIN IMMEDIATE`.
+
+    A transaction takes the write lock when it begins, so it waits up to
+    the busy timeout for other writers. With plain `BEGIN` a transaction,
+    which reads before writing, fails with `database is locked` at once
+    if another writer holds the lock, the timeout does not apply."""
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
@@ -6,7 +6,9 @@ from .models import (
     SectionCategory,
     SectionStatusData,
     SectionStatus,
-    FileSection
+    FileSection,
+    ProofJob,
+    ProofRun
 )
 
 
@@ -19,9 +21,27 @@ class AdminFile(admin.ModelAdmin):
                     'parent_dir', 'availability_flag')
 
 
+class AdminFileSection(admin.ModelAdmin):
+    list_display = ('id', 'related_file', 'name', 'function', 'property_kind',
+                    'status', 'creation_date')
+    list_filter = ('status', 'property_kind', 'validity_flag')
+
+
+class AdminProofJob(admin.ModelAdmin):
+    list_display = ('id', 'file', 'state', 'backend', 'creation_date',
+                    'start_date', 'finish_date')
+    list_filter = ('state',)
+
+
+class AdminProofRun(admin.ModelAdmin):
+    list_display = ('id', 'file', 'job', 'start_date', 'finish_date')
+
+
 admin.site.register(Directory, AdminDirectory)
 admin.site.register(File, AdminFile)
 admin.site.register(SectionCategory)
 admin.site.register(SectionStatusData)
 admin.site.register(SectionStatus)
-admin.site.register(FileSection)
+admin.site.register(FileSection, AdminFileSection)
+admin.site.register(ProofJob, AdminProofJob)
+admin.site.register(ProofRun, AdminProofRun)
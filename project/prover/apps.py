@@ -1,5 +1,27 @@
+import re
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+
+_JOURNAL_MODE = re.compile(r'^(DELETE|TRUNCATE|PERSIST|MEMORY|WAL|OFF)$', re.IGNORECASE)
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Sets `SQLITE_JOURNAL_MODE` of new SQLite connections."""
+
+    if connection.vendor != 'sqlite' or not settings.SQLITE_JOURNAL_MODE:
+        return
+    if not _JOURNAL_MODE.match(settings.SQLITE_JOURNAL_MODE):
+        raise ImproperlyConfigured(f'Invalid SQLITE_JOURNAL_MODE: {settings.SQLITE_JOURNAL_MODE}.')
+    with connection.cursor() as cursor:
+        # In-memory databases (e.g. of tests) keep their `memory` mode.
+        cursor.execute(f'PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}')
 
 
 class ProverConfig(AppConfig):
     name = 'prover'
+
+    def ready(self):
+        connection_created.connect(configure_sqlite_connection)
@@ -0,0 +1,136 @@
+import contextlib
+import hashlib
+import os
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Type
+
+from django.conf import settings
+
+from .processes import (
+    SECTION_SEPARATOR,
+    FramaCBackend,
+    FramaSection,
+    ProverBackend,
+    ProverTimeout,
+    iter_frama_c_print
+)
+
+
+class StubRun:
+    """Run of `StubBackend`, which prints sections in Frama-C format."""
+
+    def __init__(self, backend: 'StubBackend', filepath: str, options: Sequence[str]) -> None:
+        self.backend = backend
+        self.filepath = filepath
+        self.options = options
+        self.cancelled = False
+        self.timed_out = False
+        self._count = 0
+        self._start = time.monotonic()
+
+    def _output(self) -> Iterator[str]:
+        with open(self.filepath, 'rb') as f:
+            digest = hashlib.sha256(f.read()).digest()
+        name = os.path.basename(self.filepath)
+        options = list(self.options)
+        scope = f" in '{options[options.index('-wp-fct') + 1]}'" if '-wp-fct' in options else ''
+
+        yield SECTION_SEPARATOR
+        solver = self.backend.solvers[0] if self.backend.solvers else 'Stub'
+        for i in range(self.backend.sections):
+            if self.backend.delay:
+                time.sleep(self.backend.delay)
+            if self.cancelled:
+                return
+            if settings.PROVER_WALL_TIMEOUT and time.monotonic() - self._start > settings.PROVER_WALL_TIMEOUT:
+                self.timed_out = True
+                return
+            # Every tenth goal on average is not proved, always the same ones.
+            status = 'Unknown' if digest[i % len(digest)] % 10 == 0 else 'Valid'
+            yield f'Goal Assertion (file {name}, line {i + 1}){scope}:\n'
+            yield 'Prove: true.\n'
+            yield f'Prover {solver} returns {status} ({self.backend.delay * 1000:.0f}ms)\n'
+            yield SECTION_SEPARATOR
+            self._count += 1
+
+    def sections(self) -> Iterator[FramaSection]:
+        return iter_frama_c_print(self._output())
+
+    def cancel(self):
+        self.cancelled = True
+
+    def result_data(self) -> str:
+        if self.timed_out:
+            raise ProverTimeout(f'Proof timed out after {settings.PROVER_WALL_TIMEOUT:g} seconds.')
+        return f'[stub] {self._count} goals of {os.path.basename(self.filepath)}\n'
+
+
+class StubBackend(ProverBackend):
+    """Prover, which does not prove anything, so the application can be
+    run, benchmarked and tested without Frama-C. It runs in the calling
+    process and reports `sections` goals (by default
+    `PROVER_STUB_SECTIONS`) of every proved file or function, waiting
+    `delay` seconds (by default `PROVER_STUB_SECTION_DELAY`) before each.
+    It stops after `PROVER_WALL_TIMEOUT` seconds like other provers.
+    Statuses depend only on content of the file, the first of `solvers`
+    is reported as the solver of every goal."""
+
+    name = 'stub'
+
+    def __init__(
+        self,
+        sections: Optional[int] = None,
+        delay: Optional[float] = None,
+        solvers: Optional[Sequence[str]] = None
+    ) -> None:
+        self.sections = settings.PROVER_STUB_SECTIONS if sections is None else sections
+        self.delay = settings.PROVER_STUB_SECTION_DELAY if delay is None else delay
+        self.solvers = list(solvers or [])
+
+    def command(self, filepath: str, result_filepath: str, options: Sequence[str] = ()) -> List[str]:
+        # Never executed, identifies proofs in cache keys.
+        return ['stub', ','.join(self.solvers), *options, filepath]
+
+    def parse(self, lines: Iterable[str]) -> Iterator[FramaSection]:
+        return iter_frama_c_print(lines)
+
+    def version(self) -> str:
+        return f'stub {self.sections} {self.delay}'
+
+    @contextlib.contextmanager
+    def run(self, filepath: str, options: Sequence[str] = ()) -> Iterator[StubRun]:
+        yield StubRun(self, filepath, options)
+
+
+BACKENDS: Dict[str, Type[ProverBackend]] = {
+    FramaCBackend.name: FramaCBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+_SOLVER_NAME = re.compile(r'^[\w.+-]+$')
+
+
+def parse_solvers(value: str) -> List[str]:
+    """Returns solvers from a comma separated list, e.g. `alt-ergo,z3`.
+    Raises ValueError if a name is invalid."""
+
+    solvers = [solver.strip() for solver in value.split(',') if solver.strip()]
+    for solver in solvers:
+        if not _SOLVER_NAME.match(solver):
+            raise ValueError(f'Invalid solver name: {solver}.')
+    return solvers
+
+
+def get_backend(name: Optional[str] = None, solvers: Optional[Sequence[str]] = None) -> ProverBackend:
+    """Returns backend of given name, by default `PROVER_BACKEND`, which
+    proves goals with `solvers` (by default `PROVER_SOLVERS`). Raises
+    ValueError if there is no such backend."""
+
+    name = name or settings.PROVER_BACKEND
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown prover backend: {name}.')
+    return backend_class(solvers=solvers or None)
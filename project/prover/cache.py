@@ -0,0 +1,135 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ProofCacheEntry, ProofCacheCounter
+from .processes import FramaCBackend, FramaSection, ProverBackend
+
+HITS = 'hits'
+MISSES = 'misses'
+
+
+def proof_cache_key(content: bytes, command: List[str], version: str) -> str:
+    """Returns cache key of proving `content` with `command` run by
+    prover in `version`."""
+
+    digest = hashlib.sha256()
+    for part in (content, '\0'.join(command).encode(), version.encode()):
+        digest.update(hashlib.sha256(part).digest())
+
+    return digest.hexdigest()
+
+
+def _increment_counter(name: str):
+    if not ProofCacheCounter.objects.filter(name=name).update(value=F('value') + 1):
+        try:
+            ProofCacheCounter.objects.create(name=name, value=1)
+        except IntegrityError:
+            # Counter was created by another worker in the meantime.
+            ProofCacheCounter.objects.filter(name=name).update(value=F('value') + 1)
+
+
+def get_cached_proof(key: str) -> Optional[Tuple[str, List[FramaSection]]]:
+    """Returns stored log and sections for given key or None on a miss."""
+
+    entry = ProofCacheEntry.objects.filter(key=key).first()
+    if entry is None:
+        _increment_counter(MISSES)
+        return None
+
+    ProofCacheEntry.objects.filter(pk=entry.pk).update(
+        hits=F('hits') + 1,
+        last_used=timezone.now()
+    )
+    _increment_counter(HITS)
+    sections = [
+        FramaSection(
+            s['category'],
+            s['status'],
+            s['body'],
+            s.get('unit'),
+            s.get('solver'),
+            s.get('time'),
+            s.get('steps'),
+            s.get('goal'),
+            s.get('function'),
+            s.get('kind')
+        )
+        for s in json.loads(entry.sections)
+    ]
+    return entry.result_data, sections
+
+
+def store_cached_proof(key: str, version: str, result_data: str, sections: List[FramaSection]):
+    """Stores a proof outcome and evicts least recently used entries
+    above `PROOF_CACHE_MAX_ENTRIES`."""
+
+    ProofCacheEntry.objects.update_or_create(
+        key=key,
+        defaults={
+            'prover_version': version,
+            'result_data': result_data,
+            'sections': json.dumps([
+                {
+                    'category': s.category,
+                    'status': s.status,
+                    'body': s.body,
+                    'unit': s.unit,
+                    'solver': s.solver,
+                    'time': s.time,
+                    'steps': s.steps,
+                    'goal': s.goal,
+                    'function': s.function,
+                    'kind': s.kind
+                }
+                for s in sections
+            ]),
+            'last_used': timezone.now(),
+        }
+    )
+
+    evicted = ProofCacheEntry.objects.order_by('-last_used', '-id').values_list(
+        'id', flat=True
+    )[settings.PROOF_CACHE_MAX_ENTRIES:]
+    evicted = list(evicted)
+    if evicted:
+        ProofCacheEntry.objects.filter(id__in=evicted).delete()
+
+
+def clear_proof_cache(keep_version: Optional[str] = None) -> int:
+    """Removes cache entries. If `keep_version` is given, only entries
+    made by other prover versions are removed. Returns number of removed
+    entries."""
+
+    entries = ProofCacheEntry.objects.all()
+    if keep_version is not None:
+        entries = entries.exclude(prover_version=keep_version)
+
+    deleted, _ = entries.delete()
+    return deleted
+
+
+def get_proof_cache_statistics() -> Dict[str, int]:
+    statistics = {HITS: 0, MISSES: 0}
+    statistics.update(ProofCacheCounter.objects.values_list('name', 'value'))
+    statistics['entries'] = ProofCacheEntry.objects.count()
+
+    return statistics
+
+
+def file_proof_cache_key(filepath: str, backend: Optional[ProverBackend] = None) -> Tuple[str, str]:
+    """Returns cache key of proving given file with the backend (installed
+    Frama-C by default) and version of the backend."""
+
+    backend = backend or FramaCBackend()
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    version = backend.version()
+
+    return proof_cache_key(content, backend.signature(), version), version
+
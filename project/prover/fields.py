@@ -0,0 +1,40 @@
+import zlib
+
+from django.conf import settings
+from django.db import models
+
+
+def compress_text(value: str) -> bytes:
+    return zlib.compress(value.encode(), settings.PROOF_COMPRESSION_LEVEL)
+
+
+def decompress_text(value: bytes) -> str:
+    return zlib.decompress(value).decode()
+
+
+class CompressedTextField(models.BinaryField):
+    """Text, which is stored compressed with zlib. It is a str in Python,
+    it is decompressed only when the column is read, so querysets not
+    selecting the field (e.g. with `defer` or `values`) do not pay for it.
+    Lookups other than `exact` and `isnull` are not meaningful."""
+
+    description = 'Compressed text'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if isinstance(value, str):
+            value = compress_text(value)
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decompress_text(bytes(value))
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return decompress_text(bytes(value))
+        return value
+
+    def value_to_string(self, obj):
+        # Serialized as text, not as base64 of compressed bytes.
+        return self.value_from_object(obj)
@@ -0,0 +1,78 @@
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from .models import FileSection
+
+# Fields of sections compared by `diff_proof_runs`, bodies are not read.
+_GOAL_FIELDS = (
+    'category__name',
+    'status__name',
+    'status_data__solver',
+    'status_data__time',
+    'name',
+    'function',
+    'property_kind'
+)
+
+
+def _get_run_goals(run_id: int) -> Dict[Tuple, dict]:
+    """Returns sections of the run by category, function, kind, name
+    and number of the section among sections sharing them."""
+
+    goals = {}
+    occurrences = Counter()
+    for section in FileSection.objects.filter(run_id=run_id).order_by('id').values(*_GOAL_FIELDS):
+        key = (
+            section['category__name'],
+            section['function'],
+            section['property_kind'],
+            section['name']
+        )
+        occurrences[key] += 1
+        goals[(*key, occurrences[key])] = section
+    return goals
+
+
+def _goal_outcome(section: Optional[dict]) -> Optional[dict]:
+    if section is None:
+        return None
+    return {
+        'status': section['status__name'],
+        'solver': section['status_data__solver'],
+        'time': section['status_data__time']
+    }
+
+
+def diff_proof_runs(old_run_id: int, new_run_id: int) -> dict:
+    """Compares goals of two proof runs. Goals are matched by category,
+    function, kind and name, goals sharing them in order of the proof.
+    Returns goals added in the new run, removed from the old one and
+    goals with changed status, with their outcome in each run, and the
+    number of unchanged goals. Bodies of sections are not read."""
+
+    old_goals = _get_run_goals(old_run_id)
+    new_goals = _get_run_goals(new_run_id)
+
+    diff = {'added': [], 'removed': [], 'changed': [], 'unchanged': 0}
+    for key in [*new_goals, *(key for key in old_goals if key not in new_goals)]:
+        old, new = old_goals.get(key), new_goals.get(key)
+        if old is None:
+            change = 'added'
+        elif new is None:
+            change = 'removed'
+        elif old['status__name'] != new['status__name']:
+            change = 'changed'
+        else:
+            diff['unchanged'] += 1
+            continue
+        category, function, kind, name, _ = key
+        diff[change].append({
+            'category': category,
+            'goal': name,
+            'function': function,
+            'kind': kind,
+            'old': _goal_outcome(old),
+            'new': _goal_outcome(new)
+        })
+
+    return diff
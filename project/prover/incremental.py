@@ -0,0 +1,122 @@
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from .models import File, FileSection, ProvedUnit
+from .processes import FramaCBackend, FramaSection, ProverBackend
+from .units import ProofUnit
+
+
+def proof_unit_salt(backend: Optional[ProverBackend] = None) -> str:
+    """Returns the part of unit fingerprints, which depends on the prover
+    (Frama-C by default), so proofs made by another prover, version or
+    command are not reused."""
+
+    backend = backend or FramaCBackend()
+    return '\0'.join([backend.name, backend.version(), *backend.signature()])
+
+
+def relocate_section_body(
+    body: str,
+    old_name: str,
+    new_name: str,
+    old_ranges: List[Tuple[int, int, str]],
+    new_first_lines: Dict[str, int]
+) -> str:
+    """Rewrites locations (`file a.c, line 3` or `a.c:3`) in a section
+    reported for file `old_name` to file `new_name`. A line within
+    a function in `old_ranges` (first line, last line, name) is moved
+    with the function to its line in `new_first_lines`."""
+
+    def move(match):
+        line = int(match.group(3))
+        for first, last, name in old_ranges:
+            if first <= line <= last and name in new_first_lines:
+                line += new_first_lines[name] - first
+                break
+        return f'{match.group(1)}{new_name}{match.group(2)}{line}'
+
+    location = re.compile(
+        r'(?<![\w.-])((?:[^\s,():\'"]*/)?)' + re.escape(old_name) + r'(, line |:)(\d+)'
+    )
+    return location.sub(move, body)
+
+
+def get_reusable_sections(file: File, units: List[ProofUnit]) -> Dict[str, List[FramaSection]]:
+    """Returns sections of units of the file, which have a valid proof
+    with the same fingerprint in some file of its owner, by unit names.
+    The latest proof of each unit is used, locations in its sections
+    are moved to the file."""
+
+    by_fingerprint = {unit.fingerprint: unit for unit in units}
+    reused = {}
+    proved_units = ProvedUnit.objects.filter(
+        validity_flag=True,
+        file__owner_id=file.owner_id,
+        fingerprint__in=by_fingerprint
+    ).order_by('-id')
+    for proved_unit in proved_units:
+        reused.setdefault(proved_unit.fingerprint, proved_unit)
+    if not reused:
+        return {}
+
+    file_ids = {proved_unit.file_id for proved_unit in reused.values()}
+    old_names = {
+        pk: os.path.basename(name)
+        for pk, name in File.objects.filter(pk__in=file_ids).values_list('pk', 'uploaded_file')
+    }
+    old_ranges = defaultdict(list)
+    for file_id, first, last, name in ProvedUnit.objects.filter(
+        validity_flag=True,
+        file_id__in=file_ids,
+        first_line__isnull=False
+    ).values_list('file_id', 'first_line', 'last_line', 'name'):
+        old_ranges[file_id].append((first, last, name))
+    new_name = file.get_name()
+    new_first_lines = {unit.name: unit.first_line for unit in units if unit.first_line}
+
+    reused = {proved_unit.pk: proved_unit for proved_unit in reused.values()}
+    carried_sections = {
+        by_fingerprint[proved_unit.fingerprint].name: [] for proved_unit in reused.values()
+    }
+    rows = FileSection.objects.filter(
+        validity_flag=True,
+        proved_unit_id__in=reused
+    ).order_by('id').values_list(
+        'proved_unit_id',
+        'category__name',
+        'status__name',
+        'status_data__data',
+        'status_data__solver',
+        'status_data__time',
+        'status_data__steps',
+        'name',
+        'function',
+        'property_kind'
+    )
+    for proved_unit_id, category, status, body, solver, time, steps, goal, function, kind in rows:
+        proved_unit = reused[proved_unit_id]
+        if proved_unit.file_id != file.pk:
+            body = relocate_section_body(
+                body,
+                old_names[proved_unit.file_id],
+                new_name,
+                old_ranges[proved_unit.file_id],
+                new_first_lines
+            )
+        carried_sections[by_fingerprint[proved_unit.fingerprint].name].append(
+            FramaSection(
+                category,
+                status,
+                body,
+                solver=solver or None,
+                time=time,
+                steps=steps,
+                goal=goal,
+                function=function or None,
+                kind=kind or None
+            )
+        )
+
+    return carried_sections
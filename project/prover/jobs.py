@@ -0,0 +1,459 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, close_old_connections, connection, models, transaction
+from django.db.models import Count, F, Max, Min, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    File,
+    FileSection,
+    SectionStatusData,
+    SectionCategory,
+    SectionStatus,
+    FileProvingResult,
+    ProofJob,
+    ProofRun,
+    ProvedUnit
+)
+from .backends import get_backend, parse_solvers
+from .cache import file_proof_cache_key, get_cached_proof, store_cached_proof
+from .incremental import get_reusable_sections, proof_unit_salt
+from .processes import FramaSection, ProverBackend, ProverTimeout, open_frama_c_run
+from .units import ProofUnit, split_into_units
+
+
+def enqueue_proof(file: File, backend: str = '', solvers: str = '') -> ProofJob:
+    """Adds a new proof job for given file to the queue. The file is
+    proved by the `backend` with comma separated `solvers`, or by
+    `PROVER_BACKEND` with `PROVER_SOLVERS` if they are empty. Raises
+    ValueError if there is no such backend or a solver name is invalid.
+
+    If the file is already queued or being proved by the same prover,
+    that job is returned instead of a new one."""
+
+    solvers = ','.join(parse_solvers(solvers))
+    if backend:
+        get_backend(backend)
+
+    while True:
+        job = ProofJob.objects.filter(
+            file=file,
+            backend=backend,
+            solvers=solvers,
+            state__in=ProofJob.ACTIVE_STATES
+        ).first()
+        if job is not None:
+            return job
+        try:
+            with transaction.atomic():
+                return ProofJob.objects.create(file=file, backend=backend, solvers=solvers)
+        except IntegrityError:
+            # The same job was queued by another request in the meantime.
+            pass
+
+
+def _count_jobs(jobs: models.QuerySet) -> Coalesce:
+    """Returns number of the jobs as an expression, which can be a part
+    of another query."""
+
+    counts = jobs.order_by().values('file__owner_id').annotate(count=Count('id')).values('count')
+    return Coalesce(Subquery(counts), 0)
+
+
+def _running_jobs_of(owner_id) -> models.QuerySet:
+    return ProofJob.objects.filter(state=ProofJob.State.RUNNING, file__owner_id=owner_id)
+
+
+def _jobs_started_recently_by(owner_id, now) -> models.QuerySet:
+    return ProofJob.objects.filter(
+        file__owner_id=owner_id,
+        start_date__gt=now - timedelta(seconds=settings.PROVER_USER_RATE_PERIOD)
+    )
+
+
+def get_fair_queue(now) -> List[Tuple[int, int]]:
+    """Returns the oldest queued job of every user, who may start a proof
+    now, as pairs of user and job ids. Users, whose proof started least
+    recently, are first, so users take turns (round-robin) however many
+    jobs each of them queued.
+
+    A user may not start a proof if `PROVER_USER_CONCURRENCY` of their
+    jobs are running or `PROVER_USER_RATE_LIMIT` of their jobs started
+    during the last `PROVER_USER_RATE_PERIOD` seconds."""
+
+    first_queued = dict(
+        ProofJob.objects.filter(state=ProofJob.State.QUEUED).order_by().values(
+            'file__owner_id'
+        ).annotate(first_id=Min('id')).values_list('file__owner_id', 'first_id')
+    )
+    if not first_queued:
+        return []
+
+    jobs = ProofJob.objects.filter(file__owner_id__in=first_queued).order_by().values('file__owner_id')
+    blocked = set()
+    if settings.PROVER_USER_CONCURRENCY:
+        blocked.update(
+            owner_id
+            for owner_id, count in jobs.filter(state=ProofJob.State.RUNNING).annotate(
+                count=Count('id')
+            ).values_list('file__owner_id', 'count')
+            if count >= settings.PROVER_USER_CONCURRENCY
+        )
+    if settings.PROVER_USER_RATE_LIMIT:
+        blocked.update(
+            owner_id
+            for owner_id, count in jobs.filter(
+                start_date__gt=now - timedelta(seconds=settings.PROVER_USER_RATE_PERIOD)
+            ).annotate(count=Count('id')).values_list('file__owner_id', 'count')
+            if count >= settings.PROVER_USER_RATE_LIMIT
+        )
+    last_start = dict(
+        jobs.filter(start_date__isnull=False).annotate(
+            last_start=Max('start_date')
+        ).values_list('file__owner_id', 'last_start')
+    )
+
+    never = datetime.min.replace(tzinfo=dt_timezone.utc)
+    return sorted(
+        ((owner_id, job_id) for owner_id, job_id in first_queued.items() if owner_id not in blocked),
+        key=lambda pair: (last_start.get(pair[0], never), pair[1])
+    )
+
+
+def requeue_abandoned_jobs(now) -> int:
+    """Queues again running jobs, which were not reported by their workers
+    for `PROVER_JOB_LEASE` seconds, e.g. because the worker crashed. Jobs
+    claimed `PROVER_JOB_MAX_ATTEMPTS` times fail instead. Returns number
+    of queued jobs."""
+
+    abandoned = ProofJob.objects.filter(
+        state=ProofJob.State.RUNNING,
+        heartbeat_date__lt=now - timedelta(seconds=settings.PROVER_JOB_LEASE)
+    )
+    abandoned.filter(attempts__gte=settings.PROVER_JOB_MAX_ATTEMPTS).update(
+        state=ProofJob.State.FAILED,
+        error='Worker proving the job stopped responding.',
+        finish_date=now
+    )
+    return abandoned.update(state=ProofJob.State.QUEUED, start_date=None, heartbeat_date=None)
+
+
+def claim_next_job() -> Optional[ProofJob]:
+    """Takes the next queued job in fair order (see `get_fair_queue`) and
+    marks it as running. Abandoned jobs are queued again first, see
+    `requeue_abandoned_jobs`.
+
+    The job is claimed with a conditional update, so when several workers
+    try to claim the same job only one of them succeeds. The update also
+    checks limits of the user again. Claims of jobs of the same user are
+    serialized by locking the user's row, otherwise workers could count
+    running jobs before each other's claims are committed and together
+    exceed the limits. The database is the only broker."""
+
+    while True:
+        start_date = timezone.now()
+        if settings.PROVER_JOB_LEASE:
+            requeue_abandoned_jobs(start_date)
+        queue = get_fair_queue(start_date)
+        if not queue:
+            return None
+
+        for owner_id, job_id in queue:
+            jobs = ProofJob.objects.filter(pk=job_id, state=ProofJob.State.QUEUED)
+            if settings.PROVER_USER_CONCURRENCY:
+                jobs = jobs.alias(running=_count_jobs(_running_jobs_of(owner_id))).filter(
+                    running__lt=settings.PROVER_USER_CONCURRENCY
+                )
+            if settings.PROVER_USER_RATE_LIMIT:
+                jobs = jobs.alias(
+                    started=_count_jobs(_jobs_started_recently_by(owner_id, start_date))
+                ).filter(started__lt=settings.PROVER_USER_RATE_LIMIT)
+            with transaction.atomic():
+                limited = settings.PROVER_USER_CONCURRENCY or settings.PROVER_USER_RATE_LIMIT
+                # Databases without row locks (SQLite) have one writer at a time.
+                if limited and connection.features.has_select_for_update:
+                    list(get_user_model().objects.select_for_update().filter(pk=owner_id).values_list('pk'))
+                claimed = jobs.update(
+                    state=ProofJob.State.RUNNING,
+                    start_date=start_date,
+                    heartbeat_date=start_date,
+                    attempts=F('attempts') + 1
+                )
+            if claimed:
+                return ProofJob.objects.get(pk=job_id)
+        # Other workers were faster, try with the updated queue.
+
+
+class ProvingResultWriter:
+    """Saves a proof of a file while its sections are being parsed.
+
+    Sections are inserted in batches, not valid yet, so saving starts
+    before the prover exits and the current sections of the file stay
+    visible. A batch is also saved when `PROVER_SECTIONS_FLUSH_INTERVAL`
+    seconds passed since the previous one, so progress of the job can be
+    followed. `finish` replaces current sections with the new ones
+    in one transaction. If proof `units` are given, they are saved with
+    the sections, so the sections can be reused by later proofs. The
+    sections and the result are grouped in a new `ProofRun`, which
+    becomes the current run of the file when it is finished."""
+
+    def __init__(
+        self,
+        file: File,
+        job: Optional[ProofJob] = None,
+        batch_size: Optional[int] = None,
+        units: Optional[List[ProofUnit]] = None
+    ) -> None:
+        self.file = file
+        self.job = job
+        self.batch_size = batch_size or settings.PROVER_SECTIONS_BATCH_SIZE
+        self.units = units or []
+        self._pending = []
+        self._section_ids = []
+        self._proved_goals = 0
+        self._unit_ids = None
+        self._run = None
+        self._last_flush = time.monotonic()
+
+    def add(self, section: FramaSection):
+        self._pending.append(section)
+        if (len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= settings.PROVER_SECTIONS_FLUSH_INTERVAL):
+            self.flush()
+
+    def add_all(self, sections: Iterable[FramaSection]):
+        for section in sections:
+            self.add(section)
+
+    def _get_unit_ids(self) -> Dict[str, int]:
+        if self._unit_ids is None:
+            run = self._get_run()
+            proved_units = ProvedUnit.objects.bulk_create(
+                [
+                    ProvedUnit(
+                        file=self.file,
+                        run=run,
+                        name=unit.name,
+                        fingerprint=unit.fingerprint,
+                        first_line=unit.first_line,
+                        last_line=unit.last_line,
+                        validity_flag=False
+                    )
+                    for unit in self.units
+                ]
+            )
+            self._unit_ids = {proved_unit.name: proved_unit.pk for proved_unit in proved_units}
+        return self._unit_ids
+
+    def _get_run(self) -> ProofRun:
+        if self._run is None:
+            self._run = ProofRun.objects.create(file=self.file, job=self.job)
+        return self._run
+
+    @transaction.atomic
+    def flush(self):
+        """Inserts pending sections in bulk."""
+
+        sections, self._pending = self._pending, []
+        self._last_flush = time.monotonic()
+        if not sections:
+            return
+
+        category_ids = SectionCategory.objects.get_ids(section.category for section in sections)
+        status_ids = SectionStatus.objects.get_ids(section.status for section in sections)
+        run = self._get_run()
+        unit_ids = self._get_unit_ids()
+        file_sections = FileSection.objects.bulk_create(
+            [
+                FileSection(
+                    related_file=self.file,
+                    category_id=category_ids[section.category],
+                    status_id=status_ids[section.status],
+                    job=self.job,
+                    proved_unit_id=unit_ids.get(section.unit),
+                    run=run,
+                    name=section.goal,
+                    function=section.function or '',
+                    property_kind=section.kind or '',
+                    validity_flag=False
+                )
+                for section in sections
+            ]
+        )
+        SectionStatusData.objects.bulk_create(
+            [
+                SectionStatusData(
+                    data=section.body,
+                    status_id=status_ids[section.status],
+                    solver=section.solver or '',
+                    time=section.time,
+                    steps=section.steps,
+                    section=file_section
+                )
+                for section, file_section in zip(sections, file_sections)
+            ]
+        )
+        self._section_ids.extend(file_section.pk for file_section in file_sections)
+        self._proved_goals += sum(section.status == 'Valid' for section in sections)
+
+    @transaction.atomic
+    def finish(self, result_data: str):
+        """Invalidates current sections and result of the file and
+        makes the new ones valid."""
+
+        self.flush()
+        run = self._get_run()
+        run.finish_date = timezone.now()
+        run.save(update_fields=['finish_date'])
+        FileSection.objects.filter(related_file=self.file, validity_flag=True).update(validity_flag=False)
+        FileProvingResult.objects.filter(related_file=self.file, validity_flag=True).update(validity_flag=False)
+        ProvedUnit.objects.filter(file=self.file, validity_flag=True).update(validity_flag=False)
+        ProvedUnit.objects.filter(id__in=self._get_unit_ids().values()).update(validity_flag=True)
+        for i in range(0, len(self._section_ids), self.batch_size):
+            FileSection.objects.filter(
+                id__in=self._section_ids[i:i + self.batch_size]
+            ).update(validity_flag=True)
+        FileProvingResult.objects.create(
+            related_file=self.file,
+            run=run,
+            data=result_data,
+            goals=len(self._section_ids),
+            proved_goals=self._proved_goals
+        )
+        File.objects.filter(pk=self.file.pk).update(
+            proof_version=F('proof_version') + 1,
+            current_run=run
+        )
+        self.file.refresh_from_db(fields=['proof_version', 'current_run'])
+
+
+def save_proving_result(file: File, result_data: str, sections: Iterable[FramaSection]):
+    """Invalidates current sections and result of the file and
+    saves the new ones."""
+
+    writer = ProvingResultWriter(file)
+    writer.add_all(sections)
+    writer.finish(result_data)
+
+
+def prove_file(file: File, job: Optional[ProofJob] = None, backend: Optional[ProverBackend] = None):
+    """Proves the file and saves its sections while the prover runs.
+    The prover is the `backend`, the backend of the job or `PROVER_BACKEND`.
+    Outcome is taken from the proof cache if possible.
+
+    If `PROVER_INCREMENTAL` is set, the file is proved function by
+    function and functions with the same fingerprint as a function
+    already proved in some file of the owner are not proved again,
+    their sections are carried forward."""
+
+    if backend is None:
+        backend = get_backend(job.backend, parse_solvers(job.solvers)) if job else get_backend()
+    filepath = file.uploaded_file.path
+    units = []
+    if settings.PROVER_INCREMENTAL:
+        with open(filepath, 'r', errors='replace') as f:
+            units = split_into_units(f.read(), proof_unit_salt(backend))
+    writer = ProvingResultWriter(file, job, units=units)
+    use_cache = settings.PROOF_CACHE_MAX_ENTRIES > 0
+
+    if use_cache:
+        key, version = file_proof_cache_key(filepath, backend)
+        if (cached := get_cached_proof(key)) is not None:
+            result_data, sections = cached
+            writer.add_all(sections)
+            writer.finish(result_data)
+            return
+
+    carried_sections = get_reusable_sections(file, units)
+    # A cache entry is a single compressed value, so parsed sections are
+    # kept until the proof ends, one per goal of the file.
+    sections = []
+    with open_frama_c_run(
+        filepath,
+        units=units,
+        carried_sections=carried_sections,
+        backend=backend
+    ) as run:
+        for section in run.sections():
+            writer.add(section)
+            if use_cache:
+                sections.append(section)
+        result_data = run.result_data()
+    writer.finish(result_data)
+
+    if use_cache:
+        store_cached_proof(key, version, result_data, sections)
+
+
+def _report_job(job: ProofJob, stop: threading.Event):
+    """Renews the lease of the running job until `stop` is set."""
+
+    try:
+        while not stop.wait(settings.PROVER_JOB_HEARTBEAT_INTERVAL):
+            ProofJob.objects.filter(pk=job.pk, start_date=job.start_date).update(
+                heartbeat_date=timezone.now()
+            )
+    finally:
+        # The thread has its own connection.
+        connection.close()
+
+
+def run_proof_job(job: ProofJob):
+    """Proves the file of a claimed job and stores the outcome. If the job
+    was queued again in the meantime (see `requeue_abandoned_jobs`),
+    the outcome of the job is left to its new claim."""
+
+    stop = threading.Event()
+    heartbeat = None
+    if settings.PROVER_JOB_LEASE and settings.PROVER_JOB_HEARTBEAT_INTERVAL:
+        heartbeat = threading.Thread(target=_report_job, args=(job, stop), daemon=True)
+        heartbeat.start()
+
+    try:
+        prove_file(job.file, job)
+    except ProverTimeout as e:
+        job.state = ProofJob.State.TIMEOUT
+        job.error = str(e)
+    except Exception as e:
+        job.state = ProofJob.State.FAILED
+        job.error = str(e)
+    except BaseException:
+        # E.g. SystemExit of a terminated worker, the job would stay running.
+        job.state = ProofJob.State.FAILED
+        job.error = 'Worker was stopped during the proof.'
+        raise
+    else:
+        job.state = ProofJob.State.DONE
+    finally:
+        stop.set()
+        if heartbeat is not None:
+            heartbeat.join()
+        job.finish_date = timezone.now()
+        ProofJob.objects.filter(pk=job.pk, start_date=job.start_date).update(
+            state=job.state,
+            error=job.error,
+            finish_date=job.finish_date
+        )
+
+
+def run_worker(poll_interval: float = 1.0, stop_when_empty: bool = False):
+    """Main loop of a prover worker: claims and runs jobs until stopped.
+    When the queue is empty, waits `poll_interval` seconds before
+    looking at it again."""
+
+    while True:
+        close_old_connections()
+        job = claim_next_job()
+        if job is None:
+            if stop_when_empty:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        run_proof_job(job)
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from prover.retention import compact_proofs, purge_deleted_entries
+
+
+class Command(BaseCommand):
+    help = (
+        'Removes old proofs of files and purges files and directories deleted '
+        'by users after a grace period.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-runs',
+            type=int,
+            default=settings.PROOF_RETENTION_RUNS,
+            help='Number of last proofs kept for each file, 0 keeps all.'
+        )
+        parser.add_argument(
+            '--keep-days',
+            type=float,
+            default=settings.PROOF_RETENTION_DAYS,
+            help='Proofs older than that many days are removed, 0 keeps all.'
+        )
+        parser.add_argument(
+            '--grace-days',
+            type=float,
+            default=settings.DELETED_ENTRIES_GRACE_DAYS,
+            help='Deleted files and directories are purged after that many days.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.RETENTION_BATCH_SIZE,
+            help='Rows deleted in one transaction.'
+        )
+
+    def handle(self, *args, **options):
+        counts = compact_proofs(options['keep_runs'], options['keep_days'], options['batch_size'])
+        self.stdout.write(
+            f'Removed {counts["runs"]} old proof runs with {counts["sections"]} sections '
+            f'and {counts["units"]} proved units.'
+        )
+        counts = purge_deleted_entries(options['grace_days'], options['batch_size'])
+        self.stdout.write(
+            f'Purged {counts["files"]} deleted files and {counts["directories"]} deleted directories.'
+        )
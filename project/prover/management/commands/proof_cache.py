@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from prover.backends import get_backend
+from prover.cache import clear_proof_cache, get_proof_cache_statistics
+
+
+class Command(BaseCommand):
+    help = 'Shows statistics of the proof cache or clears it.'
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            '--clear',
+            action='store_true',
+            help='Remove all cached proofs.'
+        )
+        group.add_argument(
+            '--clear-outdated',
+            action='store_true',
+            help='Remove proofs made by other than installed version of the prover (PROVER_BACKEND).'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            removed = clear_proof_cache()
+            self.stdout.write(f'Removed {removed} proof cache entries.')
+        elif options['clear_outdated']:
+            removed = clear_proof_cache(keep_version=get_backend().version())
+            self.stdout.write(f'Removed {removed} outdated proof cache entries.')
+
+        for name, value in get_proof_cache_statistics().items():
+            self.stdout.write(f'{name}: {value}')
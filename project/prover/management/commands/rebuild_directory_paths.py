@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from prover.models import Directory
+
+
+class Command(BaseCommand):
+    help = 'Sets paths of directories from their parents, e.g. after importing data.'
+
+    def handle(self, *args, **options):
+        changed = Directory.objects.rebuild_paths()
+        self.stdout.write(f'Updated paths of {changed} directories.')
@@ -0,0 +1,97 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from prover.backends import get_backend
+from prover.cache import clear_proof_cache
+from prover.jobs import run_worker
+from prover.processes import cancel_running_provers
+from prover.models import SectionCategory, SectionStatus
+
+
+def stop_worker(signum, frame):
+    """Handles SIGTERM of a worker: kills its provers, which are in their
+    own process groups, and exits."""
+
+    cancel_running_provers()
+    raise SystemExit(128 + signum)
+
+
+def start_worker(**kwargs):
+    handler = signal.signal(signal.SIGTERM, stop_worker)
+    try:
+        run_worker(**kwargs)
+    finally:
+        signal.signal(signal.SIGTERM, handler)
+
+
+def stop_workers(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+class Command(BaseCommand):
+    help = 'Starts a pool of workers that prove files from the proof job queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.PROVER_WORKERS,
+            help='Number of worker processes.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.PROVER_POLL_INTERVAL,
+            help='Seconds to wait before checking an empty queue again.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty.'
+        )
+
+    def handle(self, *args, **options):
+        if settings.PROOF_CACHE_MAX_ENTRIES > 0:
+            # Proofs made by other versions of the prover will never be used again.
+            removed = clear_proof_cache(keep_version=get_backend().version())
+            self.stdout.write(f'Removed {removed} outdated proof cache entries.')
+
+        # Forked workers inherit the warmed caches.
+        SectionCategory.objects.warm()
+        SectionStatus.objects.warm()
+
+        worker_kwargs = {
+            'poll_interval': options['poll_interval'],
+            'stop_when_empty': options['once'],
+        }
+        workers_count = max(1, options['workers'])
+        self.stdout.write(f'Starting {workers_count} prover worker(s).')
+
+        if workers_count == 1:
+            start_worker(**worker_kwargs)
+            return
+
+        # Workers are forked so they inherit configured Django. Database
+        # connections must not be shared with forked processes.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=start_worker, kwargs=worker_kwargs)
+            for _ in range(workers_count)
+        ]
+        for worker in workers:
+            worker.start()
+        # Workers are stopped by SIGTERM, which lets them kill their provers.
+        signal.signal(signal.SIGTERM, stop_workers)
+        try:
+            for worker in workers:
+                worker.join()
+        except (KeyboardInterrupt, SystemExit):
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
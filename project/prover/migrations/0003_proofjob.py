@@ -0,0 +1,40 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0002_auto_20210502_0830'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='fileprovingresult',
+            name='related_file',
+            field=models.ForeignKey(help_text='File, to which result relates.', on_delete=django.db.models.deletion.CASCADE, related_name='results', to='prover.file'),
+        ),
+        migrations.AlterField(
+            model_name='filesection',
+            name='related_file',
+            field=models.ForeignKey(help_text='File, to which section relates.', on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='prover.file'),
+        ),
+        migrations.CreateModel(
+            name='ProofJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('state', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('error', models.TextField(blank=True, default='')),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('start_date', models.DateTimeField(blank=True, null=True)),
+                ('finish_date', models.DateTimeField(blank=True, null=True)),
+                ('file', models.ForeignKey(help_text='File, which is proved by the job.', on_delete=django.db.models.deletion.CASCADE, related_name='proof_jobs', to='prover.file')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='proofjob',
+            index=models.Index(fields=['state', 'id'], name='prover_job_state_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-17 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0003_proofjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProofCacheCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProofCacheEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('prover_version', models.CharField(db_index=True, max_length=256)),
+                ('result_data', models.TextField()),
+                ('sections', models.JSONField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_used', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,152 @@
+# Proof sections and results are moved out of the `Entity` table, so they
+# can be inserted with `bulk_create`. Existing rows are copied with their ids,
+# so references between them stay valid.
+
+from django.core.management.color import no_style
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+# (legacy model, new model, copied columns) in order of dependencies.
+PROOF_MODELS = [
+    ('LegacySectionCategory', 'SectionCategory', ['name']),
+    ('LegacySectionStatus', 'SectionStatus', ['name']),
+    ('LegacySectionStatusData', 'SectionStatusData', ['data', 'status_id']),
+    ('LegacyFileSection', 'FileSection', [
+        'related_file_id', 'name', 'description', 'category_id',
+        'status_id', 'parent_section_id'
+    ]),
+    ('LegacyFileProvingResult', 'FileProvingResult', ['related_file_id', 'data']),
+]
+
+
+def copy_proof_models(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    new_models = []
+
+    for legacy_name, name, columns in PROOF_MODELS:
+        legacy_model = apps.get_model('prover', legacy_name)
+        new_model = apps.get_model('prover', name)
+        new_models.append(new_model)
+        # Keep original creation dates.
+        new_model._meta.get_field('creation_date').auto_now = False
+
+        rows = legacy_model.objects.using(db_alias).order_by('pk').values(
+            'entity_ptr_id', 'validity_flag', 'creation_date', *columns
+        )
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            row['id'] = row.pop('entity_ptr_id')
+            batch.append(new_model(**row))
+            if len(batch) == BATCH_SIZE:
+                new_model.objects.using(db_alias).bulk_create(batch)
+                batch = []
+        new_model.objects.using(db_alias).bulk_create(batch)
+
+    # Ids were inserted explicitly, sequences have to be moved past them.
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), new_models):
+            cursor.execute(sql)
+
+
+def delete_legacy_entities(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    entity_model = apps.get_model('prover', 'Entity')
+
+    for legacy_name, _, _ in reversed(PROOF_MODELS):
+        legacy_model = apps.get_model('prover', legacy_name)
+        while ids := list(
+            legacy_model.objects.using(db_alias).values_list('pk', flat=True)[:BATCH_SIZE]
+        ):
+            entity_model.objects.using(db_alias).filter(pk__in=ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0004_proof_cache'),
+    ]
+
+    operations = [
+        migrations.RenameModel('SectionCategory', 'LegacySectionCategory'),
+        migrations.RenameModel('SectionStatus', 'LegacySectionStatus'),
+        migrations.RenameModel('SectionStatusData', 'LegacySectionStatusData'),
+        migrations.RenameModel('FileSection', 'LegacyFileSection'),
+        migrations.RenameModel('FileProvingResult', 'LegacyFileProvingResult'),
+        migrations.CreateModel(
+            name='SectionCategory',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validity_flag', models.BooleanField(default=True)),
+                ('creation_date', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=256)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SectionStatus',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validity_flag', models.BooleanField(default=True)),
+                ('creation_date', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=256)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SectionStatusData',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validity_flag', models.BooleanField(default=True)),
+                ('creation_date', models.DateTimeField(auto_now=True)),
+                ('data', models.TextField()),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='data_set', to='prover.sectionstatus')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FileSection',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validity_flag', models.BooleanField(default=True)),
+                ('creation_date', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(blank=True, max_length=256, null=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='prover.sectioncategory')),
+                ('parent_section', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='prover.filesection')),
+                ('related_file', models.ForeignKey(help_text='File, to which section relates.', on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='prover.file')),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='prover.sectionstatus')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FileProvingResult',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validity_flag', models.BooleanField(default=True)),
+                ('creation_date', models.DateTimeField(auto_now=True)),
+                ('data', models.TextField()),
+                ('related_file', models.ForeignKey(help_text='File, to which result relates.', on_delete=django.db.models.deletion.CASCADE, related_name='results', to='prover.file')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(copy_proof_models),
+        migrations.RunPython(delete_legacy_entities),
+        migrations.DeleteModel('LegacyFileProvingResult'),
+        migrations.DeleteModel('LegacyFileSection'),
+        migrations.DeleteModel('LegacySectionStatusData'),
+        migrations.DeleteModel('LegacySectionStatus'),
+        migrations.DeleteModel('LegacySectionCategory'),
+    ]
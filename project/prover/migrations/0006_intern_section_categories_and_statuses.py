@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:41
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+import django.db.models.deletion
+
+
+def link_status_data_to_sections(apps, schema_editor):
+    """Until now each section had its own status, which held the section
+    body in status data."""
+
+    db_alias = schema_editor.connection.alias
+    file_section_model = apps.get_model('prover', 'FileSection')
+    status_data_model = apps.get_model('prover', 'SectionStatusData')
+
+    status_data_model.objects.using(db_alias).update(
+        section=Subquery(
+            file_section_model.objects.using(db_alias).filter(
+                status_id=OuterRef('status_id')
+            ).order_by('id').values('id')[:1]
+        )
+    )
+
+
+def collapse_duplicates(apps, schema_editor):
+    """Leaves one category and one status row per name."""
+
+    db_alias = schema_editor.connection.alias
+    file_section_model = apps.get_model('prover', 'FileSection')
+    status_data_model = apps.get_model('prover', 'SectionStatusData')
+    lookups = [
+        ('SectionCategory', [(file_section_model, 'category')]),
+        ('SectionStatus', [(file_section_model, 'status'), (status_data_model, 'status')]),
+    ]
+
+    for model_name, references in lookups:
+        model = apps.get_model('prover', model_name)
+        keepers = model.objects.using(db_alias).values('name').annotate(keeper=Min('id'))
+        for row in keepers:
+            duplicates = model.objects.using(db_alias).filter(
+                name=row['name']
+            ).exclude(id=row['keeper'])
+            for reference_model, field in references:
+                reference_model.objects.using(db_alias).filter(
+                    **{f'{field}__in': duplicates}
+                ).update(**{field: row['keeper']})
+            duplicates.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0005_detach_proof_models_from_entity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sectionstatusdata',
+            name='section',
+            field=models.OneToOneField(blank=True, help_text='Section, to which data relates.', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='status_data', to='prover.filesection'),
+        ),
+        migrations.RunPython(link_status_data_to_sections),
+        migrations.RunPython(collapse_duplicates),
+        migrations.AlterField(
+            model_name='sectioncategory',
+            name='name',
+            field=models.CharField(max_length=256, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='sectionstatus',
+            name='name',
+            field=models.CharField(max_length=256, unique=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0006_intern_section_categories_and_statuses'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filesection',
+            name='job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sections', to='prover.proofjob'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0007_filesection_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProvedUnit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('validity_flag', models.BooleanField(default=True)),
+                ('creation_date', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(blank=True, max_length=256)),
+                ('fingerprint', models.CharField(db_index=True, max_length=64)),
+                ('first_line', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_line', models.PositiveIntegerField(blank=True, null=True)),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proved_units', to='prover.file')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='filesection',
+            name='proved_unit',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sections', to='prover.provedunit'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:59
+
+from django.db import migrations, models
+import prover.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0008_proved_unit'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='directory',
+            managers=[
+                ('objects', prover.models.DirectoryManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='directory',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=1024),
+        ),
+        # Paths are filled by 0023_unlimited_directory_paths, once they are
+        # not limited in length.
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0009_directory_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='directory',
+            index=models.Index(condition=models.Q(('availability_flag', True)), fields=['owner', 'parent_dir', 'name'], name='prover_dir_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='file',
+            index=models.Index(condition=models.Q(('availability_flag', True)), fields=['owner', 'parent_dir'], name='prover_file_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fileprovingresult',
+            index=models.Index(condition=models.Q(('validity_flag', True)), fields=['related_file', 'id'], name='prover_result_valid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filesection',
+            index=models.Index(condition=models.Q(('validity_flag', True)), fields=['related_file', 'id'], name='prover_section_valid_idx'),
+        ),
+    ]
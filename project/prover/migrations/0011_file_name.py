@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:04
+
+import os
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_file_names(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    file_model = apps.get_model('prover', 'File')
+
+    batch = []
+    files = file_model.objects.using(db_alias).only('uploaded_file').order_by('pk')
+    for file in files.iterator(chunk_size=BATCH_SIZE):
+        file.name = os.path.basename(file.uploaded_file.name)
+        batch.append(file)
+        if len(batch) == BATCH_SIZE:
+            file_model.objects.using(db_alias).bulk_update(batch, ['name'])
+            batch = []
+    file_model.objects.using(db_alias).bulk_update(batch, ['name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0010_listing_and_validity_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='directory',
+            name='prover_dir_listing_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='file',
+            name='prover_file_listing_idx',
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='name',
+            field=models.CharField(blank=True, editable=False, max_length=256),
+        ),
+        migrations.RunPython(fill_file_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='directory',
+            index=models.Index(condition=models.Q(('availability_flag', True)), fields=['owner', 'parent_dir', 'name', 'entity_ptr'], name='prover_dir_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='file',
+            index=models.Index(condition=models.Q(('availability_flag', True)), fields=['owner', 'parent_dir', 'name', 'entity_ptr'], name='prover_file_listing_idx'),
+        ),
+    ]
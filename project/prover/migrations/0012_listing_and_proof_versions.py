@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('prover', '0011_file_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='proof_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='ListingVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('directory', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='prover.directory')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='listingversion',
+            constraint=models.UniqueConstraint(fields=('owner', 'directory'), name='prover_listing_version_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='listingversion',
+            constraint=models.UniqueConstraint(condition=models.Q(('directory', None)), fields=('owner',), name='prover_main_listing_version_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0012_listing_and_proof_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proofjob',
+            name='backend',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0013_proof_job_backend'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proofjob',
+            name='solvers',
+            field=models.CharField(blank=True, default='', max_length=256),
+        ),
+        migrations.AddField(
+            model_name='sectionstatusdata',
+            name='solver',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='sectionstatusdata',
+            name='time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
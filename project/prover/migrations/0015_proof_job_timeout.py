@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0014_solver_portfolio'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='proofjob',
+            name='state',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed'), ('timeout', 'Timeout')], default='queued', max_length=16),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+def fail_duplicate_jobs(apps, schema_editor):
+    """Only the oldest of unfinished jobs of the same proof is kept."""
+
+    db_alias = schema_editor.connection.alias
+    job_model = apps.get_model('prover', 'ProofJob')
+
+    kept = {}
+    duplicates = {}
+    jobs = job_model.objects.using(db_alias).filter(
+        state__in=['queued', 'running']
+    ).order_by('id').values_list('id', 'file_id', 'backend', 'solvers')
+    for pk, *proof in jobs:
+        proof = tuple(proof)
+        if proof in kept:
+            duplicates.setdefault(kept[proof], []).append(pk)
+        else:
+            kept[proof] = pk
+    for pk, duplicate_ids in duplicates.items():
+        job_model.objects.using(db_alias).filter(id__in=duplicate_ids).update(
+            state='failed',
+            error=f'Merged with job {pk}.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0015_proof_job_timeout'),
+    ]
+
+    operations = [
+        migrations.RunPython(fail_duplicate_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='proofjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('state__in', ['queued', 'running'])), fields=('file', 'backend', 'solvers'), name='prover_job_active_unique'),
+        ),
+    ]
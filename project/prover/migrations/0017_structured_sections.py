@@ -0,0 +1,159 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:23
+
+import re
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+BATCH_SIZE = 1000
+
+# Copy of the section parser of `prover.processes` at the time of the
+# migration, so that later changes of the parser do not change it.
+SOLVER_RESULT = re.compile(r'^Prover (.+?) returns \S+(.*)$')
+SOLVER_TIME = re.compile(r'\((\d+(?:\.\d+)?)(ms|s)\)')
+SOLVER_STEPS = re.compile(r'\((\d+)\)')
+GOAL_FUNCTION = re.compile(r" in '([^']*)'$")
+GOAL_LOCATION = re.compile(r'\s*\(file [^)]*\)')
+GOAL_NAME = re.compile(r"'([^']*)'")
+
+
+def parse_goal_header(header):
+    header = header.strip().rstrip(':')
+    function = None
+    if match := GOAL_FUNCTION.search(header):
+        function = match.group(1)
+        header = header[:match.start()]
+    header = GOAL_LOCATION.sub('', header).strip()
+
+    if header.startswith('Lemma '):
+        return 'Lemma', header[len('Lemma '):].strip() or None, function
+    if not header.startswith('Goal '):
+        return None, None, function
+    header = header[len('Goal '):]
+    name = GOAL_NAME.search(header)
+    kind = header.split("'", 1)[0].strip()
+    return kind or None, name.group(1) if name else None, function
+
+
+def parse_section(body):
+    """Returns kind, name and function of the property and solver,
+    time and steps of its proof, or None if the body is not a section."""
+
+    lines = body.strip().split('\n')
+    if len(lines) < 2:
+        return None
+
+    solver, time, steps = None, None, None
+    if match := SOLVER_RESULT.match(lines[-1].strip()):
+        solver = match.group(1)
+        if time_match := SOLVER_TIME.search(match.group(2)):
+            time = float(time_match.group(1)) / (1000 if time_match.group(2) == 'ms' else 1)
+        if steps_match := SOLVER_STEPS.search(match.group(2)):
+            steps = int(steps_match.group(1))
+    return (*parse_goal_header(lines[0]), solver, time, steps)
+
+
+def fill_structured_fields(apps, schema_editor):
+    """Parses goals and solvers out of bodies of existing sections and
+    counts goals of current results."""
+
+    db_alias = schema_editor.connection.alias
+    section_model = apps.get_model('prover', 'FileSection')
+    data_model = apps.get_model('prover', 'SectionStatusData')
+    result_model = apps.get_model('prover', 'FileProvingResult')
+
+    sections, data = [], []
+
+    def save_batch():
+        section_model.objects.using(db_alias).bulk_update(sections, ['name', 'function', 'property_kind'])
+        data_model.objects.using(db_alias).bulk_update(data, ['solver', 'time', 'steps'])
+        sections.clear()
+        data.clear()
+
+    rows = data_model.objects.using(db_alias).filter(section__isnull=False).order_by('pk').values_list(
+        'pk', 'section_id', 'data'
+    )
+    for pk, section_id, body in rows.iterator(chunk_size=BATCH_SIZE):
+        parsed = parse_section(body)
+        if parsed is None:
+            continue
+        kind, goal, function, solver, time, steps = parsed
+        sections.append(section_model(
+            pk=section_id,
+            name=goal,
+            function=function or '',
+            property_kind=kind or ''
+        ))
+        data.append(data_model(pk=pk, solver=solver or '', time=time, steps=steps))
+        if len(data) == BATCH_SIZE:
+            save_batch()
+    save_batch()
+
+    counts = {
+        file_id: (goals, proved_goals)
+        for file_id, goals, proved_goals in section_model.objects.using(db_alias).filter(
+            validity_flag=True
+        ).order_by().values('related_file_id').annotate(
+            goals=Count('id'),
+            proved_goals=Count('id', filter=Q(status__name='Valid'))
+        ).values_list('related_file_id', 'goals', 'proved_goals')
+    }
+    results = list(result_model.objects.using(db_alias).filter(
+        validity_flag=True,
+        related_file_id__in=counts
+    ).only('related_file_id'))
+    for result in results:
+        result.goals, result.proved_goals = counts[result.related_file_id]
+    result_model.objects.using(db_alias).bulk_update(results, ['goals', 'proved_goals'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0016_proof_job_fair_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fileprovingresult',
+            name='goals',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='fileprovingresult',
+            name='proved_goals',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='filesection',
+            name='function',
+            field=models.CharField(blank=True, default='', max_length=256),
+        ),
+        migrations.AddField(
+            model_name='filesection',
+            name='property_kind',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='sectionstatusdata',
+            name='steps',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_structured_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='filesection',
+            index=models.Index(condition=models.Q(('validity_flag', True)), fields=['related_file', 'function'], name='prover_section_function_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filesection',
+            index=models.Index(fields=['status', 'creation_date'], name='prover_section_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filesection',
+            index=models.Index(fields=['property_kind', 'status'], name='prover_section_kind_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sectionstatusdata',
+            index=models.Index(fields=['solver', 'time'], name='prover_status_solver_idx'),
+        ),
+    ]
@@ -0,0 +1,92 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:25
+
+from django.db import migrations, models
+import prover.fields
+
+BATCH_SIZE = 1000
+COMPRESSED_MODELS = ('FileProvingResult', 'SectionStatusData')
+
+
+def copy_data(apps, schema_editor, source, target):
+    db_alias = schema_editor.connection.alias
+    for model_name in COMPRESSED_MODELS:
+        model = apps.get_model('prover', model_name)
+        batch = []
+        rows = model.objects.using(db_alias).order_by('pk').values_list('pk', source)
+        for pk, data in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(model(pk=pk, **{target: data}))
+            if len(batch) == BATCH_SIZE:
+                model.objects.using(db_alias).bulk_update(batch, [target])
+                batch = []
+        model.objects.using(db_alias).bulk_update(batch, [target])
+
+
+def compress_data(apps, schema_editor):
+    copy_data(apps, schema_editor, 'data', 'compressed_data')
+
+
+def decompress_data(apps, schema_editor):
+    copy_data(apps, schema_editor, 'compressed_data', 'data')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0017_structured_sections'),
+    ]
+
+    # Columns change type, so compressed data is written to new columns,
+    # which replace the old ones, on every database backend.
+    operations = [
+        migrations.AddField(
+            model_name='fileprovingresult',
+            name='compressed_data',
+            field=prover.fields.CompressedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name='sectionstatusdata',
+            name='compressed_data',
+            field=prover.fields.CompressedTextField(null=True),
+        ),
+        # Nullable, so that the old columns can be added back when the
+        # migration is reverted.
+        migrations.AlterField(
+            model_name='fileprovingresult',
+            name='data',
+            field=models.TextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='sectionstatusdata',
+            name='data',
+            field=models.TextField(null=True),
+        ),
+        migrations.RunPython(compress_data, decompress_data),
+        migrations.RemoveField(
+            model_name='fileprovingresult',
+            name='data',
+        ),
+        migrations.RemoveField(
+            model_name='sectionstatusdata',
+            name='data',
+        ),
+        migrations.RenameField(
+            model_name='fileprovingresult',
+            old_name='compressed_data',
+            new_name='data',
+        ),
+        migrations.RenameField(
+            model_name='sectionstatusdata',
+            old_name='compressed_data',
+            new_name='data',
+        ),
+        migrations.AlterField(
+            model_name='fileprovingresult',
+            name='data',
+            field=prover.fields.CompressedTextField(),
+        ),
+        migrations.AlterField(
+            model_name='sectionstatusdata',
+            name='data',
+            field=prover.fields.CompressedTextField(),
+        ),
+    ]
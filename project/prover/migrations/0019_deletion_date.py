@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:29
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def date_deleted_entries(apps, schema_editor):
+    """Entries deleted before are treated as deleted now, so the grace
+    period before purging them starts with the migration."""
+
+    db_alias = schema_editor.connection.alias
+    now = timezone.now()
+    for model_name in ('Directory', 'File'):
+        model = apps.get_model('prover', model_name)
+        model.objects.using(db_alias).filter(availability_flag=False).update(deletion_date=now)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0018_compressed_proof_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='directory',
+            name='deletion_date',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='deletion_date',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(date_deleted_entries, migrations.RunPython.noop),
+    ]
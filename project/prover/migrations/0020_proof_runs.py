@@ -0,0 +1,104 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db.models import Min
+
+
+def create_runs(apps, schema_editor):
+    """Groups existing sections and results of files into runs. Sections
+    of a proof were saved after the result of the previous proof of the
+    file and before its own result. Sections saved after the last result
+    belong to a proof, which did not finish."""
+
+    db_alias = schema_editor.connection.alias
+    file_model = apps.get_model('prover', 'File')
+    run_model = apps.get_model('prover', 'ProofRun')
+    result_model = apps.get_model('prover', 'FileProvingResult')
+    section_model = apps.get_model('prover', 'FileSection')
+
+    file_ids = section_model.objects.using(db_alias).values_list('related_file_id', flat=True).union(
+        result_model.objects.using(db_alias).values_list('related_file_id', flat=True)
+    )
+    for file_id in sorted(file_ids):
+        unassigned = section_model.objects.using(db_alias).filter(related_file_id=file_id, run=None)
+        results = result_model.objects.using(db_alias).filter(related_file_id=file_id).order_by('id')
+        current_run = None
+
+        def create_run(sections, **fields):
+            job_id = sections.exclude(job=None).values_list('job_id', flat=True).first()
+            start_date = sections.aggregate(start_date=Min('creation_date'))['start_date']
+            run = run_model.objects.using(db_alias).create(
+                file_id=file_id,
+                job_id=job_id,
+                start_date=start_date or fields['finish_date'],
+                **fields
+            )
+            sections.update(run=run)
+            return run
+
+        for result in results.values('id', 'creation_date', 'validity_flag'):
+            run = create_run(
+                unassigned.filter(creation_date__lte=result['creation_date']),
+                finish_date=result['creation_date']
+            )
+            results.filter(pk=result['id']).update(run=run)
+            if result['validity_flag']:
+                current_run = run
+        if unassigned.exists():
+            create_run(unassigned)
+        if current_run is not None:
+            file_model.objects.using(db_alias).filter(pk=file_id).update(current_run=current_run)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0019_deletion_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProofRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('finish_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='proofrun',
+            name='file',
+            field=models.ForeignKey(help_text='File, which was proved.', on_delete=django.db.models.deletion.CASCADE, related_name='runs', to='prover.file'),
+        ),
+        migrations.AddField(
+            model_name='proofrun',
+            name='job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='prover.proofjob'),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='current_run',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='prover.proofrun'),
+        ),
+        migrations.AddField(
+            model_name='fileprovingresult',
+            name='run',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='result', to='prover.proofrun'),
+        ),
+        migrations.AddField(
+            model_name='filesection',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='prover.proofrun'),
+        ),
+        migrations.AddIndex(
+            model_name='proofrun',
+            index=models.Index(fields=['file', '-start_date'], name='prover_run_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='filesection',
+            index=models.Index(fields=['run', 'id'], name='prover_section_run_idx'),
+        ),
+        migrations.RunPython(create_runs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:41
+
+import json
+
+from django.db import migrations, models
+import prover.fields
+
+BATCH_SIZE = 1000
+
+
+def copy_entries(apps, schema_editor, source_prefix, target_prefix, convert_sections):
+    db_alias = schema_editor.connection.alias
+    model = apps.get_model('prover', 'ProofCacheEntry')
+    fields = [f'{target_prefix}result_data', f'{target_prefix}sections']
+    batch = []
+    rows = model.objects.using(db_alias).order_by('pk').values_list(
+        'pk', f'{source_prefix}result_data', f'{source_prefix}sections'
+    )
+    for pk, result_data, sections in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(model(pk=pk, **dict(zip(fields, (result_data, convert_sections(sections))))))
+        if len(batch) == BATCH_SIZE:
+            model.objects.using(db_alias).bulk_update(batch, fields)
+            batch = []
+    model.objects.using(db_alias).bulk_update(batch, fields)
+
+
+def compress_entries(apps, schema_editor):
+    copy_entries(apps, schema_editor, '', 'compressed_', json.dumps)
+
+
+def decompress_entries(apps, schema_editor):
+    copy_entries(apps, schema_editor, 'compressed_', '', json.loads)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0020_proof_runs'),
+    ]
+
+    # Columns change type, so compressed data is written to new columns,
+    # which replace the old ones, see 0018_compressed_proof_data.
+    operations = [
+        migrations.AddField(
+            model_name='proofcacheentry',
+            name='compressed_result_data',
+            field=prover.fields.CompressedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name='proofcacheentry',
+            name='compressed_sections',
+            field=prover.fields.CompressedTextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='proofcacheentry',
+            name='result_data',
+            field=models.TextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='proofcacheentry',
+            name='sections',
+            field=models.JSONField(null=True),
+        ),
+        migrations.RunPython(compress_entries, decompress_entries),
+        migrations.RemoveField(
+            model_name='proofcacheentry',
+            name='result_data',
+        ),
+        migrations.RemoveField(
+            model_name='proofcacheentry',
+            name='sections',
+        ),
+        migrations.RenameField(
+            model_name='proofcacheentry',
+            old_name='compressed_result_data',
+            new_name='result_data',
+        ),
+        migrations.RenameField(
+            model_name='proofcacheentry',
+            old_name='compressed_sections',
+            new_name='sections',
+        ),
+        migrations.AlterField(
+            model_name='proofcacheentry',
+            name='result_data',
+            field=prover.fields.CompressedTextField(),
+        ),
+        migrations.AlterField(
+            model_name='proofcacheentry',
+            name='sections',
+            field=prover.fields.CompressedTextField(),
+        ),
+    ]
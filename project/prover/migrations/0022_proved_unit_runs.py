@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def assign_runs(apps, schema_editor):
+    """Assigns units to the run of their sections. Units without sections
+    stay without a run."""
+
+    db_alias = schema_editor.connection.alias
+    unit_model = apps.get_model('prover', 'ProvedUnit')
+    section_model = apps.get_model('prover', 'FileSection')
+
+    unit_model.objects.using(db_alias).update(run_id=Subquery(
+        section_model.objects.filter(proved_unit=OuterRef('pk'), run__isnull=False).order_by().values('run_id')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0021_compressed_proof_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='provedunit',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='units', to='prover.proofrun'),
+        ),
+        migrations.RunPython(assign_runs, migrations.RunPython.noop),
+    ]
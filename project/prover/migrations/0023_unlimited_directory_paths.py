@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:12
+
+from django.db import migrations, models
+
+
+def fill_directory_paths(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    directory_model = apps.get_model('prover', 'Directory')
+    directory_model.objects.db_manager(db_alias).rebuild_paths()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0022_proved_unit_runs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='directory',
+            name='path',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        # Paths of trees of any depth fit now. Paths of databases migrated
+        # before are correct already, they are only checked.
+        migrations.RunPython(fill_directory_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='directory',
+            index=models.Index(fields=['path'], name='prover_dir_path_idx'),
+        ),
+    ]
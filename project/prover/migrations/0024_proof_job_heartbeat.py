@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:38
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_leases(apps, schema_editor):
+    """Running jobs were claimed once, their lease starts with them."""
+
+    db_alias = schema_editor.connection.alias
+    job_model = apps.get_model('prover', 'ProofJob')
+    job_model.objects.using(db_alias).filter(state='running').update(
+        heartbeat_date=F('start_date'),
+        attempts=1
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prover', '0023_unlimited_directory_paths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proofjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='proofjob',
+            name='heartbeat_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_leases, migrations.RunPython.noop),
+    ]
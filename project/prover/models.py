@@ -1,18 +1,102 @@
 from enum import Enum
 import os
+from typing import Dict, Iterable, List, Optional
 
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .fields import CompressedTextField
 
 User = get_user_model()
 
 
-class Entity(models.Model):
-    """Base model for all entities in data model."""
+class AbstractEntity(models.Model):
+    """Fields shared by all entities in data model. Entities, which are
+    created in large numbers by proving, inherit them directly, so they
+    are kept in a single table and can be inserted with `bulk_create`."""
 
     validity_flag = models.BooleanField(default=True)
     creation_date = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        abstract = True
+
+
+class Entity(AbstractEntity):
+    """Base model for all entities in data model."""
+
+
+def directory_path_step(pk: int) -> str:
+    """Returns part of a directory path standing for directory `pk`.
+
+    Paths consist of digits only, each id is preceded by its length,
+    so a path is never a prefix of a path of another branch and paths
+    of a subtree form a range under any database collation."""
+
+    digits = str(pk)
+    return f'{len(digits):02d}{digits}'
+
+
+def directory_path_ids(path: str) -> List[int]:
+    """Returns ids of directories in the path, starting with the root."""
+
+    ids = []
+    position = 0
+    while position < len(path):
+        length = int(path[position:position + 2])
+        ids.append(int(path[position + 2:position + 2 + length]))
+        position += 2 + length
+    return ids
+
+
+def path_prefix_filter(field: str, prefix: str) -> Q:
+    """Returns condition on paths in `field` starting with `prefix`
+    as a range, which can use an index of the field."""
+
+    upper = str(int(prefix) + 1).zfill(len(prefix))
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': upper})
+
+
+class DirectoryManager(models.Manager):
+    # Paths are filled by a data migration.
+    use_in_migrations = True
+
+    def rebuild_paths(self) -> int:
+        """Sets paths of all directories from their parents, e.g. for data
+        created without `Directory.save`. Returns number of changed paths."""
+
+        parents = {}
+        paths = {}
+        for pk, parent_id, path in self.values_list('pk', 'parent_dir_id', 'path').iterator():
+            parents[pk] = parent_id
+            paths[pk] = path
+
+        correct = {}
+        for pk in parents:
+            # Iterative, the hierarchy may be deeper than Python stack.
+            chain, seen = [], set()
+            while pk is not None and pk not in correct and pk not in seen:
+                chain.append(pk)
+                seen.add(pk)
+                pk = parents.get(pk)
+            path = correct[pk] + directory_path_step(pk) if pk in correct else ''
+            for directory_pk in reversed(chain):
+                correct[directory_pk] = path
+                path += directory_path_step(directory_pk)
+
+        changed = [
+            self.model(pk=pk, path=path)
+            for pk, path in correct.items()
+            if paths[pk] != path
+        ]
+        self.bulk_update(changed, ['path'], batch_size=500)
+
+        return len(changed)
+
 
 class Directory(Entity):
     """Directory - is an entity that holds files and 
@@ -23,6 +107,8 @@ class Directory(Entity):
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     # False if the directory was deleted:
     availability_flag = models.BooleanField(default=True)
+    # When the directory was deleted, it is purged after a grace period.
+    deletion_date = models.DateTimeField(null=True, blank=True, editable=False)
 
     parent_dir = models.ForeignKey(
         'self',
@@ -30,14 +116,128 @@ class Directory(Entity):
         null=True,  # In main directory if null=True
         blank=True
     )
+    # Ancestors of the directory, see `directory_path_step`. Maintained
+    # by `save`, so subtrees and ancestors are found by one query. It is
+    # not limited in length, trees may be of any depth.
+    path = models.TextField(blank=True, editable=False)
+
+    objects = DirectoryManager()
+
+    class Meta:
+        indexes = [
+            # Listing of a directory in order of names and checking names
+            # of its subdirectories.
+            models.Index(
+                fields=['owner', 'parent_dir', 'name', 'entity_ptr'],
+                condition=Q(availability_flag=True),
+                name='prover_dir_listing_idx'
+            ),
+            # Subtrees are ranges of paths, see `path_prefix_filter`.
+            models.Index(fields=['path'], name='prover_dir_path_idx'),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Deferred field is not loaded here, the directory is then treated
+        # as moved on save.
+        self._saved_parent_dir_id = self.__dict__.get('parent_dir_id')
+
+    def save(self, *args, **kwargs):
+        """Saves the directory and marks listing of its parent as changed.
+        If it is new or was moved to another parent, its path and paths
+        of its descendants are updated."""
+
+        created = self.pk is None
+        moved = not created and self.parent_dir_id != self._saved_parent_dir_id
+        if (created or moved) and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'path'}
+
+        with transaction.atomic():
+            if created or moved:
+                self._save_with_path(*args, **kwargs)
+            else:
+                super().save(*args, **kwargs)
+            if moved:
+                ListingVersion.objects.bump(self.owner_id, self._saved_parent_dir_id)
+            ListingVersion.objects.bump(self.owner_id, self.parent_dir_id)
+
+        self._saved_parent_dir_id = self.parent_dir_id
+
+    def _save_with_path(self, *args, **kwargs):
+        parent_path = ''
+        if self.parent_dir_id is not None:
+            parent_path = Directory.objects.values_list('path', flat=True).get(
+                pk=self.parent_dir_id
+            ) + directory_path_step(self.parent_dir_id)
+
+        old_prefix = None
+        if self.pk is not None:
+            if self.pk in directory_path_ids(parent_path):
+                raise ValidationError('Directory cannot be moved into itself.')
+            old_path = Directory.objects.filter(pk=self.pk).values_list('path', flat=True).first()
+            if old_path is not None:
+                old_prefix = old_path + directory_path_step(self.pk)
+
+        self.path = parent_path
+        super().save(*args, **kwargs)
+
+        new_prefix = self.path + directory_path_step(self.pk)
+        if old_prefix is not None and old_prefix != new_prefix:
+            Directory.objects.filter(path_prefix_filter('path', old_prefix)).update(
+                path=Concat(Value(new_prefix), Substr('path', len(old_prefix) + 1))
+            )
+
+    def move_to(self, parent_dir: Optional['Directory']):
+        """Moves the directory with its contents to `parent_dir`
+        (main directory if None)."""
+
+        self.parent_dir = parent_dir
+        self.save()
+
+    def ancestor_ids(self) -> List[int]:
+        return directory_path_ids(self.path)
+
+    def ancestors(self) -> models.QuerySet:
+        """Returns directories above this one, starting with the root."""
+
+        return Directory.objects.filter(pk__in=self.ancestor_ids()).order_by('path')
+
+    def subtree(self) -> models.QuerySet:
+        """Returns the directory and all directories below it."""
+
+        prefix = self.path + directory_path_step(self.pk)
+        return Directory.objects.filter(Q(pk=self.pk) | path_prefix_filter('path', prefix))
 
     def delete_by_user(self):
         """If a user deletes a directory it is not removed from database,
         its `availability_flag` changes."""
 
         self.availability_flag = False
+        self.deletion_date = timezone.now()
         self.save()
 
+    @transaction.atomic
+    def delete_tree_by_user(self):
+        """Deletes the directory with all directories and files below it
+        like `delete_by_user`, with one update per table regardless of
+        size of the tree."""
+
+        now = timezone.now()
+        subtree_ids = self.subtree().values('pk')
+        # Entries deleted before keep their deletion dates.
+        File.objects.filter(parent_dir_id__in=subtree_ids, availability_flag=True).update(
+            availability_flag=False,
+            deletion_date=now
+        )
+        Directory.objects.filter(pk__in=subtree_ids, availability_flag=True).update(
+            availability_flag=False,
+            deletion_date=now
+        )
+        ListingVersion.objects.filter(directory_id__in=subtree_ids).update(version=F('version') + 1)
+        ListingVersion.objects.bump(self.owner_id, self.parent_dir_id)
+        self.availability_flag = False
+        self.deletion_date = now
+
     def __str__(self) -> str:
         return self.name
 
@@ -50,6 +250,8 @@ class File(Entity):
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     # False if the file was deleted
     availability_flag = models.BooleanField(default=True)
+    # When the file was deleted, it is purged after a grace period.
+    deletion_date = models.DateTimeField(null=True, blank=True, editable=False)
     parent_dir = models.ForeignKey(
         Directory,
         on_delete=models.CASCADE,
@@ -57,22 +259,158 @@ class File(Entity):
         blank=True
     )
     uploaded_file = models.FileField(upload_to='files')
+    # Name of the uploaded file in storage, kept by `save`.
+    name = models.CharField(max_length=256, blank=True, editable=False)
+    # Increased whenever current sections or result of the file change.
+    proof_version = models.PositiveIntegerField(default=0, editable=False)
+    # Last finished proof of the file, its sections and result are current.
+    current_run = models.ForeignKey(
+        'ProofRun',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+
+    class Meta:
+        indexes = [
+            # Listing of a directory in order of names.
+            models.Index(
+                fields=['owner', 'parent_dir', 'name', 'entity_ptr'],
+                condition=Q(availability_flag=True),
+                name='prover_file_listing_idx'
+            ),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._saved_parent_dir_id = self.__dict__.get('parent_dir_id')
+
+    def save(self, *args, **kwargs):
+        """Saves the file and marks listing of its directory as changed."""
+
+        uploaded_file = self.uploaded_file
+        if uploaded_file and not uploaded_file._committed:
+            # Storage may rename the file, so it is stored first.
+            uploaded_file.save(uploaded_file.name, uploaded_file.file, save=False)
+        self.name = os.path.basename(uploaded_file.name)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'name'}
+
+        with transaction.atomic():
+            moved = self.pk is not None and self.parent_dir_id != self._saved_parent_dir_id
+            super().save(*args, **kwargs)
+            if moved:
+                ListingVersion.objects.bump(self.owner_id, self._saved_parent_dir_id)
+            ListingVersion.objects.bump(self.owner_id, self.parent_dir_id)
+
+        self._saved_parent_dir_id = self.parent_dir_id
 
     def delete_by_user(self):
         """If a user deletes a file it is not removed from database,
         its `availability_flag` changes."""
 
         self.availability_flag = False
+        self.deletion_date = timezone.now()
         self.save()
 
     def get_name(self) -> str:
-        return os.path.basename(self.uploaded_file.name)
+        return self.name
 
     def __str__(self) -> str:
         return self.get_name()
 
 
-class SectionCategory(Entity):
+class ListingVersionManager(models.Manager):
+    def bump(self, owner_id: int, directory_id: Optional[int]):
+        """Marks listing of the directory (main directory if None)
+        of the owner as changed."""
+
+        versions = self.filter(owner_id=owner_id, directory_id=directory_id)
+        if not versions.update(version=F('version') + 1):
+            try:
+                with transaction.atomic():
+                    self.create(owner_id=owner_id, directory_id=directory_id, version=1)
+            except IntegrityError:
+                # Created by another request in the meantime.
+                versions.update(version=F('version') + 1)
+
+    def get_version(self, owner_id: int, directory_id: Optional[int]) -> int:
+        version = self.filter(owner_id=owner_id, directory_id=directory_id).values_list(
+            'version',
+            flat=True
+        ).first()
+        return version or 0
+
+
+class ListingVersion(models.Model):
+    """Counter of changes of contents of a directory of a user, so clients
+    can tell whether their copy of the listing is current."""
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Main directory if null.
+    directory = models.ForeignKey(Directory, on_delete=models.CASCADE, null=True, blank=True)
+    version = models.PositiveIntegerField(default=0)
+
+    objects = ListingVersionManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['owner', 'directory'],
+                name='prover_listing_version_unique'
+            ),
+            # Nulls are distinct in the constraint above.
+            models.UniqueConstraint(
+                fields=['owner'],
+                condition=Q(directory=None),
+                name='prover_main_listing_version_unique'
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'Listing of {self.directory or "main directory"}: {self.version}'
+
+
+class NameLookupManager(models.Manager):
+    """Manager of a lookup table with unique names. Names are mapped to
+    ids by an in-process cache, so rows are created only for new names
+    and known names cost no queries."""
+
+    def __init__(self):
+        super().__init__()
+        self._ids = {}
+
+    def warm(self):
+        """Loads all names to the cache."""
+
+        self._ids.update(self.values_list('name', 'id'))
+
+    def clear_cache(self):
+        self._ids.clear()
+
+    def get_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Returns ids of rows with given names, missing rows are created."""
+
+        names = set(names)
+        ids = {name: self._ids[name] for name in names if name in self._ids}
+        if missing := names - ids.keys():
+            found = dict(self.filter(name__in=missing).values_list('name', 'id'))
+            if len(found) < len(missing):
+                self.bulk_create(
+                    [self.model(name=name) for name in missing - found.keys()],
+                    ignore_conflicts=True
+                )
+                found = dict(self.filter(name__in=missing).values_list('name', 'id'))
+            ids.update(found)
+            # Rows created in a rolled back transaction must not be cached.
+            transaction.on_commit(lambda: self._ids.update(found), using=self.db)
+
+        return ids
+
+
+class SectionCategory(AbstractEntity):
     """Section category - is an entity that defines the type 
     of a section; category defines the way the file section 
     is handled by the application. Possible section categories 
@@ -81,42 +419,94 @@ class SectionCategory(Entity):
 
     name = models.CharField(
         max_length=256,
+        unique=True
     )
 
+    objects = NameLookupManager()
+
     def __str__(self) -> str:
         return f'{self.name}'
 
 
-class SectionStatus(Entity):
+class SectionStatus(AbstractEntity):
     """Section status - is an entity that defines the status
     of a section; example status' are: proved, invalid, 
     counterexample, unchecked."""
 
     name = models.CharField(
         max_length=256,
+        unique=True
     )
 
+    objects = NameLookupManager()
+
     def __str__(self) -> str:
         return f'Section Status: {self.name}'
 
 
-class SectionStatusData(Entity):
+class SectionStatusData(AbstractEntity):
     """Section status - is an entity that defines data associated 
     with the section status, e.g. the counterexample content, 
     the name of the solver that proved validity (e.g. Z3, CVC4 etc.)."""
 
-    data = models.TextField()
+    data = CompressedTextField()
     status = models.ForeignKey(
         SectionStatus,
         on_delete=models.CASCADE,
         related_name='data_set'
     )
+    # Solver, which gave the status, seconds and steps it took, if reported.
+    solver = models.CharField(max_length=64, blank=True, default='')
+    time = models.FloatField(null=True, blank=True)
+    steps = models.PositiveIntegerField(null=True, blank=True)
+    section = models.OneToOneField(
+        'FileSection',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text='Section, to which data relates.',
+        related_name='status_data'
+    )
+
+    class Meta:
+        indexes = [
+            # Statistics of solvers.
+            models.Index(fields=['solver', 'time'], name='prover_status_solver_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'Status data to status: {self.status.name}'
 
 
-class FileSection(Entity):
+class ProvedUnit(AbstractEntity):
+    """Part of a file proved by a separate Frama-C run: a function or,
+    if `name` is empty, global properties. Sections of a valid unit can be
+    reused by a proof of any file of the owner with the same `fingerprint`."""
+
+    file = models.ForeignKey(
+        File,
+        on_delete=models.CASCADE,
+        related_name='proved_units'
+    )
+    # Proof, which proved the unit, units are removed with it.
+    run = models.ForeignKey(
+        'ProofRun',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='units'
+    )
+    name = models.CharField(max_length=256, blank=True)
+    fingerprint = models.CharField(max_length=64, db_index=True)
+    # Lines of the function with its contract, empty for global properties.
+    first_line = models.PositiveIntegerField(null=True, blank=True)
+    last_line = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f'Unit {self.name or "(global)"} of {self.file}'
+
+
+class FileSection(AbstractEntity):
     """File section - is an entity that contains a meaningful 
     piece of code within a file or comments; 
     some file sections may contain subsections."""
@@ -127,10 +517,14 @@ class FileSection(Entity):
         help_text='File, to which section relates.',
         related_name='sections'
     )
+    # Name of the proved property, if it has one.
     name = models.CharField(max_length=256, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     category = models.ForeignKey(SectionCategory, on_delete=models.CASCADE)
     status = models.ForeignKey(SectionStatus, on_delete=models.CASCADE)
+    # Function and kind (e.g. `Post-condition`) of the proved property.
+    function = models.CharField(max_length=256, blank=True, default='')
+    property_kind = models.CharField(max_length=64, blank=True, default='')
     # A section can be a subsection of some parent section.
     parent_section = models.ForeignKey(
         'self',
@@ -138,19 +532,208 @@ class FileSection(Entity):
         null=True,
         blank=True
     )
+    # Proof job, which created the section.
+    job = models.ForeignKey(
+        'ProofJob',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sections'
+    )
+    # Unit, which proof contains the section.
+    proved_unit = models.ForeignKey(
+        ProvedUnit,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sections'
+    )
+    # Proof, which created the section.
+    run = models.ForeignKey(
+        'ProofRun',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='sections'
+    )
+
+    class Meta:
+        indexes = [
+            # Current sections of a file in order of creation.
+            models.Index(
+                fields=['related_file', 'id'],
+                condition=Q(validity_flag=True),
+                name='prover_section_valid_idx'
+            ),
+            # Current goals of a function.
+            models.Index(
+                fields=['related_file', 'function'],
+                condition=Q(validity_flag=True),
+                name='prover_section_function_idx'
+            ),
+            # Goals with a status (e.g. `Timeout`) proved in a period.
+            models.Index(fields=['status', 'creation_date'], name='prover_section_status_idx'),
+            models.Index(fields=['property_kind', 'status'], name='prover_section_kind_idx'),
+            # Sections of a proof in order of creation.
+            models.Index(fields=['run', 'id'], name='prover_section_run_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'Section {self.name}. Status: {self.status.name}'
 
 
-class FileProvingResult(Entity):
+class FileProvingResult(AbstractEntity):
     related_file = models.ForeignKey(
         File,
         on_delete=models.CASCADE,
         help_text='File, to which result relates.',
         related_name='results'
     )
-    data = models.TextField()
+    data = CompressedTextField()
+    # Proof, which log the result is.
+    run = models.OneToOneField(
+        'ProofRun',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='result'
+    )
+    # Numbers of goals and of valid goals of the proof.
+    goals = models.PositiveIntegerField(default=0)
+    proved_goals = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['related_file', 'id'],
+                condition=Q(validity_flag=True),
+                name='prover_result_valid_idx'
+            ),
+        ]
 
     def __str__(self) -> str:
         return f'Result of {self.related_file.uploaded_file.name}'
+
+
+class ProofJob(models.Model):
+    """Proof job - is a request to prove a file. Jobs are queued
+    in the database and picked up by `run_prover_workers`, so
+    proving does not block web workers."""
+
+    class State(models.TextChoices):
+        QUEUED = 'queued'
+        RUNNING = 'running'
+        DONE = 'done'
+        FAILED = 'failed'
+        # The prover exceeded its time limits.
+        TIMEOUT = 'timeout'
+
+    file = models.ForeignKey(
+        File,
+        on_delete=models.CASCADE,
+        help_text='File, which is proved by the job.',
+        related_name='proof_jobs'
+    )
+    state = models.CharField(
+        max_length=16,
+        choices=State.choices,
+        default=State.QUEUED
+    )
+    # Name of the prover backend, `PROVER_BACKEND` if empty.
+    backend = models.CharField(max_length=32, blank=True, default='')
+    # Comma separated solvers racing on goals, `PROVER_SOLVERS` if empty.
+    solvers = models.CharField(max_length=256, blank=True, default='')
+    # Error message if the job has failed.
+    error = models.TextField(blank=True, default='')
+    creation_date = models.DateTimeField(auto_now_add=True)
+    start_date = models.DateTimeField(null=True, blank=True)
+    finish_date = models.DateTimeField(null=True, blank=True)
+    # When the worker proving the job last reported it, see `claim_next_job`.
+    heartbeat_date = models.DateTimeField(null=True, blank=True)
+    # Number of times the job was claimed by a worker.
+    attempts = models.PositiveIntegerField(default=0)
+
+    # States of jobs, which are not finished yet.
+    ACTIVE_STATES = (State.QUEUED, State.RUNNING)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['state', 'id'], name='prover_job_state_idx'),
+        ]
+        constraints = [
+            # Requests to prove a file, which is being proved, share the job.
+            models.UniqueConstraint(
+                fields=['file', 'backend', 'solvers'],
+                condition=Q(state__in=['queued', 'running']),
+                name='prover_job_active_unique'
+            ),
+        ]
+
+    def is_finished(self) -> bool:
+        return self.state in (self.State.DONE, self.State.FAILED, self.State.TIMEOUT)
+
+    def __str__(self) -> str:
+        return f'Proof job {self.pk} of {self.file}: {self.state}'
+
+
+class ProofRun(models.Model):
+    """Proof run - is one proof of a file, which groups its sections
+    and its result. The last finished run of a file is its `current_run`,
+    runs of failed proofs are never finished."""
+
+    file = models.ForeignKey(
+        File,
+        on_delete=models.CASCADE,
+        help_text='File, which was proved.',
+        related_name='runs'
+    )
+    job = models.ForeignKey(
+        ProofJob,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='runs'
+    )
+    start_date = models.DateTimeField(default=timezone.now, db_index=True)
+    finish_date = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # History of a file, the newest runs first.
+            models.Index(fields=['file', '-start_date'], name='prover_run_history_idx'),
+        ]
+
+    def is_finished(self) -> bool:
+        return self.finish_date is not None
+
+    def __str__(self) -> str:
+        return f'Proof run {self.pk} of {self.file}'
+
+
+class ProofCacheEntry(models.Model):
+    """Proof cache entry - stores the outcome of proving a file content
+    with given prover command and version, so unchanged files
+    are not proved again."""
+
+    # SHA-256 of file content, prover command line and prover version.
+    key = models.CharField(max_length=64, unique=True)
+    prover_version = models.CharField(max_length=256, db_index=True)
+    result_data = CompressedTextField()
+    # JSON list of parsed sections: {'category': ..., 'status': ..., 'body': ...}.
+    sections = CompressedTextField()
+    hits = models.PositiveIntegerField(default=0)
+    last_used = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f'Proof cache entry {self.key}'
+
+
+class ProofCacheCounter(models.Model):
+    """Proof cache counter - counts cache lookups of one kind
+    (hits or misses) across all workers."""
+
+    name = models.CharField(max_length=32, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f'{self.name}: {self.value}'
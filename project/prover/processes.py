@@ -1,72 +1,680 @@
+import abc
+import contextlib
+import functools
 import os
+import queue
+import re
+import signal
 import subprocess
-from typing import List
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from django.conf import settings
 
+from .units import ProofUnit, split_into_units
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where limits are not set.
+    resource = None
+
 
 class FramaSection:
-    def __init__(self, category: str, status: str, body: str) -> None:
+    def __init__(
+        self,
+        category: str,
+        status: str,
+        body: str,
+        unit: Optional[str] = None,
+        solver: Optional[str] = None,
+        time: Optional[float] = None,
+        steps: Optional[int] = None,
+        goal: Optional[str] = None,
+        function: Optional[str] = None,
+        kind: Optional[str] = None
+    ) -> None:
         self.category = category
         self.status = status
         self.body = body
+        # Name of the proof unit, which reported the section, if known.
+        self.unit = unit
+        # Solver, which gave the status, seconds and steps it took, if reported.
+        self.solver = solver
+        self.time = time
+        self.steps = steps
+        # Name of the property, function it belongs to and kind of the property
+        # (e.g. `Post-condition`), if reported.
+        self.goal = goal
+        self.function = function
+        self.kind = kind
 
     def __str__(self) -> str:
         return f'Category: {self.category}\nStatus: {self.status}\n{self.body}'
 
 
-def _frama_c_print_command(filepath: str, result_filepath: str):
-    return ['frama-c', '-wp', '-wp-print', '-wp-log', f'r:{result_filepath}', filepath]
+def _frama_c_print_command(filepath: str, result_filepath: str, options: Sequence[str] = ()):
+    return ['frama-c', '-wp', '-wp-print', '-wp-log', f'r:{result_filepath}', *options, filepath]
 
 
-def _parse_frama_c_print(body: str) -> List[FramaSection]:
-    sections = body.split(
-        '------------------------------------------------------------\n')
-    objs = []
-    # Don't look at first and last "sections" - those are not
-    # sections related to proving.
-    for section in sections[1:-1]:
-        section = section.strip()
-        lines = section.split('\n')
-        if len(lines) < 2:
-            # Section with category and status has at least 2 lines.
-            continue
+SECTION_SEPARATOR = '------------------------------------------------------------\n'
+# Statuses, which do not change if the goal is given to another solver.
+DEFINITIVE_STATUSES = {'Valid', 'Invalid'}
 
-        body = section
+# E.g. `Prover Alt-Ergo 2.4.1 returns Valid (Qed:2ms) (10ms) (14)`.
+_SOLVER_RESULT = re.compile(r'^Prover (.+?) returns \S+(.*)$')
+_SOLVER_TIME = re.compile(r'\((\d+(?:\.\d+)?)(ms|s)\)')
+_SOLVER_STEPS = re.compile(r'\((\d+)\)')
+# E.g. `Goal Post-condition 'positive' (file a.c, line 3) in 'f':` or `Lemma l:`.
+_GOAL_FUNCTION = re.compile(r" in '([^']*)'$")
+_GOAL_LOCATION = re.compile(r'\s*\(file [^)]*\)')
+_GOAL_NAME = re.compile(r"'([^']*)'")
 
-        # Category is either before first '(' or is a whole line without ':'.
-        category = lines[0].split('(')[0].strip()
-        category = category[:-1] if category[-1] == ':' else category
 
-        # Last line contains status, that is present after word 'returns'.
-        # If cannot be found, status is set to 'Unknown'.
-        last_line = lines[-1].split(' ')
-        try:
-            status = last_line[last_line.index('returns') + 1]
-        except ValueError:
-            status = 'Unknown'
+def parse_goal_header(header: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Returns kind, name and function of a property from the first line
+    of its section. Parts, which are not reported, are None."""
+
+    header = header.strip().rstrip(':')
+    function = None
+    if match := _GOAL_FUNCTION.search(header):
+        function = match.group(1)
+        header = header[:match.start()]
+    header = _GOAL_LOCATION.sub('', header).strip()
 
-        objs.append(FramaSection(category, status, body))
+    if header.startswith('Lemma '):
+        return 'Lemma', header[len('Lemma '):].strip() or None, function
+    if not header.startswith('Goal '):
+        return None, None, function
+    header = header[len('Goal '):]
+    name = _GOAL_NAME.search(header)
+    kind = header.split("'", 1)[0].strip()
+    return kind or None, name.group(1) if name else None, function
 
-    return objs
 
+def _parse_frama_c_section(section: str) -> Optional[FramaSection]:
+    section = section.strip()
+    lines = section.split('\n')
+    if len(lines) < 2:
+        # Section with category and status has at least 2 lines.
+        return None
 
-def get_frama_c_print(filepath: str):
-    result_directory = os.path.join(settings.BASE_DIR, 'files', 'temp')
+    body = section
+
+    # Category is either before first '(' or is a whole line without ':'.
+    category = lines[0].split('(')[0].strip()
+    category = category[:-1] if category[-1] == ':' else category
+
+    # Last line contains status, that is present after word 'returns'.
+    # If cannot be found, status is set to 'Unknown'.
+    last_line = lines[-1].split(' ')
     try:
-        os.mkdir(result_directory)
-    except FileExistsError:
-        # Directory already exists.
-        pass
+        status = last_line[last_line.index('returns') + 1]
+    except ValueError:
+        status = 'Unknown'
+
+    solver, time, steps = None, None, None
+    if match := _SOLVER_RESULT.match(lines[-1].strip()):
+        solver = match.group(1)
+        # Time of the solver follows time of simplifications (`Qed:2ms`).
+        if time_match := _SOLVER_TIME.search(match.group(2)):
+            time = float(time_match.group(1)) / (1000 if time_match.group(2) == 'ms' else 1)
+        if steps_match := _SOLVER_STEPS.search(match.group(2)):
+            steps = int(steps_match.group(1))
+    kind, goal, function = parse_goal_header(lines[0])
+
+    return FramaSection(
+        category,
+        status,
+        body,
+        solver=solver,
+        time=time,
+        steps=steps,
+        goal=goal,
+        function=function,
+        kind=kind
+    )
+
+
+def iter_frama_c_print(lines: Iterable[str]) -> Iterator[FramaSection]:
+    """Parses output of Frama-C line by line and yields each section as
+    soon as its closing separator is read. Only one section is kept
+    in memory at a time."""
+
+    # Don't look at lines before the first and after the last separator,
+    # those are not sections related to proving.
+    section_lines = None
+    for line in lines:
+        if line == SECTION_SEPARATOR:
+            if section_lines is not None:
+                section = _parse_frama_c_section(''.join(section_lines))
+                if section is not None:
+                    yield section
+            section_lines = []
+        elif section_lines is not None:
+            section_lines.append(line)
+
+
+@functools.lru_cache(maxsize=None)
+def get_frama_c_version() -> str:
+    """Returns version of installed Frama-C. It is read once per process,
+    workers have to be restarted after Frama-C is upgraded."""
 
-    result_filepath = os.path.join(result_directory, 'result.txt')
     result = subprocess.run(
-        _frama_c_print_command(filepath, result_filepath),
+        ['frama-c', '-version'],
         capture_output=True,
-        text=True
+        text=True,
+        timeout=settings.PROVER_WALL_TIMEOUT or None
     )
-    sections = _parse_frama_c_print(result.stdout)
-    with open(result_filepath, 'r') as f:
-        result_data = f.read()
+    return result.stdout.strip()
+
+
+class ProverTimeout(Exception):
+    """Raised when a prover run exceeds its wall-clock or CPU time limit."""
+
+
+def _limit_resources(pid: int, cpu_seconds: int, memory_megabytes: int):
+    """Limits a started prover process. Limits are set from outside of the
+    process, `preexec_fn` is not safe in threads. They apply to processes,
+    which the prover starts afterwards, solvers inherit them."""
+
+    if resource is None or not hasattr(resource, 'prlimit'):
+        # Only available on Linux.
+        return
+    try:
+        if cpu_seconds:
+            # SIGXCPU at the soft limit, SIGKILL a second later if it is ignored.
+            resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+        if memory_megabytes:
+            memory = memory_megabytes * 1024 * 1024
+            resource.prlimit(pid, resource.RLIMIT_AS, (memory, memory))
+    except ProcessLookupError:
+        # The prover has already exited.
+        pass
+
+
+def _prover_process_options() -> dict:
+    """Returns options of `subprocess.Popen`, which start a prover in its own
+    process group, see `_limit_resources` for its limits."""
+
+    if os.name != 'posix':
+        return {}
+    # Solvers started by the prover are in the group, so they are killed with it.
+    return {'start_new_session': True}
+
+
+# Runs of provers started by this process, which were not killed yet.
+_running = set()
+_running_lock = threading.Lock()
+
+
+def cancel_running_provers():
+    """Stops all provers started by this process with their solvers,
+    e.g. when the process is terminated. Provers are in their own process
+    groups, they would outlive it otherwise."""
+
+    with _running_lock:
+        runs = list(_running)
+    for run in runs:
+        run.cancel()
+
+
+class ProverRun:
+    """Prover process started by `ProverBackend.run`. If it runs longer
+    than `timeout` seconds, it is killed with all processes it started."""
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        result_filepath: str,
+        parse: Callable[[Iterable[str]], Iterator[FramaSection]] = iter_frama_c_print,
+        timeout: float = 0
+    ) -> None:
+        self.process = process
+        self.result_filepath = result_filepath
+        self.parse = parse
+        self.timeout = timeout
+        self.cancelled = False
+        self.timed_out = False
+        self._watchdog = None
+        with _running_lock:
+            _running.add(self)
+        if timeout:
+            self._watchdog = threading.Timer(timeout, self._time_out)
+            self._watchdog.daemon = True
+            self._watchdog.start()
+
+    def sections(self) -> Iterator[FramaSection]:
+        """Yields sections while the prover is still running."""
+
+        return self.parse(self.process.stdout)
+
+    def kill(self):
+        """Kills the prover and all processes it started."""
+
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+        with _running_lock:
+            _running.discard(self)
+        if os.name == 'posix':
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                # The prover and its solvers have already exited.
+                pass
+        elif self.process.poll() is None:
+            self.process.kill()
+
+    def _time_out(self):
+        self.timed_out = True
+        self.kill()
+
+    def cancel(self):
+        """Stops the prover, its remaining sections and log are lost."""
+
+        self.cancelled = True
+        self.kill()
+
+    def result_data(self) -> str:
+        """Waits for the prover to exit and returns its log. Sections have
+        to be consumed first, otherwise the prover may block on its output.
+        Raises ProverTimeout if the prover exceeded its time limits."""
+
+        self.process.wait()
+        if self.timed_out:
+            raise ProverTimeout(f'Proof timed out after {self.timeout:g} seconds.')
+        if hasattr(signal, 'SIGXCPU') and self.process.returncode == -signal.SIGXCPU:
+            raise ProverTimeout('Proof exceeded its CPU time limit.')
+        with open(self.result_filepath, 'r') as f:
+            return f.read()
+
+
+class ProverBackend(abc.ABC):
+    """Prover, which proves files. A backend builds the command of the
+    prover, runs it and parses its output into sections.
+
+    Subclasses implement `command`, `parse` and `version`, and override
+    `run` if the prover is not a separate process."""
+
+    name = ''
+
+    @abc.abstractmethod
+    def command(self, filepath: str, result_filepath: str, options: Sequence[str] = ()) -> List[str]:
+        """Returns command proving `filepath`, which writes its log
+        to `result_filepath`. `options` select proved functions."""
+
+    @abc.abstractmethod
+    def parse(self, lines: Iterable[str]) -> Iterator[FramaSection]:
+        """Yields sections parsed from output of the prover."""
+
+    @abc.abstractmethod
+    def version(self) -> str:
+        """Returns version of the prover, which is a part of cache keys
+        and fingerprints of proofs."""
+
+    def signature(self) -> List[str]:
+        """Returns command of the prover, which is a part of cache keys
+        and fingerprints of proofs. Paths differ between runs, so they
+        are left out."""
+
+        return self.command('<source>', '<result>')
+
+    @contextlib.contextmanager
+    def run(self, filepath: str, options: Sequence[str] = ()) -> Iterator[ProverRun]:
+        """Starts the prover on given file, its output is parsed while it runs.
+        The prover is limited by `PROVER_WALL_TIMEOUT`, `PROVER_CPU_LIMIT`
+        and `PROVER_MEMORY_LIMIT`, and killed with its solvers at the end.
+
+        Every run gets its own temporary workspace, which is removed afterwards,
+        so many proofs can run at the same time in threads and processes."""
+
+        temp_directory = os.path.join(settings.BASE_DIR, 'files', 'temp')
+        os.makedirs(temp_directory, exist_ok=True)
+
+        with tempfile.TemporaryDirectory(dir=temp_directory) as workspace:
+            result_filepath = os.path.join(workspace, 'result.txt')
+            process = subprocess.Popen(
+                self.command(os.path.abspath(filepath), result_filepath, options),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                # Provers may leave session files in their working directory.
+                cwd=workspace,
+                **_prover_process_options()
+            )
+            with process:
+                _limit_resources(process.pid, settings.PROVER_CPU_LIMIT, settings.PROVER_MEMORY_LIMIT)
+                run = ProverRun(process, result_filepath, self.parse, settings.PROVER_WALL_TIMEOUT)
+                try:
+                    yield run
+                finally:
+                    run.kill()
+
+    def prove(self, filepath: str, options: Sequence[str] = ()):
+        """Proves given file and returns its log and parsed sections."""
+
+        with self.run(filepath, options) as run:
+            sections = list(run.sections())
+            result_data = run.result_data()
+
+        return result_data, sections
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class PortfolioRun:
+    """Runs of several provers on the same goals, which race each other.
+    A goal is yielded as soon as a run gives it definitive status, or
+    with the first status reported, when every run has reported it or
+    ended. When all goals of an ended run are yielded, the goals are
+    settled and the remaining runs are cancelled."""
+
+    def __init__(self, runs: List) -> None:
+        self.runs = runs
+        # Logs of ended runs and runs, whose sections were yielded.
+        self._logs = {}
+        self._contributors = set()
+
+    @staticmethod
+    def _read(index: int, run, events: queue.Queue):
+        """Puts sections of the run into `events`, followed by its outcome:
+        log, ProverTimeout or None if the run was cancelled."""
+
+        try:
+            for section in run.sections():
+                events.put((index, section, None))
+            outcome = run.result_data()
+        except ProverTimeout as e:
+            # Other runs may still answer in time.
+            outcome = e
+        except Exception as e:
+            outcome = None if run.cancelled else e
+        events.put((index, None, outcome))
+
+    def sections(self) -> Iterator[FramaSection]:
+        events = queue.Queue()
+        ended = set()
+        timeout = None
+        # Goals are identified by their first line, e.g. `Goal Assertion (file a.c, line 3):`.
+        pending = {}
+        reported = {}
+        settled = set()
+        everyone = set(range(len(self.runs)))
+        with ThreadPoolExecutor(max_workers=len(self.runs)) as executor:
+            try:
+                for index, run in enumerate(self.runs):
+                    executor.submit(self._read, index, run, events)
+                while len(ended) < len(self.runs):
+                    index, section, outcome = events.get()
+                    if section is not None:
+                        goal = section.body.split('\n', 1)[0]
+                        reported.setdefault(goal, set()).add(index)
+                        if goal in settled:
+                            continue
+                        if section.status in DEFINITIVE_STATUSES:
+                            pending.pop(goal, None)
+                            settled.add(goal)
+                            self._contributors.add(index)
+                            yield section
+                        else:
+                            pending.setdefault(goal, (index, section))
+                    else:
+                        ended.add(index)
+                        if isinstance(outcome, ProverTimeout):
+                            timeout = outcome
+                        elif isinstance(outcome, Exception):
+                            raise outcome
+                        elif outcome is not None:
+                            self._logs[index] = outcome
+                            if all(goal in settled for goal, runs in reported.items() if index in runs):
+                                # The run reported every goal, other runs will not add any.
+                                for index, section in pending.values():
+                                    self._contributors.add(index)
+                                    yield section
+                                return
+                    # A reported goal or, when a run ended, any goal may be settled.
+                    goals = [goal] if section is not None else list(pending)
+                    for goal in [goal for goal in goals if goal in pending and ended | reported[goal] >= everyone]:
+                        settled.add(goal)
+                        index, section = pending.pop(goal)
+                        self._contributors.add(index)
+                        yield section
+            finally:
+                self.cancel()
+        if not self._logs and timeout is not None:
+            raise timeout
+
+    def cancel(self):
+        for run in self.runs:
+            run.cancel()
+
+    def result_data(self) -> str:
+        """Returns joined logs of ended runs, which gave status to some goal,
+        or of all ended runs, if runs, which gave statuses, were cancelled.
+        Sections have to be consumed first."""
+
+        logs = [log for index, log in self._logs.items() if index in self._contributors]
+        return ''.join(logs or self._logs.values())
+
+
+@contextlib.contextmanager
+def race_runs(backends: List[ProverBackend], filepath: str, options: Sequence[str] = ()):
+    """Starts all `backends` on given file at once. Yields a run with
+    `sections` and `result_data`, see `PortfolioRun`."""
+
+    with contextlib.ExitStack() as stack:
+        runs = [stack.enter_context(backend.run(filepath, options)) for backend in backends]
+        yield PortfolioRun(runs)
+
+
+class FramaCBackend(ProverBackend):
+    """Frama-C WP, sections are read from output of `-wp-print`.
+    Goals are proved by `solvers` (by default `PROVER_SOLVERS`) passed
+    to `-wp-prover`, each for at most `PROVER_GOAL_TIMEOUT` seconds.
+    If there are several solvers, each of them is run by a separate
+    Frama-C process and the processes race, see `PortfolioRun`."""
+
+    name = 'frama-c'
+
+    def __init__(self, solvers: Optional[Sequence[str]] = None) -> None:
+        self.solvers = list(settings.PROVER_SOLVERS if solvers is None else solvers)
+
+    def command(self, filepath: str, result_filepath: str, options: Sequence[str] = ()) -> List[str]:
+        if self.solvers:
+            options = ['-wp-prover', ','.join(self.solvers), *options]
+        if settings.PROVER_GOAL_TIMEOUT:
+            options = ['-wp-timeout', str(settings.PROVER_GOAL_TIMEOUT), *options]
+        return _frama_c_print_command(filepath, result_filepath, options)
+
+    def run(self, filepath: str, options: Sequence[str] = ()):
+        if len(self.solvers) > 1:
+            backends = [FramaCBackend([solver]) for solver in self.solvers]
+            return race_runs(backends, filepath, options)
+        return super().run(filepath, options)
+
+    def parse(self, lines: Iterable[str]) -> Iterator[FramaSection]:
+        return iter_frama_c_print(lines)
+
+    def version(self) -> str:
+        return get_frama_c_version()
+
+
+def get_frama_c_print(filepath: str, options: Sequence[str] = ()):
+    """Runs Frama-C WP on given file and returns its log and parsed sections."""
+
+    return FramaCBackend().prove(filepath, options)
+
+
+class ParallelFramaCRun:
+    """Proof of a file split into units, which are proved by separate
+    runs of the `backend` (Frama-C by default) at the same time. Sections
+    are yielded in order of units, each unit as soon as it and the preceding
+    ones are proved, so the order does not depend on timing. Units with sections
+    in `carried_sections` are not proved again, their sections are used.
+
+    `PROVER_WALL_TIMEOUT` limits the whole proof, runs of units still
+    in progress are killed when it passes."""
+
+    def __init__(
+        self,
+        filepath: str,
+        units: List[ProofUnit],
+        executor: ThreadPoolExecutor,
+        carried_sections: Optional[Dict[str, List[FramaSection]]] = None,
+        backend: Optional[ProverBackend] = None
+    ) -> None:
+        self.filepath = filepath
+        self.units = units
+        self.executor = executor
+        self.carried_sections = carried_sections or {}
+        self.backend = backend or FramaCBackend()
+        self.timed_out = False
+        self._logs = []
+        self._futures = []
+        self._runs = set()
+        self._lock = threading.Lock()
+        self._watchdog = None
+
+    def _prove_unit(self, unit: ProofUnit):
+        if unit.name in self.carried_sections:
+            return '', self.carried_sections[unit.name]
+        with self.backend.run(self.filepath, unit.options) as run:
+            with self._lock:
+                self._runs.add(run)
+            if self.timed_out:
+                run.cancel()
+            try:
+                sections = list(run.sections())
+                result_data = run.result_data()
+            finally:
+                with self._lock:
+                    self._runs.discard(run)
+        return result_data, sections
+
+    def _time_out(self):
+        self.timed_out = True
+        self.cancel()
+
+    def sections(self) -> Iterator[FramaSection]:
+        # Some properties (e.g. lemmas) may be reported by several units.
+        seen_bodies = set()
+        if settings.PROVER_WALL_TIMEOUT:
+            self._watchdog = threading.Timer(settings.PROVER_WALL_TIMEOUT, self._time_out)
+            self._watchdog.daemon = True
+            self._watchdog.start()
+        self._futures = [self.executor.submit(self._prove_unit, unit) for unit in self.units]
+        for unit, future in zip(self.units, self._futures):
+            try:
+                result_data, sections = future.result()
+            except Exception:
+                if not self.timed_out:
+                    raise
+            if self.timed_out:
+                raise ProverTimeout(f'Proof timed out after {settings.PROVER_WALL_TIMEOUT:g} seconds.')
+            self._logs.append(result_data)
+            for section in sections:
+                if section.body not in seen_bodies:
+                    seen_bodies.add(section.body)
+                    section.unit = unit.name
+                    yield section
+
+    def result_data(self) -> str:
+        """Returns joined logs of units. Sections have to be consumed first."""
+
+        return ''.join(self._logs)
+
+    def cancel(self):
+        """Cancels proofs of units, which have not started yet, and stops
+        runs in progress."""
+
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+        for future in self._futures:
+            future.cancel()
+        with self._lock:
+            runs = list(self._runs)
+        for run in runs:
+            run.cancel()
+
+
+class WholeFileRun:
+    """Run proving a whole file, which sections are assigned to proof
+    `units` by their functions, as if the units were proved separately."""
+
+    def __init__(self, run, units: List[ProofUnit]) -> None:
+        self.run = run
+        self.units = units
+
+    def sections(self) -> Iterator[FramaSection]:
+        names = {unit.name for unit in self.units}
+        for section in self.run.sections():
+            # Properties outside functions belong to the global unit.
+            section.unit = section.function if section.function in names else ''
+            yield section
+
+    def result_data(self) -> str:
+        return self.run.result_data()
+
+
+@contextlib.contextmanager
+def open_frama_c_run(
+    filepath: str,
+    processes: Optional[int] = None,
+    units: Optional[List[ProofUnit]] = None,
+    carried_sections: Optional[Dict[str, List[FramaSection]]] = None,
+    backend: Optional[ProverBackend] = None
+):
+    """Starts proving given file with the `backend` (Frama-C by default).
+    If `processes` (by default `PROVER_PARALLEL_PROCESSES`) is greater
+    than 1 and the file has several functions, they are proved
+    in parallel, otherwise by one run of the prover. Yields a run with
+    `sections` and `result_data`.
+
+    If `units` are given, the file is proved unit by unit and units
+    in `carried_sections` are skipped, see `ParallelFramaCRun`. If there
+    is nothing to skip and units would be proved one after another, the
+    file is proved by one run instead, see `WholeFileRun`."""
+
+    processes = processes or settings.PROVER_PARALLEL_PROCESSES
+    backend = backend or FramaCBackend()
+    if not units:
+        units = []
+        if processes > 1:
+            with open(filepath, 'r', errors='replace') as f:
+                units = split_into_units(f.read())
+        if len(units) <= 2:
+            # At most one function, nothing to split.
+            units = []
+
+    if not units:
+        with backend.run(filepath) as run:
+            yield run
+        return
+
+    if processes <= 1 and not carried_sections:
+        with backend.run(filepath) as run:
+            yield WholeFileRun(run, units)
+        return
+
+    # Threads only wait for prover processes, which do the work.
+    with ThreadPoolExecutor(max_workers=processes) as executor:
+        run = ParallelFramaCRun(filepath, units, executor, carried_sections, backend)
+        try:
+            yield run
+        finally:
+            # Runs in progress are stopped, leaving the block waits for them.
+            run.cancel()
+
+
+def get_frama_c_print_parallel(filepath: str, processes: Optional[int] = None):
+    """Same as `get_frama_c_print`, but proves functions of the file
+    in parallel, see `open_frama_c_run`."""
+
+    with open_frama_c_run(filepath, processes) as run:
+        sections = list(run.sections())
+        result_data = run.result_data()
 
     return result_data, sections
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from typing import Dict
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Directory, File, FileSection, ProofJob, ProofRun, ProvedUnit
+
+
+def _delete_in_batches(queryset: models.QuerySet, batch_size: int) -> int:
+    """Deletes rows of the queryset (and rows depending on them) in
+    separate transactions of at most `batch_size` rows, so the database
+    is not locked for long. Returns number of deleted rows."""
+
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            _, counts = model.objects.filter(pk__in=ids).delete()
+        deleted += counts.get(model._meta.label, 0)
+
+
+def _old_runs(runs: models.QuerySet) -> models.QuerySet:
+    """Returns runs, which are neither current runs of their files nor
+    in progress. Runs of failed proofs are never finished, they are
+    taken as ended when their job ended or, if the proof had no job,
+    when `PROVER_WALL_TIMEOUT` seconds passed since its start."""
+
+    ended = Q(finish_date__isnull=False) | (
+        Q(job__isnull=False) & ~Q(job__state__in=ProofJob.ACTIVE_STATES)
+    )
+    if settings.PROVER_WALL_TIMEOUT:
+        ended |= Q(
+            job__isnull=True,
+            start_date__lt=timezone.now() - timedelta(seconds=settings.PROVER_WALL_TIMEOUT)
+        )
+    return runs.filter(ended).exclude(Exists(File.objects.filter(current_run=OuterRef('pk'))))
+
+
+def _delete_runs(runs: models.QuerySet, batch_size: int) -> Dict[str, int]:
+    """Deletes runs with their sections, units and results in batches."""
+
+    counts = {'runs': 0, 'sections': 0, 'units': 0}
+    while True:
+        ids = list(runs.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return counts
+        # Sections first, a run may have many of them.
+        counts['sections'] += _delete_in_batches(FileSection.objects.filter(run_id__in=ids), batch_size)
+        counts['units'] += _delete_in_batches(ProvedUnit.objects.filter(run_id__in=ids), batch_size)
+        with transaction.atomic():
+            _, deleted = ProofRun.objects.filter(pk__in=ids).delete()
+        counts['runs'] += deleted.get(ProofRun._meta.label, 0)
+
+
+def compact_proofs(keep_runs: int, keep_days: float, batch_size: int) -> Dict[str, int]:
+    """Removes old proof runs of files: all but the last `keep_runs` runs
+    of each file and runs older than `keep_days` days (0 disables
+    a rule), with their sections, results and proved units. The current
+    run of a file and runs in progress are always kept. Returns numbers
+    of deleted runs, sections and units."""
+
+    counts = {'runs': 0, 'sections': 0, 'units': 0}
+
+    def delete(runs: models.QuerySet, units: models.QuerySet):
+        for name, value in _delete_runs(_old_runs(runs), batch_size).items():
+            counts[name] += value
+        # Units proved before units were grouped into runs. They are made
+        # valid when their proof is finished.
+        counts['units'] += _delete_in_batches(units.filter(run__isnull=True, validity_flag=False), batch_size)
+
+    if keep_runs:
+        file_ids = list(
+            ProofRun.objects.values('file').annotate(
+                runs=Count('id')
+            ).filter(runs__gt=keep_runs).values_list('file', flat=True)
+        )
+        for file_id in file_ids:
+            # The oldest kept run.
+            oldest = ProofRun.objects.filter(file_id=file_id).order_by(
+                '-start_date', '-id'
+            ).values('id', 'start_date')[keep_runs - 1]
+            delete(
+                ProofRun.objects.filter(file_id=file_id, start_date__lt=oldest['start_date']),
+                ProvedUnit.objects.filter(file_id=file_id, creation_date__lt=oldest['start_date'])
+            )
+
+    if keep_days:
+        before = timezone.now() - timedelta(days=keep_days)
+        delete(
+            ProofRun.objects.filter(start_date__lt=before),
+            ProvedUnit.objects.filter(creation_date__lt=before)
+        )
+
+    return counts
+
+
+def purge_deleted_entries(grace_days: float, batch_size: int) -> Dict[str, int]:
+    """Removes files and directories deleted by users more than
+    `grace_days` days ago from the database, with their proofs, and
+    uploaded files from the storage. Directories, which still contain
+    other entries, are kept. Returns numbers of removed files and
+    directories."""
+
+    before = timezone.now() - timedelta(days=grace_days)
+    purgeable = Q(availability_flag=False, deletion_date__lt=before)
+    storage = File._meta.get_field('uploaded_file').storage
+    counts = {'files': 0, 'directories': 0}
+
+    while True:
+        files = dict(
+            File.objects.filter(purgeable).order_by('pk').values_list('pk', 'uploaded_file')[:batch_size]
+        )
+        if not files:
+            break
+        # Sections first, a file may have many of them.
+        _delete_in_batches(FileSection.objects.filter(related_file_id__in=files), batch_size)
+        with transaction.atomic():
+            _, deleted = File.objects.filter(pk__in=files).delete()
+            names = set(files.values()) - set(
+                File.objects.filter(uploaded_file__in=files.values()).values_list('uploaded_file', flat=True)
+            )
+            # Uploaded files are removed only if the rows are.
+            transaction.on_commit(lambda names=names: [storage.delete(name) for name in names if name])
+        counts['files'] += deleted.get(File._meta.label, 0)
+
+    # Directories are removed from the bottom, deleting a batch may empty
+    # directories above it.
+    empty_directories = Directory.objects.filter(purgeable).exclude(
+        Exists(Directory.objects.filter(parent_dir=OuterRef('pk')))
+    ).exclude(
+        Exists(File.objects.filter(parent_dir=OuterRef('pk')))
+    )
+    counts['directories'] = _delete_in_batches(empty_directories, batch_size)
+
+    return counts
@@ -1,6 +1,28 @@
-from django.test import TestCase
+import io
+import os
+import signal
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+
+from django.test import TestCase, SimpleTestCase, TransactionTestCase, override_settings
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from .models import (
     Entity,
@@ -10,12 +32,48 @@ from .models import (
     SectionStatus,
     SectionStatusData,
     FileSection,
-    FileProvingResult
+    FileProvingResult,
+    ProofCacheEntry,
+    ProofJob,
+    ProofRun,
+    ProvedUnit
 )
+from .management.commands.run_prover_workers import stop_worker
+from .views import proof_job_events
+from .backends import StubBackend, get_backend
 from .forms import (
     CreateDirectoryForm,
     CreateFileForm
 )
+from .cache import (
+    clear_proof_cache,
+    get_proof_cache_statistics
+)
+from .incremental import relocate_section_body
+from .jobs import (
+    ProvingResultWriter,
+    claim_next_job,
+    enqueue_proof,
+    get_fair_queue,
+    prove_file,
+    run_proof_job,
+    save_proving_result
+)
+from .processes import (
+    FramaCBackend,
+    FramaSection,
+    PortfolioRun,
+    ProverBackend,
+    ProverTimeout,
+    _limit_resources,
+    parse_goal_header,
+    get_frama_c_print,
+    get_frama_c_print_parallel,
+    iter_frama_c_print,
+    open_frama_c_run
+)
+from .retention import compact_proofs, purge_deleted_entries
+from .units import find_functions, split_into_units
 
 User = get_user_model()
 
@@ -31,12 +89,170 @@ def login_user(test_case, user):
     test_case.client.login(username=user.username, password='test_password')
 
 
+STUB_FRAMA_C = """#!/usr/bin/env python3
+# Stub of `frama-c -wp -wp-print -wp-log r:<log> <file>` used in tests.
+import os
+import random
+import subprocess
+import sys
+import time
+
+args = sys.argv[1:]
+if args == ['-version']:
+    print('stub')
+    sys.exit(0)
+log_path = args[args.index('-wp-log') + 1][len('r:'):]
+name = os.path.basename(args[-1])
+separator = '-' * 60
+
+time.sleep(random.uniform(0, 0.05))
+print(separator)
+if '-wp-fct' in args:
+    function = args[args.index('-wp-fct') + 1]
+    print(f"Goal Assertion (file {name}, line 1) in '{function}':")
+elif '-wp-skip-fct' in args:
+    print('Lemma l:')
+else:
+    print(f'Goal Assertion (file {name}, line 1):')
+print(f'Prove: {name}')
+# Solvers named `slow` and `unsure` are slow and fail to prove goals.
+solver, status = 'Alt-Ergo', 'Valid'
+if '-wp-prover' in args:
+    solver = args[args.index('-wp-prover') + 1]
+    if solver == 'slow':
+        if 'STUB_SOLVER_PID_FILE' in os.environ:
+            # The solver process outlives Frama-C unless it is killed.
+            child = subprocess.Popen(['sleep', '30'])
+            with open(os.environ['STUB_SOLVER_PID_FILE'], 'w') as f:
+                f.write(str(child.pid))
+        time.sleep(10)
+    if solver == 'unsure':
+        status = 'Unknown'
+print(f'Prover {solver} returns {status} (Qed:1ms) (12ms)')
+print(separator)
+with open(log_path, 'w') as log:
+    log.write(f'log of {name}')
+"""
+
+
+def process_is_running(pid: int) -> bool:
+    """Returns whether process exists and is not a zombie."""
+
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().split(')')[-1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+class ScriptedRun:
+    """Prover run, which reports given sections. It waits at every
+    `threading.Event` in `script` until the event is set or the run is
+    cancelled."""
+
+    def __init__(self, script: list, result_data: str) -> None:
+        self.script = script
+        self.log = result_data
+        self.cancelled = False
+
+    def sections(self):
+        for item in self.script:
+            if isinstance(item, threading.Event):
+                item.wait(5)
+                if self.cancelled:
+                    return
+            else:
+                yield item
+
+    def cancel(self):
+        self.cancelled = True
+        for item in self.script:
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def result_data(self) -> str:
+        return self.log
+
+
+def install_stub_frama_c(directory: str) -> dict:
+    """Create stub `frama-c` executable in `directory` and return
+    environment, in which it is found first."""
+
+    path = os.path.join(directory, 'frama-c')
+    with open(path, 'w') as f:
+        f.write(STUB_FRAMA_C)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+    return {'PATH': directory + os.pathsep + os.environ.get('PATH', '')}
+
+
+def use_stub_frama_c(test_case) -> str:
+    """Make stub `frama-c` available for the test and keep uploaded
+    and temporary files in a directory, which is returned."""
+
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+
+    patcher = mock.patch.dict(os.environ, install_stub_frama_c(directory.name))
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    settings_override = override_settings(
+        BASE_DIR=directory.name,
+        MEDIA_ROOT=directory.name
+    )
+    settings_override.enable()
+    test_case.addCleanup(settings_override.disable)
+
+    return directory.name
+
+
 class EntityModelTests(TestCase):
     def test_correct_default_validity_flag(self):
         e = Entity.objects.create()
         self.assertEqual(e.validity_flag, True)
 
 
+@skipUnless(connection.vendor == 'sqlite', 'SQLite connections are configured.')
+class SQLiteConnectionTests(SimpleTestCase):
+    def test_database_file_is_in_wal_mode_with_busy_timeout(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_dict = {
+            **connection.settings_dict,
+            'NAME': os.path.join(directory.name, 'db.sqlite3'),
+            'OPTIONS': {'timeout': 5}
+        }
+        database = connections['default'].__class__(settings_dict, alias='wal')
+        self.addCleanup(database.close)
+
+        with database.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+    def test_transactions_take_write_lock_when_they_begin(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'db.sqlite3')
+        connections['locking'] = connections['default'].__class__(
+            {**connection.settings_dict, 'NAME': path},
+            alias='locking'
+        )
+        self.addCleanup(connections.__delitem__, 'locking')
+        self.addCleanup(connections['locking'].close)
+        other = sqlite3.connect(path, timeout=0, isolation_level=None)
+        self.addCleanup(other.close)
+
+        with transaction.atomic(using='locking'):
+            connections['locking'].cursor().execute('SELECT 1')
+            # Another writer cannot start until the transaction ends.
+            with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+                other.execute('BEGIN IMMEDIATE')
+        other.execute('BEGIN IMMEDIATE')
+        other.execute('ROLLBACK')
+
+
 class DirectoryModelTests(TestCase):
     def setUp(self) -> None:
         self.user = create_dummy_user(1)
@@ -53,6 +269,81 @@ class DirectoryModelTests(TestCase):
         self.directory.delete_by_user()
         self.assertEqual(self.directory.availability_flag, False)
 
+    def test_delete_tree_by_user_deletes_contents_with_one_update_per_table(self):
+        other = Directory.objects.create(name='other', owner=self.user)
+        other_file = File.objects.create(owner=self.user, parent_dir=other)
+        parent = self.directory
+        for depth in range(50):
+            parent = Directory.objects.create(name=f'{depth}', owner=self.user, parent_dir=parent)
+            File.objects.create(owner=self.user, parent_dir=parent)
+        File.objects.create(owner=self.user, parent_dir=self.directory)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.directory.delete_tree_by_user()
+
+        updates = [query for query in queries if query['sql'].startswith('UPDATE')]
+        # Files, directories, listing versions of the tree and of its parent.
+        self.assertEqual(len(updates), 4)
+
+        self.assertEqual(Directory.objects.filter(availability_flag=False).count(), 51)
+        self.assertEqual(File.objects.filter(availability_flag=False).count(), 51)
+        other.refresh_from_db()
+        other_file.refresh_from_db()
+        self.assertTrue(other.availability_flag)
+        self.assertTrue(other_file.availability_flag)
+
+
+    def test_ancestors_and_subtree_are_found_by_path(self):
+        child = Directory.objects.create(name='child', owner=self.user, parent_dir=self.directory)
+        grandchild = Directory.objects.create(name='grandchild', owner=self.user, parent_dir=child)
+        Directory.objects.create(name='other', owner=self.user)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(list(grandchild.ancestors()), [self.directory, child])
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                sorted(d.pk for d in self.directory.subtree()),
+                [self.directory.pk, child.pk, grandchild.pk]
+            )
+
+    def test_moving_directory_updates_paths_of_its_subtree(self):
+        child = Directory.objects.create(name='child', owner=self.user, parent_dir=self.directory)
+        grandchild = Directory.objects.create(name='grandchild', owner=self.user, parent_dir=child)
+        target = Directory.objects.create(name='target', owner=self.user)
+
+        child.move_to(target)
+
+        grandchild.refresh_from_db()
+        self.assertEqual(grandchild.ancestor_ids(), [target.pk, child.pk])
+        self.assertEqual([d.pk for d in self.directory.subtree()], [self.directory.pk])
+        with self.assertRaises(ValidationError):
+            target.move_to(grandchild)
+
+    def test_deep_trees_are_saved_and_moved(self):
+        parent = self.directory
+        for depth in range(300):
+            parent = Directory.objects.create(name=f'{depth}', owner=self.user, parent_dir=parent)
+        other = Directory.objects.create(name='other', owner=self.user)
+        child = Directory.objects.create(name='child', owner=self.user, parent_dir=other)
+
+        other.move_to(parent)
+
+        child.refresh_from_db()
+        self.assertGreater(len(child.path), 1024)
+        self.assertEqual(child.ancestor_ids()[0], self.directory.pk)
+        self.assertEqual(child.ancestor_ids()[-2:], [parent.pk, other.pk])
+        self.assertEqual(len(child.ancestor_ids()), 302)
+        self.assertEqual(self.directory.subtree().count(), 303)
+
+    def test_rebuild_paths_fixes_paths_of_existing_data(self):
+        child = Directory.objects.create(name='child', owner=self.user, parent_dir=self.directory)
+        grandchild = Directory.objects.create(name='grandchild', owner=self.user, parent_dir=child)
+        Directory.objects.update(path='')
+
+        self.assertEqual(Directory.objects.rebuild_paths(), 2)
+
+        grandchild.refresh_from_db()
+        self.assertEqual(grandchild.ancestor_ids(), [self.directory.pk, child.pk])
 
 class FileModelTests(TestCase):
     def setUp(self) -> None:
@@ -68,6 +359,19 @@ class FileModelTests(TestCase):
         self.file.delete_by_user()
         self.assertEqual(self.file.availability_flag, False)
 
+    def test_name_of_stored_file_is_saved(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with override_settings(MEDIA_ROOT=directory.name):
+            first = File.objects.create(owner=self.user, uploaded_file=SimpleUploadedFile('a.c', b''))
+            second = File.objects.create(owner=self.user, uploaded_file=SimpleUploadedFile('a.c', b''))
+
+        self.assertEqual(first.name, 'a.c')
+        # Storage renamed the second file.
+        self.assertNotEqual(second.name, 'a.c')
+        self.assertEqual(second.name, os.path.basename(second.uploaded_file.name))
+
 
 class SectionCategoryModelTests(TestCase):
     def setUp(self) -> None:
@@ -107,6 +411,25 @@ class SectionStatusDataModelTests(TestCase):
         self.assertEqual(data.data, 'test-data')
         self.assertEqual(data.status.name, 'test-status')
 
+    def test_data_is_stored_compressed(self):
+        body = 'Goal Assertion (file a.c, line 1):\nProve: true.\n' * 100
+        SectionStatusData.objects.create(data=body, status=self.status)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT data FROM {SectionStatusData._meta.db_table}')
+            stored = bytes(cursor.fetchone()[0])
+        self.assertLess(len(stored), len(body) // 10)
+        self.assertEqual(SectionStatusData.objects.get().data, body)
+        self.assertEqual(SectionStatusData.objects.values_list('data', flat=True).get(), body)
+
+    def test_data_is_not_read_when_deferred(self):
+        SectionStatusData.objects.create(data='test-data', status=self.status)
+
+        with mock.patch('prover.fields.decompress_text') as decompress_text:
+            data = SectionStatusData.objects.defer('data').get()
+        decompress_text.assert_not_called()
+        self.assertEqual(data.data, 'test-data')
+
 
 class FileSectionModelTests(TestCase):
     def setUp(self) -> None:
@@ -203,6 +526,122 @@ class FileContentViewTests(TestCase):
         r = self.client.get(url)
         self.assertEqual(r.status_code, 404)
 
+    def test_number_of_queries_does_not_depend_on_number_of_sections(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        login_user(self, self.user)
+
+        query_counts = []
+        for n in (1, 20):
+            with override_settings(MEDIA_ROOT=media.name):
+                file = File.objects.create(
+                    owner=self.user,
+                    uploaded_file=SimpleUploadedFile(f'test{n}.c', b'int a;')
+                )
+                save_proving_result(file, 'log', [
+                    FramaSection('Goal', 'Valid', f'Goal {i}') for i in range(n)
+                ])
+
+                with CaptureQueriesContext(connection) as queries:
+                    r = self.client.get(reverse('file-content', args=(file.pk,)))
+            self.assertEqual(len(r.json()['sections']), n)
+            self.assertEqual(r.json()['sections'][-1]['body'], f'Goal {n - 1}')
+            self.assertEqual(r.json()['result'], 'log')
+            self.assertNotIn('body', r.json())
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_unchanged_proof_returns_not_modified_without_reading_sections(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        login_user(self, self.user)
+
+        with override_settings(MEDIA_ROOT=media.name):
+            file = File.objects.create(
+                owner=self.user,
+                uploaded_file=SimpleUploadedFile('test.c', b'int a;')
+            )
+            url = reverse('file-content', args=(file.pk,))
+            etag = self.client.get(url)['ETag']
+
+            with CaptureQueriesContext(connection) as queries:
+                r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 304)
+            self.assertFalse(any(
+                FileSection._meta.db_table in query['sql'] for query in queries
+            ))
+
+            save_proving_result(file, 'log', [FramaSection('Goal', 'Valid', 'Goal')])
+            r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 200)
+            self.assertEqual(len(r.json()['sections']), 1)
+            self.assertNotEqual(r['ETag'], etag)
+
+
+class FileSourceViewTests(TestCase):
+    def setUp(self) -> None:
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = create_dummy_user(1)
+        self.file = File.objects.create(
+            owner=self.user,
+            uploaded_file=SimpleUploadedFile('source.c', b'int main(void);\n')
+        )
+        self.url = reverse('file-source', args=(self.file.pk,))
+        login_user(self, self.user)
+
+    def test_source_is_streamed_with_validators(self):
+        r = self.client.get(self.url)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.streaming)
+        self.assertEqual(b''.join(r.streaming_content), b'int main(void);\n')
+        self.assertEqual(r['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', r)
+        self.assertIn('Last-Modified', r)
+
+    def test_matching_validators_return_not_modified(self):
+        r = self.client.get(self.url)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=r['ETag']).status_code, 304)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=r['Last-Modified']).status_code,
+            304
+        )
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_byte_ranges_are_served(self):
+        for header, content, content_range in (
+            ('bytes=4-7', b'main', 'bytes 4-7/16'),
+            ('bytes=9-', b'void);\n', 'bytes 9-15/16'),
+            ('bytes=-2', b';\n', 'bytes 14-15/16'),
+            ('bytes=0-100', b'int main(void);\n', 'bytes 0-15/16'),
+        ):
+            r = self.client.get(self.url, HTTP_RANGE=header)
+            self.assertEqual(r.status_code, 206)
+            self.assertEqual(b''.join(r.streaming_content), content)
+            self.assertEqual(r['Content-Range'], content_range)
+            self.assertEqual(int(r['Content-Length']), len(content))
+
+    def test_unsatisfiable_or_outdated_range(self):
+        r = self.client.get(self.url, HTTP_RANGE='bytes=16-')
+        self.assertEqual(r.status_code, 416)
+        self.assertEqual(r['Content-Range'], 'bytes */16')
+
+        # Range of another version of the file is ignored.
+        r = self.client.get(self.url, HTTP_RANGE='bytes=0-2', HTTP_IF_RANGE='"other"')
+        self.assertEqual(r.status_code, 200)
+
+    def test_files_of_other_users_are_not_served(self):
+        login_user(self, create_dummy_user(2))
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
 
 class CurrentFilesAndDirsViewTests(TestCase):
     def setUp(self) -> None:
@@ -234,6 +673,69 @@ class CurrentFilesAndDirsViewTests(TestCase):
         # File in setUp is not in main directory so it shouldn't be present here.
         self.assertEqual(len(data['files']), 0)
 
+    def list_pages(self, limit: int, directory=None):
+        login_user(self, self.user)
+        url = reverse('current-files-and-dirs')
+        params = {'limit': limit}
+        if directory is not None:
+            params['dir'] = directory.pk
+        pages = []
+        while True:
+            data = self.client.get(url, params).json()
+            pages.append(
+                [d['name'] for d in data['directories']] + [f['name'] for f in data['files']]
+            )
+            if not data['next']:
+                return pages
+            params['cursor'] = data['next']
+
+    def test_listing_is_paginated_in_order_of_names(self):
+        for name in ('d', 'b', 'c', 'a'):
+            Directory.objects.create(name=name, owner=self.user, parent_dir=self.directory)
+        for name in ('y.c', 'x.c'):
+            File.objects.create(owner=self.user, parent_dir=self.directory, uploaded_file=name)
+
+        self.assertEqual(
+            self.list_pages(3, self.directory),
+            [['a', 'b', 'c'], ['d', 'test-file.txt', 'x.c'], ['y.c']]
+        )
+        self.assertEqual(
+            self.list_pages(2, self.directory),
+            [['a', 'b'], ['c', 'd'], ['test-file.txt', 'x.c'], ['y.c']]
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        login_user(self, self.user)
+        url = reverse('current-files-and-dirs')
+
+        for params in ({'cursor': 'invalid'}, {'cursor': 'WzFd'}, {'limit': '0'}):
+            self.assertEqual(self.client.get(url, params).status_code, 400)
+
+    def test_unchanged_listing_returns_not_modified(self):
+        login_user(self, self.user)
+        url = reverse('current-files-and-dirs')
+        params = {'dir': self.directory.pk}
+        etag = self.client.get(url, params)['ETag']
+        main_etag = self.client.get(url)['ETag']
+
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Changes of the directory change its ETag, not ETag of its parent.
+        for change in (
+            lambda: File.objects.create(owner=self.user, parent_dir=self.directory, uploaded_file='a.c'),
+            lambda: Directory.objects.create(name='a', owner=self.user, parent_dir=self.directory),
+            lambda: self.file.delete_by_user(),
+        ):
+            change()
+            r = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 200)
+            etag = r['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=main_etag).status_code, 304)
+
+        self.directory.delete_tree_by_user()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=main_etag).status_code, 200)
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
 
 class MainViewTests(TestCase):
     def setUp(self) -> None:
@@ -340,3 +842,1191 @@ class ProveFileViewTests(TestCase):
         login_user(self, self.user)
         r = self.client.post(url)
         self.assertEqual(r.status_code, 404)
+
+    def test_proving_file_queues_job(self):
+        login_user(self, self.user)
+        file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+        url = reverse('prove-file', args=(file.pk,))
+
+        r = self.client.post(url)
+        self.assertEqual(r.status_code, 202)
+
+        job = ProofJob.objects.get(pk=r.json()['job'])
+        self.assertEqual(job.file, file)
+        self.assertEqual(job.state, ProofJob.State.QUEUED)
+
+    def test_proving_file_with_selected_backend(self):
+        login_user(self, self.user)
+        file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+        url = reverse('prove-file', args=(file.pk,))
+
+        r = self.client.post(url, {'backend': 'stub'})
+        self.assertEqual(ProofJob.objects.get(pk=r.json()['job']).backend, 'stub')
+
+        r = self.client.post(url, {'backend': 'unknown'})
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(ProofJob.objects.count(), 1)
+
+    def test_proving_file_with_solver_portfolio(self):
+        login_user(self, self.user)
+        file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+        url = reverse('prove-file', args=(file.pk,))
+
+        r = self.client.post(url, {'solvers': 'alt-ergo, z3,cvc4'})
+        self.assertEqual(ProofJob.objects.get(pk=r.json()['job']).solvers, 'alt-ergo,z3,cvc4')
+
+        r = self.client.post(url, {'solvers': 'z3;rm'})
+        self.assertEqual(r.status_code, 400)
+
+
+class ProofJobViewTests(TestCase):
+    def setUp(self) -> None:
+        self.user = create_dummy_user(1)
+        self.file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+        self.job = ProofJob.objects.create(file=self.file)
+
+    def test_returns_state_of_job(self):
+        login_user(self, self.user)
+        url = reverse('proof-job', args=(self.job.pk,))
+
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()['state'], ProofJob.State.QUEUED)
+
+    def test_user_cannot_see_somebody_else_job(self):
+        user2 = create_dummy_user(2)
+        login_user(self, user2)
+        url = reverse('proof-job', args=(self.job.pk,))
+
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 404)
+
+
+class ProofJobEventsTests(TestCase):
+    def setUp(self) -> None:
+        self.user = create_dummy_user(1)
+        self.file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+        self.job = ProofJob.objects.create(file=self.file)
+
+    def collect_events(self, last_section_id=0):
+        async def collect():
+            return [event async for event in proof_job_events(self.job.pk, last_section_id)]
+
+        return async_to_sync(collect)()
+
+    def test_sections_of_job_are_streamed_until_it_is_finished(self):
+        writer = ProvingResultWriter(self.file, self.job)
+        writer.add_all(FramaSection('Goal', 'Valid', f'Goal {i}') for i in range(2))
+        writer.finish('log')
+        self.job.state = ProofJob.State.DONE
+        self.job.save()
+
+        events = self.collect_events()
+
+        self.assertEqual(len(events), 3)
+        self.assertIn('event: section', events[0])
+        self.assertIn('"body": "Goal 1"', events[1])
+        self.assertIn('event: finished', events[2])
+        self.assertIn('"state": "done"', events[2])
+
+        # Reconnecting browser gets only sections it has not received.
+        last_section_id = self.job.sections.order_by('id').first().pk
+        self.assertEqual(len(self.collect_events(last_section_id)), 2)
+
+    def test_user_cannot_follow_somebody_else_job(self):
+        login_user(self, create_dummy_user(2))
+        url = reverse('proof-job-events', args=(self.job.pk,))
+
+        r = self.client.get(url)
+        self.assertEqual(r.status_code, 404)
+
+
+class ProofJobQueueTests(TestCase):
+    def setUp(self) -> None:
+        self.user = create_dummy_user(1)
+        self.file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+
+    def create_jobs(self, user, count: int):
+        return [
+            enqueue_proof(File.objects.create(owner=user, uploaded_file=f'{user.pk}-{n}.c'))
+            for n in range(count)
+        ]
+
+    def test_jobs_are_claimed_once_in_queue_order(self):
+        first = ProofJob.objects.create(file=self.file)
+        second = ProofJob.objects.create(
+            file=File.objects.create(owner=self.user, uploaded_file='other-file.c')
+        )
+
+        self.assertEqual(claim_next_job().pk, first.pk)
+        self.assertEqual(claim_next_job().pk, second.pk)
+        self.assertIsNone(claim_next_job())
+        self.assertEqual(
+            ProofJob.objects.filter(state=ProofJob.State.RUNNING).count(), 2
+        )
+
+    def test_duplicate_requests_share_unfinished_job(self):
+        job = enqueue_proof(self.file)
+
+        self.assertEqual(enqueue_proof(self.file), job)
+        claim_next_job()
+        self.assertEqual(enqueue_proof(self.file), job)
+        # Another prover makes another proof.
+        self.assertNotEqual(enqueue_proof(self.file, 'stub'), job)
+
+        ProofJob.objects.filter(pk=job.pk).update(state=ProofJob.State.DONE)
+        self.assertNotEqual(enqueue_proof(self.file), job)
+
+    @override_settings(PROVER_USER_CONCURRENCY=1, PROVER_USER_RATE_LIMIT=0)
+    def test_users_take_turns(self):
+        other_user = create_dummy_user(2)
+        busy_jobs = self.create_jobs(self.user, 3)
+        other_jobs = self.create_jobs(other_user, 2)
+
+        self.assertEqual(claim_next_job(), busy_jobs[0])
+        self.assertEqual(claim_next_job(), other_jobs[0])
+        # Both users run as many jobs as they may.
+        self.assertIsNone(claim_next_job())
+
+        ProofJob.objects.filter(pk=busy_jobs[0].pk).update(state=ProofJob.State.DONE)
+        ProofJob.objects.filter(pk=other_jobs[0].pk).update(state=ProofJob.State.DONE)
+        # The user served least recently goes first.
+        self.assertEqual(claim_next_job(), busy_jobs[1])
+        self.assertEqual(claim_next_job(), other_jobs[1])
+
+    @override_settings(PROVER_USER_CONCURRENCY=0, PROVER_USER_RATE_LIMIT=2, PROVER_USER_RATE_PERIOD=60)
+    def test_rate_limit_of_user(self):
+        jobs = self.create_jobs(self.user, 3)
+
+        self.assertEqual(claim_next_job(), jobs[0])
+        self.assertEqual(claim_next_job(), jobs[1])
+        self.assertIsNone(claim_next_job())
+
+        ProofJob.objects.filter(pk__in=[jobs[0].pk, jobs[1].pk]).update(
+            start_date=timezone.now() - timedelta(seconds=61)
+        )
+        self.assertEqual(claim_next_job(), jobs[2])
+
+    @override_settings(PROVER_USER_CONCURRENCY=1, PROVER_USER_RATE_LIMIT=0)
+    def test_claim_checks_limits_of_user_again(self):
+        jobs = self.create_jobs(self.user, 2)
+        queue = get_fair_queue(timezone.now())
+        claim_next_job()
+
+        # Another worker computed the queue before the job was claimed.
+        with mock.patch('prover.jobs.get_fair_queue', side_effect=[queue, []]):
+            self.assertIsNone(claim_next_job())
+        self.assertEqual(ProofJob.objects.get(pk=jobs[1].pk).state, ProofJob.State.QUEUED)
+
+    @skipUnless(os.name == 'posix', 'Stub frama-c is a POSIX script.')
+    @override_settings(PROOF_CACHE_MAX_ENTRIES=0)
+    def test_finished_job_stores_sections_and_result(self):
+        use_stub_frama_c(self)
+        file = File.objects.create(
+            owner=self.user,
+            uploaded_file=SimpleUploadedFile('source.c', b'int a;')
+        )
+        ProofJob.objects.create(file=file)
+
+        job = claim_next_job()
+        run_proof_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, ProofJob.State.DONE)
+        section = file.sections.get(validity_flag=True)
+        self.assertIn('Prove: source.c', section.status_data.data)
+        self.assertEqual(file.results.get(validity_flag=True).data, 'log of source.c')
+
+    @override_settings(PROOF_CACHE_MAX_ENTRIES=0, PROVER_INCREMENTAL=False)
+    @mock.patch('prover.jobs.open_frama_c_run')
+    def test_job_fails_when_prover_fails(self, open_frama_c_run):
+        open_frama_c_run.side_effect = FileNotFoundError('frama-c')
+        ProofJob.objects.create(file=self.file)
+
+        job = claim_next_job()
+        run_proof_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, ProofJob.State.FAILED)
+        self.assertIn('frama-c', job.error)
+
+    def abandon_claimed_job(self) -> ProofJob:
+        ProofJob.objects.create(file=self.file)
+        job = claim_next_job()
+        ProofJob.objects.filter(pk=job.pk).update(
+            heartbeat_date=timezone.now() - timedelta(seconds=settings.PROVER_JOB_LEASE + 1)
+        )
+        return job
+
+    def test_abandoned_job_is_claimed_again(self):
+        job = self.abandon_claimed_job()
+
+        self.assertEqual(claim_next_job().pk, job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.state, ProofJob.State.RUNNING)
+        self.assertEqual(job.attempts, 2)
+
+    @override_settings(PROVER_JOB_MAX_ATTEMPTS=1)
+    def test_abandoned_job_fails_after_last_attempt(self):
+        job = self.abandon_claimed_job()
+
+        self.assertIsNone(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.state, ProofJob.State.FAILED)
+        self.assertIsNotNone(job.finish_date)
+
+    def test_stale_worker_does_not_finish_claim_of_other_worker(self):
+        stale = self.abandon_claimed_job()
+        with mock.patch('prover.jobs.prove_file'):
+            time.sleep(0.01)
+            claim_next_job()
+            run_proof_job(stale)
+
+        job = ProofJob.objects.get(pk=stale.pk)
+        self.assertEqual(job.state, ProofJob.State.RUNNING)
+        self.assertIsNone(job.finish_date)
+
+    def test_stopped_worker_fails_its_job(self):
+        ProofJob.objects.create(file=self.file)
+        job = claim_next_job()
+
+        with mock.patch('prover.jobs.prove_file', side_effect=SystemExit(143)):
+            with self.assertRaises(SystemExit):
+                run_proof_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.state, ProofJob.State.FAILED)
+        self.assertIsNotNone(job.finish_date)
+
+
+# The in-memory SQLite test database fails concurrent writers at once,
+# instead of waiting for them (`database table is locked`).
+@skipUnless(connection.features.has_select_for_update, 'Claims are serialized by row locks.')
+@override_settings(PROVER_USER_CONCURRENCY=1, PROVER_USER_RATE_LIMIT=0)
+class ConcurrentClaimTests(TransactionTestCase):
+    def claim_in_threads(self, count: int):
+        barrier = threading.Barrier(count)
+
+        def claim():
+            try:
+                barrier.wait(5)
+                return claim_next_job()
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            return list(executor.map(lambda _: claim(), range(count)))
+
+    def test_workers_do_not_exceed_concurrency_of_user(self):
+        user = create_dummy_user(1)
+        for n in range(4):
+            enqueue_proof(File.objects.create(owner=user, uploaded_file=f'{n}.c'))
+
+        claimed = [job for job in self.claim_in_threads(4) if job is not None]
+
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(ProofJob.objects.filter(state=ProofJob.State.RUNNING).count(), 1)
+
+
+class NameLookupManagerTests(TestCase):
+    def setUp(self) -> None:
+        self.addCleanup(SectionStatus.objects.clear_cache)
+
+    def test_rows_are_created_once_per_name(self):
+        first = SectionStatus.objects.get_ids(['Valid', 'Timeout'])
+        second = SectionStatus.objects.get_ids(['Valid', 'Unknown'])
+
+        self.assertEqual(first['Valid'], second['Valid'])
+        self.assertEqual(SectionStatus.objects.count(), 3)
+
+    def test_committed_names_are_served_from_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = SectionStatus.objects.get_ids(['Valid'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(SectionStatus.objects.get_ids(['Valid']), ids)
+
+    def test_rolled_back_names_are_not_cached(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            SectionStatus.objects.get_ids(['Valid'])
+
+        with self.assertNumQueries(1):
+            SectionStatus.objects.get_ids(['Valid'])
+
+
+class SaveProvingResultTests(TestCase):
+    def setUp(self) -> None:
+        self.user = create_dummy_user(1)
+        self.file = File.objects.create(owner=self.user, uploaded_file='test-file.c')
+
+    def create_sections(self, n: int):
+        return [FramaSection('Goal', 'Valid', f'Goal {i}') for i in range(n)]
+
+    def test_previous_sections_and_results_are_invalidated(self):
+        save_proving_result(self.file, 'first', self.create_sections(2))
+        save_proving_result(self.file, 'second', self.create_sections(3))
+
+        self.assertEqual(self.file.sections.filter(validity_flag=True).count(), 3)
+        self.assertEqual(self.file.sections.filter(validity_flag=False).count(), 2)
+        self.assertEqual(self.file.results.get(validity_flag=True).data, 'second')
+        bodies = [
+            section.status_data.data
+            for section in self.file.sections.filter(validity_flag=True).order_by('id')
+        ]
+        self.assertEqual(bodies, ['Goal 0', 'Goal 1', 'Goal 2'])
+        # Sections share category and status rows.
+        self.assertEqual(SectionCategory.objects.count(), 1)
+        self.assertEqual(SectionStatus.objects.count(), 1)
+
+    def test_structured_fields_are_saved(self):
+        save_proving_result(self.file, 'log', [
+            FramaSection(
+                'Goal',
+                'Valid',
+                'Goal',
+                solver='Z3',
+                time=0.25,
+                steps=40,
+                goal='positive',
+                function='f',
+                kind='Post-condition'
+            ),
+            FramaSection('Goal', 'Unknown', 'Other goal'),
+        ])
+
+        data = SectionStatusData.objects.order_by('id')
+        self.assertEqual(
+            [(d.solver, d.time, d.steps) for d in data],
+            [('Z3', 0.25, 40), ('', None, None)]
+        )
+        self.assertEqual(
+            list(FileSection.objects.filter(
+                function='f',
+                property_kind='Post-condition'
+            ).values_list('name', flat=True)),
+            ['positive']
+        )
+        result = self.file.results.get(validity_flag=True)
+        self.assertEqual((result.goals, result.proved_goals), (2, 1))
+
+    def test_number_of_queries_does_not_depend_on_number_of_sections(self):
+        save_proving_result(self.file, 'log', self.create_sections(1))
+        with CaptureQueriesContext(connection) as one_section_queries:
+            save_proving_result(self.file, 'log', self.create_sections(1))
+        with CaptureQueriesContext(connection) as many_sections_queries:
+            save_proving_result(self.file, 'log', self.create_sections(50))
+
+        self.assertEqual(len(one_section_queries), len(many_sections_queries))
+
+    def test_new_sections_are_not_valid_before_finish(self):
+        save_proving_result(self.file, 'first', self.create_sections(2))
+        writer = ProvingResultWriter(self.file, batch_size=2)
+
+        writer.add_all(self.create_sections(3))
+        # A full batch is already saved, but not visible yet.
+        self.assertEqual(self.file.sections.count(), 4)
+        self.assertEqual(self.file.sections.filter(validity_flag=True).count(), 2)
+
+        writer.finish('second')
+        self.assertEqual(self.file.sections.filter(validity_flag=True).count(), 3)
+        self.assertEqual(self.file.results.get(validity_flag=True).data, 'second')
+
+
+@skipUnless(os.name == 'posix', 'Stub frama-c is a POSIX script.')
+class GetFramaCPrintTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.directory = use_stub_frama_c(self)
+
+    def create_source(self, n: int) -> str:
+        path = os.path.join(self.directory, f'source{n}.c')
+        with open(path, 'w') as f:
+            f.write('int main() { return 0; }')
+
+        return path
+
+    def test_concurrent_proofs_get_their_own_results(self):
+        paths = [self.create_source(n) for n in range(16)]
+
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            results = list(executor.map(get_frama_c_print, paths))
+
+        for path, (result_data, sections) in zip(paths, results):
+            name = os.path.basename(path)
+            self.assertEqual(result_data, f'log of {name}')
+            self.assertEqual(len(sections), 1)
+            self.assertIn(f'Prove: {name}', sections[0].body)
+
+    def test_functions_proved_in_parallel_are_merged_in_source_order(self):
+        path = os.path.join(self.directory, 'functions.c')
+        with open(path, 'w') as f:
+            f.write('int f(void) { return 0; }\nint g(void) { return f(); }\n')
+
+        result_data, sections = get_frama_c_print_parallel(path, processes=4)
+
+        self.assertEqual(
+            [section.body.split('\n')[0] for section in sections],
+            [
+                'Lemma l:',
+                "Goal Assertion (file functions.c, line 1) in 'f':",
+                "Goal Assertion (file functions.c, line 1) in 'g':",
+            ]
+        )
+        self.assertEqual(result_data, 'log of functions.c' * 3)
+
+    def test_solvers_race_and_first_definitive_answer_wins(self):
+        path = self.create_source(1)
+
+        start = time.monotonic()
+        result_data, sections = FramaCBackend(['slow', 'unsure', 'z3']).prove(path)
+
+        # The slow solver was cancelled.
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(len(sections), 1)
+        self.assertEqual(sections[0].status, 'Valid')
+        self.assertEqual(sections[0].solver, 'z3')
+        self.assertEqual(sections[0].time, 0.012)
+        self.assertEqual(result_data, 'log of source1.c')
+
+    def test_goal_keeps_unknown_status_if_no_solver_proves_it(self):
+        result_data, sections = FramaCBackend(['unsure', 'unsure']).prove(self.create_source(1))
+
+        self.assertEqual(len(sections), 1)
+        self.assertEqual(sections[0].status, 'Unknown')
+
+    @override_settings(PROVER_WALL_TIMEOUT=0.5)
+    def test_prover_and_its_solvers_are_killed_after_timeout(self):
+        pid_file = os.path.join(self.directory, 'solver.pid')
+
+        start = time.monotonic()
+        with mock.patch.dict(os.environ, {'STUB_SOLVER_PID_FILE': pid_file}):
+            with self.assertRaises(ProverTimeout):
+                FramaCBackend(['slow']).prove(self.create_source(1))
+
+        self.assertLess(time.monotonic() - start, 5)
+        with open(pid_file) as f:
+            pid = int(f.read())
+        for _ in range(50):
+            if not process_is_running(pid):
+                break
+            time.sleep(0.1)
+        self.assertFalse(process_is_running(pid))
+
+    def test_proof_succeeds_on_platforms_without_cpu_limit_signal(self):
+        with mock.patch('prover.processes.signal', types.SimpleNamespace(SIGKILL=signal.SIGKILL)):
+            result_data, sections = get_frama_c_print(self.create_source(1))
+
+        self.assertEqual(result_data, 'log of source1.c')
+
+    def test_terminated_worker_kills_its_provers(self):
+        pid_file = os.path.join(self.directory, 'solver.pid')
+
+        with mock.patch.dict(os.environ, {'STUB_SOLVER_PID_FILE': pid_file}):
+            with FramaCBackend(['slow']).run(self.create_source(1)) as run:
+                for _ in range(50):
+                    if os.path.exists(pid_file) and os.path.getsize(pid_file):
+                        break
+                    time.sleep(0.1)
+                with open(pid_file) as f:
+                    pid = int(f.read())
+
+                with self.assertRaises(SystemExit):
+                    stop_worker(signal.SIGTERM, None)
+
+                self.assertTrue(run.cancelled)
+                for _ in range(50):
+                    if not process_is_running(pid):
+                        break
+                    time.sleep(0.1)
+                self.assertFalse(process_is_running(pid))
+
+    @override_settings(PROVER_WALL_TIMEOUT=1)
+    def test_race_is_won_by_solver_within_timeout(self):
+        result_data, sections = FramaCBackend(['slow', 'z3']).prove(self.create_source(1))
+
+        self.assertEqual(sections[0].solver, 'z3')
+
+    def test_race_yields_goals_as_soon_as_they_are_settled(self):
+        def section(goal, status):
+            return FramaSection('Goal Assertion', status, f'Goal Assertion (file a.c, line {goal}):\n')
+
+        proceed = threading.Event()
+        fast = ScriptedRun([section(1, 'Valid'), proceed, section(2, 'Unknown')], 'log of fast')
+        slow = ScriptedRun([section(1, 'Unknown'), section(2, 'Unknown'), threading.Event()], 'log of slow')
+        run = PortfolioRun([fast, slow])
+        sections = run.sections()
+
+        # Definitive status wins at once, the other goal waits for every run.
+        self.assertEqual(next(sections).body, section(1, 'Valid').body)
+        self.assertFalse(slow.cancelled)
+        proceed.set()
+        self.assertEqual(next(sections).body, section(2, 'Unknown').body)
+        self.assertEqual(list(sections), [])
+        # Goals were settled before the slow run ended.
+        self.assertTrue(slow.cancelled)
+        self.assertEqual(run.result_data(), 'log of fast')
+
+    def test_limits_and_goal_timeout_are_passed_to_frama_c(self):
+        with override_settings(PROVER_GOAL_TIMEOUT=7):
+            command = FramaCBackend([]).command('a.c', 'result.txt')
+        self.assertEqual(command[command.index('-wp-timeout') + 1], '7')
+
+        with mock.patch('prover.processes.resource') as resource:
+            _limit_resources(1234, 60, 100)
+        resource.prlimit.assert_any_call(1234, resource.RLIMIT_CPU, (60, 61))
+        resource.prlimit.assert_any_call(1234, resource.RLIMIT_AS, (100 * 1024 * 1024,) * 2)
+
+    @skipUnless(os.path.exists('/proc/self/limits'), 'Limits are read from /proc.')
+    @override_settings(PROVER_CPU_LIMIT=60, PROVER_MEMORY_LIMIT=4096)
+    def test_limits_are_set_on_running_prover(self):
+        with FramaCBackend(['slow']).run(self.create_source(1)) as run:
+            with open(f'/proc/{run.process.pid}/limits') as f:
+                limits = f.read()
+
+        self.assertRegex(limits, r'Max cpu time +60 +61 ')
+        self.assertRegex(limits, rf'Max address space +{4096 * 1024 * 1024} +{4096 * 1024 * 1024} ')
+
+    def test_workspace_is_removed_after_proof(self):
+        get_frama_c_print(self.create_source(1))
+
+        temp_directory = os.path.join(self.directory, 'files', 'temp')
+        self.assertEqual(os.listdir(temp_directory), [])
+
+
+@override_settings(PROOF_CACHE_MAX_ENTRIES=2)
+@override_settings(PROOF_CACHE_MAX_ENTRIES=2, PROVER_INCREMENTAL=False)
+class ProofCacheTests(TestCase):
+    def setUp(self) -> None:
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name, BASE_DIR=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = create_dummy_user(1)
+        self.backend = StubBackend(sections=3, delay=0)
+        patcher = mock.patch('prover.jobs.open_frama_c_run', wraps=open_frama_c_run)
+        self.open_frama_c_run = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_file(self, name: str, content: str) -> File:
+        return File.objects.create(
+            owner=self.user,
+            uploaded_file=SimpleUploadedFile(name, content.encode())
+        )
+
+    def prove(self, file: File):
+        prove_file(file, backend=self.backend)
+
+    def test_unchanged_content_is_not_proved_again(self):
+        first = self.create_file('a.c', 'int a;')
+        second = self.create_file('b.c', 'int a;')
+
+        self.prove(first)
+        self.prove(second)
+
+        self.assertEqual(self.open_frama_c_run.call_count, 1)
+        self.assertEqual(
+            list(second.sections.filter(validity_flag=True).values_list('status_data__data', flat=True)),
+            list(first.sections.filter(validity_flag=True).values_list('status_data__data', flat=True))
+        )
+        self.assertEqual(second.results.get(validity_flag=True).data, '[stub] 3 goals of a.c\n')
+        statistics = get_proof_cache_statistics()
+        self.assertEqual(statistics['hits'], 1)
+        self.assertEqual(statistics['misses'], 1)
+
+    def test_jobs_use_cache(self):
+        file = self.create_file('a.c', 'int a;')
+        self.prove(file)
+
+        job = ProofJob.objects.create(file=self.create_file('b.c', 'int a;'), backend='stub')
+        with override_settings(PROVER_STUB_SECTIONS=3, PROVER_STUB_SECTION_DELAY=0):
+            run_proof_job(job)
+
+        self.assertEqual(job.state, ProofJob.State.DONE)
+        self.assertEqual(self.open_frama_c_run.call_count, 1)
+        self.assertEqual(job.file.sections.filter(validity_flag=True).count(), 3)
+
+    def test_entries_are_stored_compressed(self):
+        self.backend = StubBackend(sections=1000, delay=0)
+        self.prove(self.create_file('a.c', 'int a;'))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT sections FROM {ProofCacheEntry._meta.db_table}')
+            sections = bytes(cursor.fetchone()[0])
+        file = self.create_file('b.c', 'int a;')
+        self.prove(file)
+        contents = file.sections.filter(validity_flag=True).values_list('status_data__data', flat=True)
+        self.assertLess(len(sections), sum(len(content) for content in contents) / 5)
+        self.assertEqual(self.open_frama_c_run.call_count, 1)
+        self.assertIn('line 1000', contents.last())
+
+    def test_changed_content_or_version_is_proved_again(self):
+        file = self.create_file('a.c', 'int a;')
+        self.prove(file)
+
+        with open(file.uploaded_file.path, 'w') as f:
+            f.write('int b;')
+        self.prove(file)
+        self.backend = StubBackend(sections=4, delay=0)
+        self.prove(file)
+
+        self.assertEqual(self.open_frama_c_run.call_count, 3)
+        self.assertEqual(clear_proof_cache(keep_version=self.backend.version()), 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        a = self.create_file('a.c', 'int a;')
+        b = self.create_file('b.c', 'int b;')
+        c = self.create_file('c.c', 'int c;')
+
+        self.prove(a)
+        self.prove(b)
+        self.prove(a)
+        self.prove(c)
+        self.assertEqual(get_proof_cache_statistics()['entries'], 2)
+
+        # `b` was evicted, `a` is still cached.
+        self.prove(a)
+        self.assertEqual(self.open_frama_c_run.call_count, 3)
+        self.prove(b)
+        self.assertEqual(self.open_frama_c_run.call_count, 4)
+
+
+class StubBackendTests(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'source.c')
+        with open(self.path, 'w') as f:
+            f.write('int f(void) { return 0; }\n')
+
+    def test_configured_number_of_sections_is_reported(self):
+        result_data, sections = StubBackend(sections=25, delay=0).prove(self.path)
+
+        self.assertEqual(len(sections), 25)
+        self.assertEqual(sections[0].category, 'Goal Assertion')
+        self.assertIn('file source.c, line 1', sections[0].body)
+        self.assertEqual(result_data, '[stub] 25 goals of source.c\n')
+
+    def test_proof_is_deterministic(self):
+        first = StubBackend(sections=50, delay=0).prove(self.path, ['-wp-fct', 'f'])
+        second = StubBackend(sections=50, delay=0).prove(self.path, ['-wp-fct', 'f'])
+
+        self.assertEqual(
+            [(s.status, s.body) for s in first[1]],
+            [(s.status, s.body) for s in second[1]]
+        )
+        self.assertIn("in 'f'", first[1][0].body)
+
+    @override_settings(PROVER_WALL_TIMEOUT=0.5)
+    def test_time_limit_applies_to_whole_proof_of_functions(self):
+        with open(self.path, 'w') as f:
+            f.write(''.join(f'int f{n}(void) {{ return {n}; }}\n' for n in range(6)))
+
+        # Every function is proved in time, all of them are not.
+        with self.assertRaises(ProverTimeout):
+            with open_frama_c_run(self.path, processes=2, backend=StubBackend(sections=2, delay=0.15)) as run:
+                list(run.sections())
+
+    @override_settings(PROVER_STUB_SECTIONS=3, PROVER_STUB_SECTION_DELAY=0.0)
+    def test_backend_is_selected_by_name(self):
+        self.assertIsInstance(get_backend('stub'), StubBackend)
+        self.assertEqual(get_backend('stub').sections, 3)
+        with override_settings(PROVER_BACKEND='stub'):
+            self.assertIsInstance(get_backend(), StubBackend)
+        with self.assertRaises(ValueError):
+            get_backend('unknown')
+
+    def test_backend_without_prover_methods_cannot_be_created(self):
+        class IncompleteBackend(ProverBackend):
+            def version(self) -> str:
+                return 'incomplete'
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+
+
+@override_settings(PROVER_STUB_SECTIONS=2, PROVER_STUB_SECTION_DELAY=0.0, PROOF_CACHE_MAX_ENTRIES=0)
+class StubBackendJobTests(TestCase):
+    def setUp(self) -> None:
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name, BASE_DIR=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.file = File.objects.create(
+            owner=create_dummy_user(1),
+            uploaded_file=SimpleUploadedFile(
+                'source.c',
+                b'int f(void) { return 0; }\nint g(void) { return f(); }\n'
+            )
+        )
+
+    @override_settings(PROVER_PARALLEL_PROCESSES=2)
+    def test_job_is_proved_by_its_backend_without_frama_c(self):
+        job = ProofJob.objects.create(file=self.file, backend='stub')
+
+        with mock.patch.dict(os.environ, {'PATH': ''}):
+            run_proof_job(job)
+
+        self.assertEqual(job.state, ProofJob.State.DONE)
+        # Two goals of global properties and of each function.
+        self.assertEqual(self.file.sections.filter(validity_flag=True).count(), 6)
+
+    @override_settings(PROVER_STUB_SECTION_DELAY=0.2, PROVER_WALL_TIMEOUT=0.1)
+    def test_job_exceeding_time_limit_times_out(self):
+        job = ProofJob.objects.create(file=self.file, backend='stub')
+
+        run_proof_job(job)
+
+        self.assertEqual(job.state, ProofJob.State.TIMEOUT)
+        self.assertTrue(job.is_finished())
+        self.assertFalse(self.file.sections.filter(validity_flag=True).exists())
+
+    @override_settings(PROVER_BACKEND='stub', PROOF_CACHE_MAX_ENTRIES=10)
+    def test_workers_clear_cache_of_other_versions_of_configured_backend(self):
+        version = get_backend().version()
+        for key, prover_version in (('a', version), ('b', 'frama-c 1')):
+            ProofCacheEntry.objects.create(
+                key=key * 64,
+                prover_version=prover_version,
+                result_data='',
+                sections='[]',
+                last_used=timezone.now()
+            )
+        job = ProofJob.objects.create(file=self.file)
+
+        with mock.patch.dict(os.environ, {'PATH': ''}):
+            call_command('run_prover_workers', workers=1, once=True, stdout=io.StringIO())
+
+        self.assertEqual(set(ProofCacheEntry.objects.values_list('prover_version', flat=True)), {version})
+        job.refresh_from_db()
+        self.assertEqual(job.state, ProofJob.State.DONE)
+
+    def test_job_with_unknown_backend_fails(self):
+        job = ProofJob.objects.create(file=self.file, backend='unknown')
+
+        run_proof_job(job)
+
+        self.assertEqual(job.state, ProofJob.State.FAILED)
+        self.assertIn('unknown', job.error)
+
+
+class ProofRunTests(TestCase):
+    def setUp(self) -> None:
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = create_dummy_user(1)
+        login_user(self, self.user)
+        self.file = File.objects.create(
+            owner=self.user,
+            uploaded_file=SimpleUploadedFile('a.c', b'int f(void) { return 0; }\n')
+        )
+
+    def prove(self, statuses: dict) -> ProofRun:
+        save_proving_result(self.file, 'log', [
+            FramaSection('Goal Assertion', status, f'Goal Assertion {goal}:\n', goal=goal, function='f')
+            for goal, status in statuses.items()
+        ])
+        return self.file.current_run
+
+    def test_finished_proof_becomes_current_run(self):
+        first = self.prove({'a': 'Valid'})
+        second = self.prove({'a': 'Valid', 'b': 'Unknown'})
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.is_finished())
+        self.assertEqual(second.sections.count(), 2)
+        self.assertEqual(second.result.goals, 2)
+        self.assertEqual(list(self.file.runs.order_by('id')), [first, second])
+
+    def test_runs_are_listed_newest_first(self):
+        first = self.prove({'a': 'Valid'})
+        second = self.prove({'a': 'Valid'})
+
+        r = self.client.get(reverse('file-runs', args=(self.file.pk,)))
+
+        runs = r.json()['runs']
+        self.assertEqual([run['id'] for run in runs], [second.pk, first.pk])
+        self.assertEqual([run['current'] for run in runs], [True, False])
+        self.assertEqual(runs[0]['goals'], 1)
+
+    def test_runs_are_compared_goal_by_goal_without_bodies(self):
+        old = self.prove({'a': 'Valid', 'b': 'Unknown', 'c': 'Valid'})
+        new = self.prove({'a': 'Valid', 'b': 'Valid', 'd': 'Timeout'})
+
+        with CaptureQueriesContext(connection) as queries:
+            r = self.client.get(reverse('proof-run-diff', args=(old.pk, new.pk)))
+
+        diff = r.json()
+        self.assertEqual(diff['unchanged'], 1)
+        self.assertEqual([goal['goal'] for goal in diff['added']], ['d'])
+        self.assertEqual([goal['goal'] for goal in diff['removed']], ['c'])
+        self.assertEqual(len(diff['changed']), 1)
+        self.assertEqual(diff['changed'][0]['old']['status'], 'Unknown')
+        self.assertEqual(diff['changed'][0]['new']['status'], 'Valid')
+        self.assertIsNone(diff['added'][0]['old'])
+        data_column = f'"{SectionStatusData._meta.db_table}"."data"'
+        self.assertFalse(any(data_column in query['sql'] for query in queries))
+
+    def test_runs_of_other_users_are_not_compared(self):
+        run = self.prove({'a': 'Valid'})
+        login_user(self, create_dummy_user(2))
+
+        r = self.client.get(reverse('proof-run-diff', args=(run.pk, run.pk)))
+        self.assertEqual(r.status_code, 404)
+
+    def test_runs_of_other_files_are_not_compared(self):
+        run = self.prove({'a': 'Valid'})
+        self.file = File.objects.create(
+            owner=self.user,
+            uploaded_file=SimpleUploadedFile('b.c', b'int f(void) { return 0; }\n')
+        )
+        other_run = self.prove({'a': 'Valid'})
+
+        r = self.client.get(reverse('proof-run-diff', args=(run.pk, other_run.pk)))
+        self.assertEqual(r.status_code, 404)
+
+
+class RetentionTests(TestCase):
+    def setUp(self) -> None:
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = create_dummy_user(1)
+        self.file = File.objects.create(
+            owner=self.user,
+            uploaded_file=SimpleUploadedFile('a.c', b'int f(void) { return 0; }\n')
+        )
+
+    def prove(self, run: int):
+        save_proving_result(self.file, f'log {run}', [
+            FramaSection('Goal Assertion', 'Valid', f'Goal Assertion {run} {n}:\n')
+            for n in range(2)
+        ])
+
+    def test_all_but_last_proofs_are_removed(self):
+        for run in range(4):
+            self.prove(run)
+
+        counts = compact_proofs(keep_runs=2, keep_days=0, batch_size=1)
+
+        self.assertEqual(counts, {'runs': 2, 'sections': 4, 'units': 0})
+        self.assertEqual(
+            list(self.file.results.order_by('id').values_list('data', flat=True)),
+            ['log 2', 'log 3']
+        )
+        self.assertEqual(self.file.sections.count(), 4)
+        self.assertEqual(SectionStatusData.objects.count(), 4)
+        self.assertEqual(self.file.sections.filter(validity_flag=True).count(), 2)
+
+    def test_proofs_older_than_retention_period_are_removed(self):
+        for run in range(2):
+            self.prove(run)
+        ProofRun.objects.update(start_date=timezone.now() - timedelta(days=2))
+
+        counts = compact_proofs(keep_runs=0, keep_days=1, batch_size=100)
+
+        # The current proof is kept, however old it is.
+        self.assertEqual(counts, {'runs': 1, 'sections': 2, 'units': 0})
+        self.assertEqual(self.file.results.get().data, 'log 1')
+
+    def test_sections_of_proof_in_progress_are_kept(self):
+        for run in range(2):
+            self.prove(run)
+        writer = ProvingResultWriter(self.file)
+        writer.add(FramaSection('Goal Assertion', 'Valid', 'Goal Assertion:\n'))
+        writer.flush()
+
+        compact_proofs(keep_runs=1, keep_days=0, batch_size=100)
+
+        # The run in progress is the last one, the current run is kept too.
+        self.assertEqual(self.file.sections.count(), 3)
+        writer.finish('log')
+        self.assertEqual(self.file.sections.filter(validity_flag=True).count(), 1)
+
+    def test_units_of_proof_in_progress_are_kept(self):
+        units = split_into_units('int f(void) { return 0; }\nint g(void) { return 1; }\n')
+        for run in range(2):
+            writer = ProvingResultWriter(self.file, units=units)
+            writer.add(FramaSection('Goal Assertion', 'Valid', f'Goal Assertion {run}:\n', unit='f'))
+            writer.finish(f'log {run}')
+        writer = ProvingResultWriter(self.file, units=units)
+        writer.add(FramaSection('Goal Assertion', 'Valid', 'Goal Assertion:\n', unit='f'))
+        writer.flush()
+
+        counts = compact_proofs(keep_runs=1, keep_days=0, batch_size=100)
+
+        # Units of the first proof are removed, units of the current and
+        # the running proofs are kept.
+        self.assertEqual(counts['units'], len(units))
+        writer.finish('log')
+        self.assertEqual(
+            ProvedUnit.objects.filter(file=self.file, validity_flag=True).count(),
+            len(units)
+        )
+        self.assertEqual(self.file.sections.get(validity_flag=True).proved_unit.name, 'f')
+
+    def test_deleted_entries_are_purged_after_grace_period(self):
+        directory = Directory.objects.create(name='directory', owner=self.user)
+        subdirectory = Directory.objects.create(name='subdirectory', owner=self.user, parent_dir=directory)
+        self.file.parent_dir = subdirectory
+        self.file.save()
+        self.prove(0)
+        path = self.file.uploaded_file.path
+        directory.delete_tree_by_user()
+
+        self.assertEqual(purge_deleted_entries(grace_days=1, batch_size=1), {'files': 0, 'directories': 0})
+        Directory.objects.update(deletion_date=timezone.now() - timedelta(days=2))
+        File.objects.update(deletion_date=timezone.now() - timedelta(days=2))
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = purge_deleted_entries(grace_days=1, batch_size=1)
+
+        self.assertEqual(counts, {'files': 1, 'directories': 2})
+        self.assertFalse(Entity.objects.exists())
+        self.assertFalse(FileSection.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_directory_with_available_entries_is_not_purged(self):
+        directory = Directory.objects.create(name='directory', owner=self.user)
+        self.file.parent_dir = directory
+        self.file.save()
+        directory.delete_by_user()
+        Directory.objects.update(deletion_date=timezone.now() - timedelta(days=2))
+
+        counts = purge_deleted_entries(grace_days=1, batch_size=100)
+
+        self.assertEqual(counts, {'files': 0, 'directories': 0})
+        self.assertTrue(Directory.objects.filter(pk=directory.pk).exists())
+
+
+class IterFramaCPrintTests(SimpleTestCase):
+    def test_sections_are_yielded_when_their_separator_is_read(self):
+        separator = '-' * 60 + '\n'
+        lines = iter([
+            'Header\n',
+            separator,
+            'Goal Assertion (file a.c, line 1):\n',
+            'Prover Alt-Ergo returns Valid\n',
+            separator,
+            'Lemma l:\n',
+        ])
+        sections = iter_frama_c_print(lines)
+
+        section = next(sections)
+        self.assertEqual(section.category, 'Goal Assertion')
+        self.assertEqual(section.status, 'Valid')
+        # Lines after the separator of the first section were not read yet.
+        self.assertEqual(next(lines), 'Lemma l:\n')
+        self.assertEqual(list(sections), [])
+
+    def test_solver_and_its_time_are_parsed(self):
+        separator = '-' * 60 + '\n'
+        sections = list(iter_frama_c_print([
+            separator,
+            'Goal Assertion (file a.c, line 1):\n',
+            'Prover Alt-Ergo 2.4.1 returns Valid (Qed:2ms) (1.5s) (14)\n',
+            separator,
+            'Goal Assertion (file a.c, line 2):\n',
+            'Prover Qed returns Valid\n',
+            separator,
+        ]))
+
+        self.assertEqual(sections[0].solver, 'Alt-Ergo 2.4.1')
+        self.assertEqual(sections[0].time, 1.5)
+        self.assertEqual(sections[1].solver, 'Qed')
+        self.assertIsNone(sections[1].time)
+        self.assertEqual(sections[0].steps, 14)
+        self.assertIsNone(sections[1].steps)
+
+    def test_goal_headers_are_parsed(self):
+        for header, parsed in (
+            ("Goal Post-condition 'positive' in 'f':", ('Post-condition', 'positive', 'f')),
+            ("Goal Assertion (file a.c, line 3) in 'f':", ('Assertion', None, 'f')),
+            (
+                "Goal Preservation of Invariant 'I' (file a.c, line 7):",
+                ('Preservation of Invariant', 'I', None)
+            ),
+            ('Lemma l:', ('Lemma', 'l', None)),
+            ('Header', (None, None, None)),
+        ):
+            self.assertEqual(parse_goal_header(header), parsed)
+
+
+class FindFunctionsTests(SimpleTestCase):
+    def test_only_function_definitions_are_found(self):
+        source = (
+            '#define X(a) a\n'
+            '/*@ lemma l: \\true; */\n'
+            'struct s { int a; };\n'
+            'int table[] = {1, 2};\n'
+            'int prototype(int);\n'
+            '/*@ ensures \\result > 0; */\n'
+            'int f(int x) {\n'
+            '  if (x) { return x; }\n'
+            '  char *s = "}";\n'
+            '  return 1;\n'
+            '}\n'
+            'void main(void)\n'
+            '{\n'
+            '  f(1);\n'
+            '}\n'
+        )
+
+        functions = find_functions(source)
+
+        self.assertEqual([function.name for function in functions], ['f', 'main'])
+        f = functions[0]
+        self.assertEqual(source[f.start:f.body_start], 'int f(int x) ')
+        self.assertTrue(source[f.body_start:f.end].endswith('return 1;\n}'))
+
+    def test_file_without_functions_is_not_split(self):
+        self.assertEqual(split_into_units('int a;\n'), [])
+
+    def test_ACSL_contract_is_a_part_of_function(self):
+        source = 'int a;\n/*@ requires x > 0; */\nint f(int x) { return x; }\n'
+
+        f = find_functions(source)[0]
+
+        self.assertEqual(source[f.annotation_start:f.start], '/*@ requires x > 0; */\n')
+
+
+class SplitIntoUnitsTests(SimpleTestCase):
+    source = (
+        '/*@ lemma l: \\true; */\n'
+        '/*@ requires x > 0; */\n'
+        'int f(int x) { return x; }\n'
+        'int g(void) { return f(1); }\n'
+        'int h(void) { return 0; }\n'
+    )
+
+    def fingerprints(self, source: str):
+        return {unit.name: unit.fingerprint for unit in split_into_units(source)}
+
+    def test_only_changed_function_gets_new_fingerprint(self):
+        changed = self.source.replace('return 0; }', 'return 0;\n}\n')
+
+        before, after = self.fingerprints(self.source), self.fingerprints(changed)
+
+        self.assertEqual(before['f'], after['f'])
+        self.assertEqual(before['g'], after['g'])
+        self.assertNotEqual(before['h'], after['h'])
+
+    def test_callers_depend_on_contracts_of_callees(self):
+        changed = self.source.replace('x > 0', 'x >= 0')
+
+        before, after = self.fingerprints(self.source), self.fingerprints(changed)
+
+        self.assertNotEqual(before['f'], after['f'])
+        self.assertNotEqual(before['g'], after['g'])
+        self.assertEqual(before['h'], after['h'])
+
+    def test_all_units_depend_on_globals_and_salt(self):
+        before = self.fingerprints(self.source)
+
+        for after in (
+            self.fingerprints(self.source.replace('\\true', '\\false')),
+            {unit.name: unit.fingerprint for unit in split_into_units(self.source, 'v2')}
+        ):
+            for name in before:
+                self.assertNotEqual(before[name], after[name])
+
+    def test_global_properties_depend_on_layout(self):
+        moved = self.source.replace('return x; }', 'return x;\n}')
+
+        before, after = self.fingerprints(self.source), self.fingerprints(moved)
+
+        self.assertNotEqual(before[''], after[''])
+        self.assertEqual(before['g'], after['g'])
+
+
+class RelocateSectionBodyTests(SimpleTestCase):
+    def test_locations_are_moved_with_functions(self):
+        body = (
+            "Goal Post-condition (file files/old.c, line 3) in 'f':\n"
+            "(* files/old.c:9: call 'g' *)\n"
+            'Prove: told.c:3'
+        )
+
+        relocated = relocate_section_body(
+            body, 'old.c', 'new.c', [(2, 4, 'f'), (8, 10, 'g')], {'f': 12, 'g': 8}
+        )
+
+        self.assertEqual(relocated, (
+            "Goal Post-condition (file files/new.c, line 13) in 'f':\n"
+            "(* files/new.c:9: call 'g' *)\n"
+            'Prove: told.c:3'
+        ))
+
+
+@skipUnless(os.name == 'posix', 'Stub frama-c is a POSIX script.')
+@override_settings(PROOF_CACHE_MAX_ENTRIES=0, PROVER_INCREMENTAL=True, PROVER_PARALLEL_PROCESSES=2)
+class IncrementalProofTests(TestCase):
+    source = 'int f(void) { return 1; }\nint g(void) { return 2; }\n'
+
+    def setUp(self) -> None:
+        use_stub_frama_c(self)
+        self.user = create_dummy_user(1)
+
+    def prove(self, name: str, content: str, owner=None) -> File:
+        file = File.objects.create(
+            owner=owner or self.user,
+            uploaded_file=SimpleUploadedFile(name, content.encode())
+        )
+        prove_file(file)
+        return file
+
+    def test_only_changed_functions_are_proved_again(self):
+        self.prove('a.c', self.source)
+        file = self.prove('b.c', self.source.replace('return 2', 'return 3'))
+
+        # Only `g` was proved by Frama-C, sections of `f` and lemmas were reused.
+        self.assertEqual(file.results.get(validity_flag=True).data, 'log of b.c')
+        bodies = list(
+            file.sections.filter(validity_flag=True).order_by('id').values_list(
+                'status_data__data', flat=True
+            )
+        )
+        self.assertEqual(len(bodies), 3)
+        self.assertIn("Goal Assertion (file b.c, line 1) in 'f':", bodies[1])
+        self.assertEqual(
+            sorted(file.proved_units.filter(validity_flag=True).values_list('name', flat=True)),
+            ['', 'f', 'g']
+        )
+
+    @override_settings(PROVER_PARALLEL_PROCESSES=1)
+    def test_file_without_reusable_units_is_proved_by_one_run(self):
+        file = self.prove('a.c', self.source)
+
+        self.assertEqual(file.results.get(validity_flag=True).data, 'log of a.c')
+        self.assertEqual(
+            sorted(file.proved_units.filter(validity_flag=True).values_list('name', flat=True)),
+            ['', 'f', 'g']
+        )
+        # Stub goals are not in functions, they belong to the global unit.
+        self.assertFalse(file.sections.filter(validity_flag=True, proved_unit=None).exists())
+
+        file = self.prove('b.c', self.source)
+        self.assertEqual(file.results.get(validity_flag=True).data, '')
+        self.assertEqual(file.sections.filter(validity_flag=True).count(), 1)
+
+    def test_proofs_are_not_shared_between_owners(self):
+        self.prove('a.c', self.source)
+        file = self.prove('b.c', self.source, owner=create_dummy_user(2))
+
+        self.assertEqual(file.results.get(validity_flag=True).data, 'log of b.c' * 3)
+
+    def test_reproof_replaces_units_of_file(self):
+        file = self.prove('a.c', self.source)
+        prove_file(file)
+
+        self.assertEqual(file.proved_units.filter(validity_flag=True).count(), 3)
+        self.assertEqual(ProvedUnit.objects.filter(file=file).count(), 6)
+        self.assertEqual(file.sections.filter(validity_flag=True).count(), 3)
@@ -0,0 +1,194 @@
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+# Words, which can precede a parenthesis and a block, but are not functions.
+C_KEYWORDS = {'if', 'for', 'while', 'switch', 'return', 'sizeof', 'do', 'else'}
+
+_COMMENT_OR_LITERAL = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|^[ \t]*#[^\n]*',
+    re.DOTALL | re.MULTILINE
+)
+_FUNCTION_HEADER = re.compile(r'([A-Za-z_]\w*)\s*\((?:[^(){};]|\([^(){};]*\))*\)\s*$')
+_CALL = re.compile(r'([A-Za-z_]\w*)\s*\(')
+
+
+class CFunction:
+    """Definition of a function in C source. `start` is the offset of the
+    declaration, `body_start` and `end` delimit its body with braces.
+    `annotation_start` is the offset of ACSL contract directly preceding
+    the declaration, or `start` if there is none."""
+
+    def __init__(
+        self,
+        name: str,
+        start: int,
+        body_start: int,
+        end: int,
+        annotation_start: Optional[int] = None
+    ) -> None:
+        self.name = name
+        self.start = start
+        self.body_start = body_start
+        self.end = end
+        self.annotation_start = start if annotation_start is None else annotation_start
+
+    def __repr__(self) -> str:
+        return f'CFunction({self.name!r}, {self.start}, {self.body_start}, {self.end})'
+
+
+class ProofUnit:
+    """Part of a file, which can be proved by a separate Frama-C run
+    selected with `options`. `fingerprint` changes whenever the source
+    the proof of the unit depends on changes. `first_line` and `last_line`
+    delimit a function with its contract."""
+
+    def __init__(
+        self,
+        name: str,
+        options: List[str],
+        fingerprint: str = '',
+        first_line: Optional[int] = None,
+        last_line: Optional[int] = None
+    ) -> None:
+        self.name = name
+        self.options = options
+        self.fingerprint = fingerprint
+        self.first_line = first_line
+        self.last_line = last_line
+
+    def __repr__(self) -> str:
+        return f'ProofUnit({self.name!r}, {self.options!r})'
+
+
+def mask_comments_and_literals(source: str) -> str:
+    """Replaces comments (also ACSL annotations), preprocessor directives
+    and string and character literals with spaces, keeping offsets
+    of the rest of the source."""
+
+    def blank(match):
+        return re.sub(r'[^\n]', ' ', match.group(0))
+
+    return _COMMENT_OR_LITERAL.sub(blank, source)
+
+
+def _annotation_start(source: str, start: int) -> int:
+    preceding = source[:start].rstrip()
+    if preceding.endswith('*/'):
+        comment_start = preceding.rfind('/*', 0, len(preceding) - 2)
+        if comment_start >= 0 and source.startswith('/*@', comment_start):
+            return comment_start
+    return start
+
+
+def find_functions(source: str) -> List[CFunction]:
+    """Returns function definitions of C source in order of appearance.
+    Only top level blocks preceded by a parameter list are functions, so
+    structures, initializers and prototypes are skipped."""
+
+    masked = mask_comments_and_literals(source)
+    functions = []
+    depth = 0
+    # Offset, where the declaration of the next top level item starts.
+    declaration_start = 0
+    body_start = 0
+    header_match = None
+
+    for match in re.finditer(r'[{};]', masked):
+        character, offset = match.group(0), match.start()
+        if character == '{':
+            if depth == 0:
+                body_start = offset
+                header_match = _FUNCTION_HEADER.search(masked, declaration_start, offset)
+            depth += 1
+        elif character == '}' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                if header_match and header_match.group(1) not in C_KEYWORDS:
+                    declaration = masked[declaration_start:body_start]
+                    start = body_start - len(declaration.lstrip())
+                    functions.append(CFunction(
+                        header_match.group(1),
+                        start,
+                        body_start,
+                        offset + 1,
+                        _annotation_start(source, start)
+                    ))
+                header_match = None
+                declaration_start = offset + 1
+        elif character == ';' and depth == 0:
+            declaration_start = offset + 1
+
+    return functions
+
+
+def _digest(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(hashlib.sha256(part.encode()).digest())
+    return digest.hexdigest()
+
+
+def _line(source: str, offset: int) -> int:
+    return source.count('\n', 0, offset) + 1
+
+
+def split_into_units(source: str, salt: str = '') -> List[ProofUnit]:
+    """Splits proof of a file into independent Frama-C runs: one for
+    global properties (e.g. lemmas) and one for each function.
+
+    A function is fingerprinted with its contract and body, contracts of
+    functions it calls and the rest of the file outside of functions
+    (types, globals, lemmas), so an unchanged fingerprint means the same
+    proof. Layout of the rest of the file is ignored, so functions moved
+    by edits of other functions keep their fingerprints, only global
+    properties are proved again. `salt` (e.g. prover version) is a part
+    of every fingerprint."""
+
+    functions = find_functions(source)
+    if not functions:
+        return []
+
+    masked = mask_comments_and_literals(source)
+    definitions = {}
+    outside = []
+    previous_end = 0
+    for function in functions:
+        definitions.setdefault(function.name, []).append(function)
+        outside.append(source[previous_end:function.annotation_start])
+        previous_end = function.end
+    outside.append(source[previous_end:])
+
+    context = _digest(salt, *(' '.join(part.split()) for part in outside))
+    contracts = {
+        name: ''.join(source[f.annotation_start:f.body_start] for f in definitions[name])
+        for name in definitions
+    }
+    # Global properties are reported with lines, so their layout matters.
+    layout = ','.join(
+        f'{_line(source, f.annotation_start)}-{_line(source, f.end)}' for f in functions
+    )
+    units = [ProofUnit(
+        '',
+        ['-wp-skip-fct', ','.join(definitions)],
+        _digest(context, layout)
+    )]
+
+    for name, name_definitions in definitions.items():
+        callees = set()
+        for f in name_definitions:
+            callees.update(_CALL.findall(masked, f.body_start, f.end))
+        callees = sorted(callees & definitions.keys() - {name})
+        units.append(ProofUnit(
+            name,
+            ['-wp-fct', name],
+            _digest(
+                context,
+                *(source[f.annotation_start:f.end] for f in name_definitions),
+                *(contracts[callee] for callee in callees)
+            ),
+            _line(source, name_definitions[0].annotation_start),
+            _line(source, name_definitions[-1].end)
+        ))
+
+    return units
@@ -5,8 +5,13 @@ from .views import (
     delete_directory_view,
     delete_file_view,
     prove_file_view,
+    proof_job_view,
+    proof_job_events_view,
     current_files_and_dirs_view,
     file_content_view,
+    file_runs_view,
+    proof_run_diff_view,
+    file_source_view,
     add_file_view,
     add_dir_view,
 )
@@ -19,5 +24,10 @@ urlpatterns = [
     path('delete_file/<int:pk>/', delete_file_view, name='delete-file'),
     path('current_files_and_dirs/', current_files_and_dirs_view, name='current-files-and-dirs'),
     path('file_content/<int:pk>/', file_content_view, name='file-content'),
+    path('file_source/<int:pk>/', file_source_view, name='file-source'),
+    path('file_runs/<int:pk>/', file_runs_view, name='file-runs'),
+    path('prove/run/<int:pk>/diff/<int:other_pk>/', proof_run_diff_view, name='proof-run-diff'),
     path('prove/<int:pk>/', prove_file_view, name='prove-file'),
+    path('prove/job/<int:pk>/', proof_job_view, name='proof-job'),
+    path('prove/job/<int:pk>/events/', proof_job_events_view, name='proof-job-events'),
 ]
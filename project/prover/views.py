@@ -1,35 +1,92 @@
-from django.shortcuts import get_object_or_404, redirect
+import asyncio
+import base64
+import binascii
+import json
+import re
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
 from django.views.generic import TemplateView
-from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import (
+    FileResponse,
     JsonResponse,
     HttpResponse,
     HttpResponseNotAllowed,
-    HttpResponseBadRequest
+    HttpResponseBadRequest,
+    StreamingHttpResponse
 )
-from django.views.decorators.http import require_http_methods
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition, require_http_methods
 
 from .models import (
     Directory,
     File,
+    FileProvingResult,
     FileSection,
-    SectionStatusData,
-    SectionCategory,
-    SectionStatus,
-    FileProvingResult
+    ListingVersion,
+    ProofJob,
+    ProofRun
 )
 from .forms import CreateDirectoryForm, CreateFileForm
-from .processes import get_frama_c_print
+from .history import diff_proof_runs
+from .jobs import enqueue_proof
 
 
-def get_file_content(file):
-    file.open('r')
-    content = file.read()
-    file.close()
+_BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
 
-    return content
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Returns first and last byte of a single range from value of Range
+    header for content of `size` bytes. Returns None if the header is to
+    be ignored (e.g. it is invalid or asks for several ranges). Raises
+    ValueError if the range cannot be satisfied."""
+
+    match = _BYTE_RANGE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if not first:
+        # Suffix range, last bytes of the content.
+        if int(last) == 0 or size == 0:
+            raise ValueError('Range cannot be satisfied.')
+        return max(size - int(last), 0), size - 1
+
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise ValueError('Range cannot be satisfied.')
+    last = size - 1 if not last else min(int(last), size - 1)
+
+    return first, last
+
+
+class FileRange:
+    """Read only file-like object with `length` bytes of `file`
+    starting at `start`."""
+
+    def __init__(self, file, start: int, length: int) -> None:
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
 
 
 def parse_error_message(errors_json):
@@ -40,64 +97,307 @@ def parse_error_message(errors_json):
     return error_message
 
 
+def get_requested_file(request, pk) -> File:
+    """Returns file of the user, which is requested. The file is looked up
+    once per request, so conditions of a view do not repeat the query."""
+
+    if getattr(request, 'requested_file', None) is None:
+        request.requested_file = get_object_or_404(
+            File,
+            pk=pk,
+            owner=request.user,
+            availability_flag=True
+        )
+
+    return request.requested_file
+
+
+def file_content_etag(request, pk) -> str:
+    file = get_requested_file(request, pk)
+    return f'{file.pk}-{file.proof_version}'
+
+
 @login_required
+@require_http_methods(['GET', 'HEAD'])
+@condition(etag_func=file_content_etag)
 def file_content_view(request, pk):
-    file = get_object_or_404(
-        File,
-        pk=pk,
-        owner=request.user,
-        availability_flag=True
-    )
-    sections = file.sections.filter(validity_flag=True)
-    results = file.results.all()
-    if len(results) > 0:
-        result = results[0].data
-    else:
-        result = ''
+    """Returns name, current sections and proving result of the file.
+    Its source is served by `file_source_view`. Requests with matching
+    If-None-Match get 304 response without reading the sections."""
+
+    file = get_requested_file(request, pk)
+    sections, result = [], None
+    if file.current_run_id is not None:
+        # Sections and the result of the current run are read with one
+        # indexed query each, however many sections the file has.
+        sections = FileSection.objects.filter(run_id=file.current_run_id).order_by('id').values(
+            'category__name',
+            'status__name',
+            'status_data__data',
+            'status_data__solver',
+            'status_data__time',
+            'status_data__steps',
+            'name',
+            'function',
+            'property_kind'
+        )
+        result = FileProvingResult.objects.filter(run_id=file.current_run_id).values_list(
+            'data',
+            flat=True
+        ).first()
 
     sections_json = []
     for section in sections:
         sections_json.append(
             {
-                'category': section.category.name,
-                'body': section.status.data_set.all()[0].data,
-                'status': section.status.name
+                'category': section['category__name'],
+                'body': section['status_data__data'],
+                'status': section['status__name'],
+                'solver': section['status_data__solver'],
+                'time': section['status_data__time'],
+                'steps': section['status_data__steps'],
+                'goal': section['name'],
+                'function': section['function'],
+                'kind': section['property_kind']
             }
         )
 
     body = {
         'name': file.get_name(),
-        'body': get_file_content(file.uploaded_file),
         'sections': sections_json,
-        'result': result
+        'result': result or ''
     }
-    return JsonResponse(body, safe=False)
+    response = JsonResponse(body, safe=False)
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
 
 
 @login_required
+@require_http_methods(['GET', 'HEAD'])
+def file_runs_view(request, pk):
+    """Returns proof runs of the file, the newest first."""
+
+    file = get_requested_file(request, pk)
+    runs = file.runs.order_by('-start_date', '-id').values(
+        'id',
+        'job_id',
+        'start_date',
+        'finish_date',
+        'result__goals',
+        'result__proved_goals'
+    )
+
+    runs_json = [
+        {
+            'id': run['id'],
+            'job': run['job_id'],
+            'start': run['start_date'],
+            'finish': run['finish_date'],
+            'current': run['id'] == file.current_run_id,
+            'goals': run['result__goals'],
+            'proved_goals': run['result__proved_goals']
+        }
+        for run in runs
+    ]
+    response = JsonResponse({'runs': runs_json})
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def proof_run_diff_view(request, pk, other_pk):
+    """Returns differences between goals of run `pk` and of a later run
+    `other_pk` of the same file of the user, see `diff_proof_runs`."""
+
+    runs = ProofRun.objects.filter(file__owner=request.user, file__availability_flag=True)
+    old_run = get_object_or_404(runs.only('id', 'file_id'), pk=pk)
+    new_run = get_object_or_404(runs.only('id'), pk=other_pk, file_id=old_run.file_id)
+
+    body = {'old': old_run.pk, 'new': new_run.pk, **diff_proof_runs(old_run.pk, new_run.pk)}
+    response = JsonResponse(body)
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+def get_source_file(request, pk) -> File:
+    """Returns file of the user, which source is requested. The file,
+    size and modification time of its source are read once per request."""
+
+    if getattr(request, 'source_modified', None) is None:
+        file = get_requested_file(request, pk)
+        storage, name = file.uploaded_file.storage, file.uploaded_file.name
+        request.source_size = storage.size(name)
+        request.source_modified = storage.get_modified_time(name)
+
+    return request.requested_file
+
+
+def source_etag(request, pk) -> str:
+    file = get_source_file(request, pk)
+    return f'{file.pk}-{request.source_size}-{request.source_modified.timestamp():.6f}'
+
+
+def source_last_modified(request, pk) -> datetime:
+    get_source_file(request, pk)
+    return request.source_modified
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+@condition(etag_func=source_etag, last_modified_func=source_last_modified)
+def file_source_view(request, pk):
+    """Streams source of the file without loading it into memory.
+    A single byte range is sent if requested with Range header. Requests
+    with matching If-None-Match or If-Modified-Since get 304 response."""
+
+    file = get_source_file(request, pk)
+    size = request.source_size
+    content_type = 'text/plain; charset=utf-8'
+
+    byte_range = None
+    if_range = request.headers.get('If-Range')
+    if 'Range' in request.headers and if_range in (
+        None,
+        quote_etag(source_etag(request, pk)),
+        http_date(request.source_modified.timestamp())
+    ):
+        try:
+            byte_range = parse_byte_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    source = file.uploaded_file.storage.open(file.uploaded_file.name, 'rb')
+    if byte_range is None:
+        response = FileResponse(source, content_type=content_type)
+    else:
+        first, last = byte_range
+        response = FileResponse(
+            FileRange(source, first, last - first + 1),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Length'] = last - first + 1
+        response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    # Browser keeps the source, but asks whether it is still current.
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+LISTING_KINDS = ('directories', 'files')
+
+
+def encode_listing_cursor(kind: str, name: Optional[str] = None, pk: Optional[int] = None) -> str:
+    """Returns token of a listing position after entry `name` with `pk`
+    of `kind` ('directories' or 'files'), or at start of `kind` entries."""
+
+    position = [kind] if name is None else [kind, name, pk]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_listing_cursor(token: str) -> Tuple[str, Optional[Tuple[str, int]]]:
+    """Returns kind of entries and the last listed entry (name and id)
+    from a token of `encode_listing_cursor`. Raises ValueError if the token
+    is invalid."""
+
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError):
+        raise ValueError('Invalid cursor.')
+
+    if isinstance(position, list) and len(position) == 1 and position[0] in LISTING_KINDS:
+        return position[0], None
+    if (isinstance(position, list) and len(position) == 3 and position[0] in LISTING_KINDS
+            and isinstance(position[1], str) and isinstance(position[2], int)):
+        return position[0], (position[1], position[2])
+    raise ValueError('Invalid cursor.')
+
+
+def list_after(queryset, after: Optional[Tuple[str, int]], limit: int) -> List[dict]:
+    """Returns at most `limit` + 1 entries of the queryset following
+    `after` (name and id) in order of names."""
+
+    if after is not None:
+        name, pk = after
+        queryset = queryset.filter(Q(name__gt=name) | Q(name=name, pk__gt=pk))
+    return list(queryset.order_by('name', 'pk').values('id', 'name')[:limit + 1])
+
+
+def listing_etag(request) -> Optional[str]:
+    directory_id = request.GET.get('dir') or None
+    if directory_id is not None and not directory_id.isdigit():
+        return None
+
+    version = ListingVersion.objects.get_version(request.user.pk, directory_id)
+    return f'{request.user.pk}-{directory_id or 0}-{version}'
+
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+@condition(etag_func=listing_etag)
 def current_files_and_dirs_view(request):
+    """Lists directories and then files of a directory in order of names,
+    one page at a time. A page has at most `limit` entries, the next one
+    starts at `next` token passed as `cursor`. Requests with matching
+    If-None-Match get 304 response without listing the directory."""
+
     if current_directory_id := request.GET.get(key='dir', default=None):
         current_directory = get_object_or_404(Directory, pk=current_directory_id)
     else:
         current_directory = None
 
-    directories = Directory.objects.filter(
-        parent_dir=current_directory,
-        owner=request.user,
-        availability_flag=True
-    )
-    files = File.objects.filter(
-        parent_dir=current_directory,
-        owner=request.user,
-        availability_flag=True
-    )
-
-    data = {
-        'directories': list(directories.values('id', 'name')),
-        'files': [{'id': f.id, 'name': f.get_name()} for f in files]
+    try:
+        limit = int(request.GET.get('limit', settings.LISTING_PAGE_SIZE))
+        if limit < 1:
+            raise ValueError('Invalid limit.')
+        limit = min(limit, settings.LISTING_MAX_PAGE_SIZE)
+        kind, after = 'directories', None
+        if cursor := request.GET.get('cursor'):
+            kind, after = decode_listing_cursor(cursor)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    entries = {
+        'directories': Directory.objects.filter(
+            parent_dir=current_directory,
+            owner=request.user,
+            availability_flag=True
+        ),
+        'files': File.objects.filter(
+            parent_dir=current_directory,
+            owner=request.user,
+            availability_flag=True
+        ),
     }
-
-    return JsonResponse(data, safe=False)
+    data = {'directories': [], 'files': [], 'next': None}
+    remaining = limit
+    for entry_kind in LISTING_KINDS[LISTING_KINDS.index(kind):]:
+        if remaining == 0:
+            # The page ended with the previous kind of entries.
+            if entries[entry_kind].exists():
+                data['next'] = encode_listing_cursor(entry_kind)
+            break
+
+        page = list_after(entries[entry_kind], after if entry_kind == kind else None, remaining)
+        if len(page) > remaining:
+            page = page[:remaining]
+            data['next'] = encode_listing_cursor(entry_kind, page[-1]['name'], page[-1]['id'])
+        data[entry_kind] = page
+        if data['next']:
+            break
+        remaining -= len(page)
+
+    response = JsonResponse(data, safe=False)
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
 
 
 class MainView(LoginRequiredMixin, TemplateView):
@@ -146,19 +446,6 @@ def add_dir_view(request):
     return HttpResponseNotAllowed(permitted_methods=['POST'])
 
 
-def delete_directory_recurrent(directory: Directory):
-    """Deletes (sets as unavailable) given directory and
-    its contents recurrently."""
-
-    for lower_directory in directory.directory_set.all():
-        delete_directory_recurrent(lower_directory)
-
-    for lower_file in directory.file_set.all():
-        lower_file.delete_by_user()
-
-    directory.delete_by_user()
-
-
 @login_required
 def delete_directory_view(request, pk):
     directory = get_object_or_404(
@@ -169,7 +456,7 @@ def delete_directory_view(request, pk):
     )
 
     if request.method == 'POST':
-        delete_directory_recurrent(directory)
+        directory.delete_tree_by_user()
         return HttpResponse()
 
     return HttpResponseNotAllowed(permitted_methods=['POST'])
@@ -201,33 +488,111 @@ def prove_file_view(request, pk):
         availability_flag=True
     )
 
-    # Invalidate current sections and result.
-    current_sections = FileSection.objects.filter(related_file=file, validity_flag=True)
-    for section in current_sections:
-        section.validity_flag = False
-        section.save()
-    current_results = FileProvingResult.objects.filter(related_file=file, validity_flag=True)
-    for result in current_results:
-        result.validity_flag = False
-        result.save()
-
-    # Start new validation process for current file.
-    result_data, parsed_sections = get_frama_c_print(file.uploaded_file.path)
-    for section in parsed_sections:
-        s_category = SectionCategory.objects.create(name=section.category)
-        s_status = SectionStatus.objects.create(name=section.status)
-        SectionStatusData.objects.create(
-            data=section.body,
-            status=s_status
-        )
-        FileSection.objects.create(
-            related_file=file,
-            category=s_category,
-            status=s_status
+    try:
+        job = enqueue_proof(
+            file,
+            request.POST.get('backend', ''),
+            request.POST.get('solvers', '')
         )
-    FileProvingResult.objects.create(
-        related_file=file,
-        data=result_data
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    return JsonResponse({'job': job.pk}, status=202)
+
+
+@login_required
+def proof_job_view(request, pk):
+    job = get_object_or_404(
+        ProofJob,
+        pk=pk,
+        file__owner=request.user
+    )
+
+    body = {
+        'id': job.pk,
+        'file': job.file_id,
+        'state': job.state,
+        'backend': job.backend,
+        'solvers': job.solvers,
+        'error': job.error
+    }
+    return JsonResponse(body)
+
+
+def get_proof_job_progress(job_pk: int, last_section_id: int):
+    """Returns the job and its sections saved after `last_section_id`.
+    The job is read first, so if it is finished, all of its sections
+    are returned."""
+
+    job = ProofJob.objects.only('state', 'error').get(pk=job_pk)
+    sections = FileSection.objects.filter(
+        job_id=job_pk,
+        id__gt=last_section_id
+    ).order_by('id').values(
+        'id',
+        'category__name',
+        'status__name',
+        'status_data__data',
+        'status_data__solver',
+        'status_data__time',
+        'status_data__steps',
+        'name',
+        'function',
+        'property_kind'
     )
 
-    return HttpResponse()
+    return job, list(sections)
+
+
+async def proof_job_events(job_pk: int, last_section_id: int = 0):
+    """Yields Server-Sent Events with sections of the job as they are
+    saved by the worker, and a `finished` event at the end."""
+
+    while True:
+        job, sections = await sync_to_async(get_proof_job_progress)(job_pk, last_section_id)
+        for section in sections:
+            last_section_id = section['id']
+            data = json.dumps({
+                'category': section['category__name'],
+                'status': section['status__name'],
+                'body': section['status_data__data'],
+                'solver': section['status_data__solver'],
+                'time': section['status_data__time'],
+                'steps': section['status_data__steps'],
+                'goal': section['name'],
+                'function': section['function'],
+                'kind': section['property_kind']
+            })
+            yield f'id: {last_section_id}\nevent: section\ndata: {data}\n\n'
+
+        if job.is_finished():
+            data = json.dumps({'state': job.state, 'error': job.error})
+            yield f'event: finished\ndata: {data}\n\n'
+            return
+
+        await asyncio.sleep(settings.PROOF_EVENTS_POLL_INTERVAL)
+
+
+@login_required
+def proof_job_events_view(request, pk):
+    job = get_object_or_404(
+        ProofJob,
+        pk=pk,
+        file__owner=request.user
+    )
+
+    # A reconnecting browser continues after the last received section.
+    try:
+        last_section_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_section_id = 0
+
+    # Events are produced by an asynchronous generator, so under ASGI
+    # waiting for the prover does not occupy a worker thread.
+    response = StreamingHttpResponse(
+        proof_job_events(job.pk, last_section_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -3,6 +3,8 @@ let currentFileId = -1; // DB id of currently displayed file.
 let directoryStack = []; // Stack of currently entered directories.
 let middleScreenObjects = ["program-code", "add-dir-form-container", "add-file-form-container"]
 let forms = ["add-dir-form", "add-file-form"];
+let proofJobPollInterval = 1000; // Milliseconds between proof job state checks.
+let etagResponses = new Map(); // Last ETag and data of each requested url.
 
 axios.defaults.xsrfCookieName = 'csrftoken'
 axios.defaults.xsrfHeaderName = 'X-CSRFToken'
@@ -10,6 +12,28 @@ $.ajaxSetup({
     headers: {'X-CSRFToken': $.cookie('csrftoken')}
 });
 
+// GET request, which sends ETag of the previous response of the same url
+// and reuses its data if the server answers it is not modified.
+function getWithETag(url, params) {
+    let key = url + "?" + new URLSearchParams(params || {}).toString();
+    let previous = etagResponses.get(key);
+    let headers = previous ? {"If-None-Match": previous.etag} : {};
+
+    return axios.get(url, {
+        params: params,
+        headers: headers,
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+    }).then((response) => {
+        if (response.status === 304) {
+            return {data: previous.data};
+        }
+        if (response.headers["etag"]) {
+            etagResponses.set(key, {etag: response.headers["etag"], data: response.data});
+        }
+        return response;
+    });
+}
+
 function getCurrentDirectoryOrEmptyString() {
     if (directoryStack.length > 0) {
         return directoryStack[directoryStack.length - 1];
@@ -124,15 +148,20 @@ function deleteFileAndRefresh(fileId) {
     }
 }
 
-// Run proving process for current file and reload code editor and sections.
+// Queue proving process for current file and reload code editor
+// and sections when it is finished.
 function proveCurrentFileAndReload() {
     if (currentFileId >= 0) {
         $.ajax({
             type: "POST",
             url: `prove/${currentFileId}/`,
             success: function (response) {
-                reloadCurrentFileSections();
-                alert("Proving finished");
+                if (window.EventSource) {
+                    followProofJob(response['job'], currentFileId);
+                }
+                else {
+                    waitForProofJob(response['job']);
+                }
             },
             error: function (e, x, r) {
                 alert("Error: " + e.responseText);
@@ -141,6 +170,63 @@ function proveCurrentFileAndReload() {
     }
 }
 
+// Show sections of a proof job as they are reported by the prover,
+// reload code editor and sections when it is finished.
+function followProofJob(jobId, fileId) {
+    let events = new EventSource(`prove/job/${jobId}/events/`);
+    let programSections = document.getElementById("program-elements");
+    let i = 0;
+
+    events.addEventListener("section", (event) => {
+        if (currentFileId !== fileId) {
+            return;
+        }
+        if (i === 0) {
+            programSections.innerHTML = "";
+        }
+        let section = JSON.parse(event.data);
+        programSections.innerHTML += getFileSection(
+            section['status'],
+            section['category'],
+            section['body'],
+            `Progress${i}`
+        );
+        i++;
+    });
+    events.addEventListener("finished", (event) => {
+        events.close();
+        let job = JSON.parse(event.data);
+        if (job['state'] === "done") {
+            if (currentFileId === fileId) {
+                reloadCurrentFileSections();
+            }
+            alert("Proving finished");
+        }
+        else {
+            alert("Proving failed: " + job['error']);
+        }
+    });
+}
+
+// Poll state of a proof job until it is finished.
+function waitForProofJob(jobId) {
+    axios.get(`prove/job/${jobId}/`).then((response) => {
+        let state = response.data['state'];
+        if (state === "done") {
+            reloadCurrentFileSections();
+            alert("Proving finished");
+        }
+        else if (state === "failed" || state === "timeout") {
+            alert("Proving failed: " + response.data['error']);
+        }
+        else {
+            setTimeout(() => waitForProofJob(jobId), proofJobPollInterval);
+        }
+    }, (error) => {
+        console.log(error);
+    });
+}
+
 function reloadCurrentFileSections() {
     updateCodeEditorWithFile(currentFileId);
 }
@@ -250,25 +336,53 @@ function toggleProgramElement(id) {
     element.hidden = !element.hidden;
 }
 
-function populateFileNavigation(dirId) {
-    let url = "current_files_and_dirs/";
+// Return html structure of a button loading next page of a directory.
+function getMoreEntriesButton(dirId, cursor) {
+    return `
+        <button class="file" id="more-entries" onclick="populateFileNavigation(${dirId}, '${cursor}')">
+            <i class="fa fa-ellipsis-h"></i>
+            Show more
+        </button>
+    `
+}
+
+// Show entries of a directory. Without cursor, the panel is cleared and
+// the first page is shown, otherwise the page starting at cursor is appended.
+function populateFileNavigation(dirId, cursor) {
+    let params = {};
     if (dirId >= 0) {
-        url += `?dir=${dirId}`;
+        params['dir'] = dirId;
+    }
+    if (cursor) {
+        params['cursor'] = cursor;
     }
 
-    axios.get(url).then((response) => {
+    getWithETag("current_files_and_dirs/", params).then((response) => {
         let fileSelectionDialog = document.getElementById("file-selection-dialog");
-        fileSelectionDialog.innerHTML = "";
+        let html = "";
 
-        if (dirId > 0) {
-            fileSelectionDialog.innerHTML += getBackButton();
+        if (cursor) {
+            document.getElementById("more-entries").remove();
+        }
+        else if (dirId > 0) {
+            html += getBackButton();
         }
 
         for (let directory of response.data['directories']) {
-            fileSelectionDialog.innerHTML += getDirectoryButton(directory['id'], directory['name']);
+            html += getDirectoryButton(directory['id'], directory['name']);
         }
         for (let file of response.data['files']) {
-            fileSelectionDialog.innerHTML += getFileButton(file['id'], file['name']);
+            html += getFileButton(file['id'], file['name']);
+        }
+        if (response.data['next']) {
+            html += getMoreEntriesButton(dirId, response.data['next']);
+        }
+
+        if (cursor) {
+            fileSelectionDialog.insertAdjacentHTML("beforeend", html);
+        }
+        else {
+            fileSelectionDialog.innerHTML = html;
         }
     }, (error) => {
         console.log(error);
@@ -282,18 +396,21 @@ function updateCodeEditorWithFile(fileId) {
     let programResultData = document.getElementById("ResultData");
 
     if (fileId < 0) {
-        editor.innerText = "";
+        editor.value = "";
         programName.innerText = "";
         programSections.innerText = "";
         programResultData.innerText = "";
     }
     else {
-        let url = `file_content/${fileId}/`;
-        axios.get(url).then((response) => {
+        // Source is fetched as plain text, browser revalidates its copy.
+        axios.get(`file_source/${fileId}/`, {
+            responseType: "text",
+            transformResponse: (data) => data
+        }).then((response) => {
+            editor.value = response.data;
+        });
+        getWithETag(`file_content/${fileId}/`).then((response) => {
             programName.innerText = response.data['name'];
-            // Usually innerHTML is unsafe, but its body goes to
-            // textarea, so it is all handled as text.
-            editor.innerHTML = response.data['body'];
             programSections.innerText = "";
             let i = 0;
             for (let section of response.data['sections']) {